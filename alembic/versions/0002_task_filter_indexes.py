@@ -0,0 +1,46 @@
+"""Составные и частичные индексы для фильтров задач и проектов
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Условие частичных индексов: только невыполненные задачи
+OPEN_TASKS = sa.text("status != 'DONE'")
+
+# Имя, таблица, столбцы, условие частичного индекса
+INDEXES = [
+    ("ix_tasks_project_id_status_priority", "tasks", ["project_id", "status", "priority"], None),
+    ("ix_tasks_assigned_to_status", "tasks", ["assigned_to", "status"], None),
+    ("ix_tasks_created_by", "tasks", ["created_by"], None),
+    ("ix_tasks_open_assigned_to", "tasks", ["assigned_to", "estimated_hours"], OPEN_TASKS),
+    ("ix_tasks_open_project_id", "tasks", ["project_id"], OPEN_TASKS),
+    ("ix_projects_owner_id", "projects", ["owner_id"], None),
+]
+
+
+def upgrade():
+    # В PostgreSQL индексы строятся CONCURRENTLY, чтобы не блокировать запись в таблицы.
+    # CREATE INDEX CONCURRENTLY нельзя выполнять в транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=where,
+                sqlite_where=where,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,73 @@
+"""Агрегаты задач по проектам и исполнителям, индекс просроченных задач проекта
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Условие частичных индексов: только невыполненные задачи
+OPEN_TASKS = sa.text("status != 'DONE'")
+
+# Заполнение агрегатов по существующим задачам
+BACKFILL = """
+INSERT INTO task_stats (scope, scope_id, status, priority, task_count, hours)
+SELECT '{scope}', {column}, status, priority, count(*), coalesce(sum(estimated_hours), 0)
+FROM tasks
+WHERE {column} IS NOT NULL
+GROUP BY {column}, status, priority
+"""
+
+
+def upgrade():
+    op.create_table(
+        "task_stats",
+        sa.Column("scope", sa.String(length=16), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            # Тип taskstatus создан в 0001
+            postgresql.ENUM("TODO", "IN_PROGRESS", "DONE", name="taskstatus", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("hours", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("scope", "scope_id", "status", "priority"),
+    )
+    op.execute(BACKFILL.format(scope="project", column="project_id"))
+    op.execute(BACKFILL.format(scope="user", column="assigned_to"))
+
+    # Частичный индекс по проекту дополняется дедлайном для подсчета просроченных задач
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_project_id_deadline", "tasks", ["project_id", "deadline"],
+            postgresql_where=OPEN_TASKS,
+            sqlite_where=OPEN_TASKS,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_open_project_id", table_name="tasks", postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_project_id", "tasks", ["project_id"],
+            postgresql_where=OPEN_TASKS,
+            sqlite_where=OPEN_TASKS,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_open_project_id_deadline", table_name="tasks", postgresql_concurrently=True
+        )
+    op.drop_table("task_stats")
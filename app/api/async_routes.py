@@ -0,0 +1,164 @@
+"""
+Асинхронные варианты маршрутов чтения (AsyncSession)
+
+Подключаются при ASYNC_DATABASE раньше синхронных маршрутов с теми же путями
+и перекрывают их: ожидая БД, запрос не занимает поток из пула. Как и синхронные
+маршруты чтения, читают через get_async_read_db: с реплик (асинхронные движки
+DATABASE_REPLICA_URLS) с учетом READ_YOUR_WRITES_SECONDS. Остальные маршруты,
+в том числе все записи, остаются синхронными
+"""
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.core.dependencies import (
+    AuthUser,
+    TaskAccess,
+    get_async_current_active_user,
+    get_async_read_db,
+    get_async_read_task_for_member,
+)
+from app.core.responses import list_response
+
+users_router = APIRouter(prefix="/users", tags=["users"])
+projects_router = APIRouter(prefix="/projects", tags=["projects"])
+tasks_router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+@users_router.get("/me", response_model=schemas.User)
+async def read_user_me(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthUser = Depends(get_async_current_active_user),
+) -> Any:
+    """
+    Получить текущего пользователя
+    """
+    return await crud.async_user.get(db, id=current_user.id)
+
+@users_router.get("/", response_model=List[schemas.User])
+async def read_users(
+    db: AsyncSession = Depends(get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_async_current_active_user),
+) -> Any:
+    """
+    Получить список пользователей
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    """
+    if not current_user.is_superuser:
+        return list_response(schemas.User, [await crud.async_user.get(db, id=current_user.id)])
+    page = await crud.async_user.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return list_response(schemas.User, page.items, headers=headers)
+
+@projects_router.get("/", response_model=List[schemas.Project])
+async def read_projects(
+    db: AsyncSession = Depends(get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_async_current_active_user),
+) -> Any:
+    """
+    Получить список проектов
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    """
+    if current_user.is_superuser:
+        page = await crud.async_project.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    else:
+        page = await crud.async_project.get_page_by_owner(
+            db, owner_id=current_user.id, cursor=cursor, skip=skip, limit=limit
+        )
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return list_response(schemas.Project, page.items, headers=headers)
+
+@projects_router.get("/{project_id}", response_model=schemas.ProjectDetail)
+async def read_project(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthUser = Depends(get_async_current_active_user),
+) -> Any:
+    """
+    Получить проект по ID
+    """
+    row = await crud.async_project.get_with_task_counts(db, id=project_id)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Проект не найден",
+        )
+    project, tasks_count, completed_tasks_count = row
+    if not current_user.is_superuser and project.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    return {
+        **schemas.Project.model_validate(project).model_dump(),
+        "tasks_count": tasks_count,
+        "completed_tasks_count": completed_tasks_count,
+    }
+
+@tasks_router.get("/", response_model=List[schemas.Task])
+async def read_tasks(
+    db: AsyncSession = Depends(get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: schemas.TaskOrder = schemas.TaskOrder.ID,
+    project_id: Optional[int] = None,
+    task_status: Optional[schemas.TaskStatus] = Query(None, alias="status"),
+    priority: Optional[schemas.TaskPriority] = None,
+    assigned_to: Optional[int] = None,
+    current_user: AuthUser = Depends(get_async_current_active_user),
+) -> Any:
+    """
+    Получить список задач с возможностью фильтрации
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    """
+    if project_id:
+        # Проверка доступа к проекту
+        project = await crud.async_project.get(db, id=project_id)
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Проект не найден",
+            )
+        if not current_user.is_superuser and project.owner_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="У вас недостаточно прав для выполнения этого действия",
+            )
+
+    filters = dict(
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        order_by=order_by.value,
+        project_id=project_id,
+        status=task_status,
+        priority=priority,
+        assigned_to=assigned_to,
+    )
+    if current_user.is_superuser:
+        page = await crud.async_task.get_page_filtered(db, **filters)
+    else:
+        page = await crud.async_task.get_page_for_user(db, user_id=current_user.id, **filters)
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return list_response(schemas.Task, page.items, headers=headers)
+
+@tasks_router.get("/{task_id}", response_model=schemas.Task)
+async def read_task(
+    task_id: int,
+    access: TaskAccess = Depends(get_async_read_task_for_member),
+) -> Any:
+    """
+    Получить задачу по ID
+    """
+    return access.task
@@ -2,6 +2,7 @@ from datetime import timedelta
 from typing import Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from slowapi import Limiter
@@ -24,14 +25,17 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
     description="OAuth2 compatible token login, get an access token for future authentication"
 )
 @limiter.limit("5/minute")
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db), 
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Dict[str, str]:
     """
     Authenticate user and provide access token for future authentication
+
+    Маршрут асинхронный: проверка bcrypt ожидается на отдельном пуле
+    security.password_hasher и не держит поток обработчика
     """
-    user = crud.user.authenticate(
+    user = await crud.user.authenticate_async(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -58,15 +62,18 @@ def login_access_token(
     description="Create new user account with email verification"
 )
 @limiter.limit("3/minute")
-def register_new_user(
+async def register_new_user(
     user_in: schemas.UserCreate, 
     db: Session = Depends(get_db)
 ) -> schemas.User:
     """
     Register a new user and send verification email
+
+    Запросы к БД выполняются в пуле потоков обработчиков, хеширование пароля
+    ожидается на отдельном пуле security.password_hasher
     """
     # Check if email already exists
-    user = crud.user.get_by_email(db, email=user_in.email)
+    user = await run_in_threadpool(crud.user.get_by_email, db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -74,7 +81,7 @@ def register_new_user(
         )
     
     # Check if username already exists
-    user = crud.user.get_by_username(db, username=user_in.username)
+    user = await run_in_threadpool(crud.user.get_by_username, db, username=user_in.username)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,9 +89,15 @@ def register_new_user(
         )
     
     # Create user with is_active=False until email is verified
-    user_data = user_in.dict()
+    user_data = user_in.model_dump()
     user_data["is_active"] = False
-    user = crud.user.create(db, obj_in=schemas.UserCreate(**user_data))
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    user = await run_in_threadpool(
+        crud.user.create,
+        db,
+        obj_in=schemas.UserCreate(**user_data),
+        hashed_password=hashed_password,
+    )
     
     # Generate verification token
     verification_token = security.create_email_verification_token(user.email)
@@ -1,47 +1,47 @@
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
-from app.core.dependencies import get_current_active_user, get_db
+from app import crud, schemas
+from app.core.config import settings
+from app.core.dependencies import AuthUser, get_current_active_user, get_db
+from app.database import SessionLocal
+from app.optimizer import OptimizationParams, OptimizationStrategy, get_strategy
+from app.optimizer.jobs import JobQueueFull, OptimizationJob, job_manager
+from app.optimizer.plans import PlanConflict, plan_cache
+from app.optimizer.scenarios import Scenario
+from app.optimizer.service import (
+    apply_plan,
+    compare_scenarios,
+    preview_optimization,
+    run_optimization,
+)
 
 router = APIRouter(prefix="/optimizer", tags=["task-optimizer"])
 
-@router.post("/optimize-tasks", response_model=Dict[int, List[schemas.Task]])
-def optimize_tasks(
-    optimization_request: schemas.OptimizationRequest,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
-) -> Any:
+def _check_optimization_access(
+    db: Session,
+    *,
+    user_ids: List[int],
+    project_id: Optional[int],
+    current_user: AuthUser,
+) -> None:
     """
-    Оптимизация распределения задач между пользователями
-    
-    Алгоритм:
-    1. Проверяет доступ к проекту (если указан)
-    2. Получает все нераспределенные задачи и задачи назначенные на указанных пользователей
-    3. Вычисляет оптимальное распределение задач с учетом:
-       - Приоритета задач
-       - Предполагаемого времени выполнения
-       - Текущей загруженности пользователей
-       - Дедлайнов задач
-    4. Возвращает оптимальное распределение задач
+    Проверить существование пользователей и доступ к проекту
     """
-    # Проверка существования пользователей
-    users = {}
-    for user_id in optimization_request.user_ids:
-        user = crud.user.get(db, id=user_id)
-        if not user:
+    # Проверка существования пользователей (одним запросом)
+    existing_user_ids = crud.user.get_existing_ids(db, ids=user_ids)
+    for user_id in user_ids:
+        if user_id not in existing_user_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Пользователь с ID {user_id} не найден",
             )
-        users[user_id] = user
-    
+
     # Проверка проекта, если указан
-    project = None
-    if optimization_request.project_id:
-        project = crud.project.get(db, id=optimization_request.project_id)
+    if project_id:
+        project = crud.project.get(db, id=project_id)
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -52,48 +52,258 @@ def optimize_tasks(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="У вас недостаточно прав для выполнения этого действия",
             )
-    
-    # Получение задач для оптимизации
-    tasks = crud.task.get_tasks_for_optimization(
+
+def _get_strategy(name: str, capacities: Optional[Dict[int, float]]) -> OptimizationStrategy:
+    try:
+        return get_strategy(
+            name,
+            capacities=capacities,
+            default_capacity=settings.OPTIMIZER_DAILY_CAPACITY_HOURS,
+            horizon_days=settings.OPTIMIZER_HORIZON_DAYS,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+def _prepare_optimization(
+    db: Session,
+    optimization_request: schemas.OptimizationRequest,
+    current_user: AuthUser,
+) -> OptimizationParams:
+    """
+    Проверить запрос оптимизации и собрать параметры запуска
+    """
+    strategy = _get_strategy(
+        optimization_request.strategy, optimization_request.capacities
+    )
+
+    user_ids = list(dict.fromkeys(optimization_request.user_ids))
+    _check_optimization_access(
         db,
-        user_ids=optimization_request.user_ids,
+        user_ids=user_ids,
         project_id=optimization_request.project_id,
-        current_user=current_user
+        current_user=current_user,
     )
-    
-    # Алгоритм оптимизации (распределение по приоритету и оценке времени)
-    
-    # Сортировка задач по приоритету и дедлайну
-    sorted_tasks = sorted(
-        tasks,
-        key=lambda t: (
-            -t.priority,  # От высокого к низкому
-            t.deadline or "9999-12-31",  # Задачи с дедлайном в начале
-            t.estimated_hours or 0  # Затем по оценке времени
+
+    overload_threshold = None
+    if optimization_request.incremental:
+        overload_threshold = optimization_request.overload_threshold_hours
+        if overload_threshold is None:
+            overload_threshold = settings.OPTIMIZER_OVERLOAD_THRESHOLD_HOURS
+
+    return OptimizationParams(
+        user_ids=user_ids,
+        project_id=optimization_request.project_id,
+        strategy=strategy,
+        overload_threshold=overload_threshold,
+        respect_dependencies=optimization_request.respect_dependencies,
+    )
+
+@router.post("/optimize-tasks", response_model=Dict[int, List[schemas.Task]])
+def optimize_tasks(
+    optimization_request: schemas.OptimizationRequest,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Оптимизация распределения задач между пользователями
+
+    Алгоритм:
+    1. Проверяет доступ к проекту (если указан)
+    2. Получает все нераспределенные задачи и задачи назначенные на указанных пользователей
+    3. Вычисляет оптимальное распределение задач с учетом:
+       - Приоритета задач
+       - Предполагаемого времени выполнения
+       - Текущей загруженности пользователей
+       - Дедлайнов задач
+    4. Возвращает оптимальное распределение задач
+
+    Порядок распределения задается стратегией (поле strategy), см. app.optimizer.
+    В инкрементальном режиме (incremental) переносятся только нераспределенные задачи
+    и задачи пользователей с нагрузкой выше overload_threshold_hours.
+    С respect_dependencies блокирующие задачи распределяются раньше зависимых
+    """
+    params = _prepare_optimization(db, optimization_request, current_user)
+    return run_optimization(db, params=params, current_user=current_user)
+
+@router.post("/dry-run", response_model=schemas.OptimizationPlan)
+def preview_optimization_plan(
+    optimization_request: schemas.OptimizationRequest,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Рассчитать распределение и показатели баланса без записи назначений
+
+    Возвращает план с токеном снимка входных данных. Пока задачи не меняются,
+    повторный расчет берется из кэша, а план можно применить через
+    POST /optimizer/plans/{token}/apply
+    """
+    params = _prepare_optimization(db, optimization_request, current_user)
+    return preview_optimization(db, params=params, current_user=current_user)
+
+@router.post("/plans/{token}/apply", response_model=Dict[int, List[schemas.Task]])
+def apply_optimization_plan(
+    token: str,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Применить рассчитанный план без пересчета
+
+    Отклоняется (409), если задачи или нагрузки изменились после расчета плана
+    """
+    plan = plan_cache.get(token)
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="План не найден или устарел",
+        )
+    if not current_user.is_superuser and plan.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+
+    # Повторная проверка пользователей и доступа к проекту
+    _check_optimization_access(
+        db,
+        user_ids=plan.user_ids,
+        project_id=plan.project_id,
+        current_user=current_user,
+    )
+    try:
+        return apply_plan(db, plan=plan, current_user=current_user)
+    except PlanConflict:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Задачи изменились после расчета плана, рассчитайте план заново",
+        )
+
+@router.post("/scenarios", response_model=schemas.ScenarioComparison)
+def compare_optimization_scenarios(
+    comparison_request: schemas.ScenarioComparisonRequest,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Сравнить распределение задач для вариантов состава команды без записи назначений
+
+    Каждый сценарий добавляет или убирает пользователей из базового состава,
+    переопределяет емкость (capacity_aware) или приоритеты задач. Первым
+    в ответе идет базовый сценарий без изменений. Задачи читаются один раз,
+    сценарии считаются параллельно в пуле процессов
+    """
+    if len(comparison_request.scenarios) > settings.OPTIMIZER_MAX_SCENARIOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Не более {settings.OPTIMIZER_MAX_SCENARIOS} сценариев в запросе",
+        )
+    strategy = _get_strategy(comparison_request.strategy, comparison_request.capacities)
+
+    user_ids = list(dict.fromkeys(comparison_request.user_ids))
+    scenario_user_ids = [
+        user_id
+        for scenario in comparison_request.scenarios
+        for user_id in [*scenario.add_user_ids, *scenario.remove_user_ids]
+    ]
+    _check_optimization_access(
+        db,
+        user_ids=list(dict.fromkeys(user_ids + scenario_user_ids)),
+        project_id=comparison_request.project_id,
+        current_user=current_user,
+    )
+
+    params = OptimizationParams(
+        user_ids=user_ids,
+        project_id=comparison_request.project_id,
+        strategy=strategy,
+        respect_dependencies=comparison_request.respect_dependencies,
+    )
+    scenarios = [Scenario(name="baseline")] + [
+        Scenario(
+            name=scenario.name,
+            add_user_ids=scenario.add_user_ids,
+            remove_user_ids=scenario.remove_user_ids,
+            capacities=scenario.capacities,
+            priorities={task_id: int(priority) for task_id, priority in scenario.priorities.items()},
         )
+        for scenario in comparison_request.scenarios
+    ]
+    results = compare_scenarios(
+        db, params=params, scenarios=scenarios, current_user=current_user
     )
-    
-    # Расчет текущей нагрузки на пользователей
-    user_loads = {user_id: 0 for user_id in users}
-    for user_id in users:
-        assigned_tasks = crud.task.get_active_tasks_for_user(db, user_id=user_id)
-        user_loads[user_id] = sum(task.estimated_hours or 1 for task in assigned_tasks)
-    
-    # Распределение задач
-    optimized_distribution = {user_id: [] for user_id in users}
-    
-    for task in sorted_tasks:
-        # Находим пользователя с наименьшей нагрузкой
-        min_load_user_id = min(user_loads, key=user_loads.get)
-        
-        # Назначаем задачу
-        task_in = schemas.TaskUpdate(assigned_to=min_load_user_id)
-        updated_task = crud.task.update(db, db_obj=task, obj_in=task_in)
-        
-        # Обновляем нагрузку
-        user_loads[min_load_user_id] += updated_task.estimated_hours or 1
-        
-        # Добавляем задачу в результат
-        optimized_distribution[min_load_user_id].append(updated_task)
-    
-    return optimized_distribution
+    return {
+        "strategy": strategy.name,
+        "project_id": comparison_request.project_id,
+        "results": [
+            {**result._asdict(), "metrics": result.metrics._asdict()}
+            for result in results
+        ],
+    }
+
+@router.post(
+    "/jobs",
+    response_model=schemas.OptimizationJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_optimization_job(
+    optimization_request: schemas.OptimizationRequest,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Запустить оптимизацию в фоне
+
+    Возвращает ID задания сразу, результат доступен через GET /optimizer/jobs/{job_id}
+    """
+    params = _prepare_optimization(db, optimization_request, current_user)
+
+    def run(job: OptimizationJob) -> Dict[int, List[int]]:
+        # Отдельная сессия: сессия запроса закрывается после ответа
+        job_db = SessionLocal()
+        try:
+            distribution = run_optimization(
+                job_db,
+                params=params,
+                current_user=current_user,
+                progress=job.set_progress,
+            )
+        finally:
+            job_db.close()
+        return {
+            user_id: [task.id for task in tasks]
+            for user_id, tasks in distribution.items()
+        }
+
+    try:
+        return job_manager.submit(run, owner_id=current_user.id)
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Слишком много запусков оптимизации, повторите позже",
+            headers={"Retry-After": "5"},
+        )
+
+@router.get("/jobs/{job_id}", response_model=schemas.OptimizationJob)
+def read_optimization_job(
+    job_id: str,
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Получить статус, прогресс и результат фонового запуска оптимизации
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задание оптимизации не найдено",
+        )
+    if not current_user.is_superuser and job.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    return job
@@ -3,8 +3,9 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
-from app.core.dependencies import get_current_active_user, get_db
+from app import crud, schemas
+from app.core.dependencies import AuthUser, get_current_active_user, get_db, get_read_db
+from app.core.responses import list_response
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -12,7 +13,7 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 def create_project(
     project_in: schemas.ProjectCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Создать новый проект
@@ -24,47 +25,48 @@ def create_project(
 
 @router.get("/", response_model=List[schemas.Project])
 def read_projects(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Получить список проектов
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
     """
     if current_user.is_superuser:
-        projects = crud.project.get_multi(db, skip=skip, limit=limit)
+        page = crud.project.get_page(db, cursor=cursor, skip=skip, limit=limit)
     else:
-        projects = crud.project.get_multi_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit
+        page = crud.project.get_page_by_owner(
+            db=db, owner_id=current_user.id, cursor=cursor, skip=skip, limit=limit
         )
-    return projects
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return list_response(schemas.Project, page.items, headers=headers)
 
 @router.get("/{project_id}", response_model=schemas.ProjectDetail)
 def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Получить проект по ID
     """
-    project = crud.project.get(db, id=project_id)
-    if not project:
+    row = crud.project.get_with_task_counts(db, id=project_id)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Проект не найден",
         )
+    project, tasks_count, completed_tasks_count = row
     if not current_user.is_superuser and project.owner_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="У вас недостаточно прав для выполнения этого действия",
         )
     
-    # Дополнительные данные для ProjectDetail
-    tasks_count = len(project.tasks)
-    completed_tasks_count = len([task for task in project.tasks if task.status == models.TaskStatus.DONE])
-    
     # Создаем словарь с данными проекта
     project_data = {
         "id": project.id,
@@ -79,12 +81,69 @@ def read_project(
     
     return project_data
 
+@router.get("/{project_id}/critical-path", response_model=schemas.ProjectCriticalPath)
+def read_project_critical_path(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Получить критический путь проекта по зависимостям задач
+
+    Длина критического пути - минимальное время выполнения проекта в часах
+    при неограниченном числе исполнителей. Граф проекта кэшируется
+    и обновляется инкрементально при изменении зависимостей и оценок
+    """
+    project = crud.project.get(db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Проект не найден",
+        )
+    if not current_user.is_superuser and project.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    
+    length, path, order = crud.task_dependency.get_critical_path(db, project_id=project_id)
+    return {
+        "project_id": project_id,
+        "length_hours": length,
+        "critical_path": path,
+        "order": order,
+    }
+
+@router.get("/{project_id}/stats", response_model=schemas.ProjectStats)
+def read_project_stats(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Получить сводку по задачам проекта: по статусам, приоритетам,
+    сумму оценок невыполненных задач и число просроченных
+    """
+    project = crud.project.get(db, id=project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Проект не найден",
+        )
+    if not current_user.is_superuser and project.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    
+    return {"project_id": project_id, **crud.task_stats.get_project_stats(db, project_id=project_id)}
+
 @router.put("/{project_id}", response_model=schemas.Project)
 def update_project(
     project_id: int,
     project_in: schemas.ProjectUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Обновить проект
@@ -107,7 +166,7 @@ def update_project(
 def delete_project(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Удалить проект
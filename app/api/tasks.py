@@ -1,10 +1,21 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
-from app.core.dependencies import get_current_active_user, get_db
+from app import crud, schemas
+from app.core.config import settings
+from app.core.dependencies import (
+    AuthUser,
+    TaskAccess,
+    get_current_active_user,
+    get_db,
+    get_read_db,
+    get_read_task_for_member,
+    get_task_for_member,
+    get_task_for_owner,
+)
+from app.core.responses import list_response
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -12,7 +23,7 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 def create_task(
     task_in: schemas.TaskCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Создать новую задачу
@@ -44,19 +55,217 @@ def create_task(
     )
     return task
 
+@router.post("/bulk", response_model=schemas.TaskBulkCreateResult)
+def create_tasks_bulk(
+    tasks_in: List[schemas.TaskCreate] = Body(..., min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Создать задачи списком
+
+    Проекты и исполнители всех задач проверяются одним запросом каждый,
+    задачи с ошибками (те же проверки, что у POST /tasks/) пропускаются
+    и возвращаются с текстом ошибки, остальные создаются одной транзакцией
+    """
+    owner_ids = crud.project.get_owner_ids(
+        db, ids=list({task_in.project_id for task_in in tasks_in})
+    )
+    assignee_ids = crud.user.get_existing_ids(
+        db, ids=list({task_in.assigned_to for task_in in tasks_in if task_in.assigned_to})
+    )
+
+    items: List[schemas.TaskBulkItemResult] = []
+    valid: List[int] = []
+    for index, task_in in enumerate(tasks_in):
+        owner_id = owner_ids.get(task_in.project_id)
+        if owner_id is None:
+            error = "Проект не найден"
+        elif not current_user.is_superuser and owner_id != current_user.id:
+            error = "У вас недостаточно прав для выполнения этого действия"
+        elif task_in.assigned_to and task_in.assigned_to not in assignee_ids:
+            error = "Пользователь для назначения не найден"
+        else:
+            valid.append(index)
+            continue
+        items.append(schemas.TaskBulkItemResult(index=index, error=error))
+
+    task_ids = crud.task.create_many_with_creator(
+        db, objs_in=[tasks_in[index] for index in valid], creator_id=current_user.id
+    )
+    items += [
+        schemas.TaskBulkItemResult(index=index, id=task_id)
+        for index, task_id in zip(valid, task_ids)
+    ]
+    items.sort(key=lambda item: item.index)
+    return schemas.TaskBulkCreateResult(
+        created=len(task_ids), failed=len(tasks_in) - len(task_ids), items=items
+    )
+
+def _check_bulk_changes(
+    db: Session,
+    pending: List[Tuple[int, Any, Dict[str, Any]]],
+    current_user: AuthUser,
+) -> Dict[int, HTTPException]:
+    """
+    Проверить изменения задач (как в PUT /tasks/{task_id}) тремя запросами на весь список:
+    новые проекты, зависимости перемещаемых задач и новые исполнители
+
+    Returns:
+        Позиция в pending -> ошибка
+    """
+    moved = {
+        row.id: changes["project_id"] for _, row, changes in pending
+        if changes.get("project_id") and changes["project_id"] != row.project_id
+    }
+    owner_ids = crud.project.get_owner_ids(db, ids=list(set(moved.values())))
+    with_dependencies = crud.task_dependency.get_with_any(db, task_ids=list(moved))
+    assignee_ids = crud.user.get_existing_ids(db, ids=list({
+        changes["assigned_to"] for _, row, changes in pending
+        if changes.get("assigned_to") and changes["assigned_to"] != row.assigned_to
+    }))
+
+    errors: Dict[int, HTTPException] = {}
+    for position, (_, row, changes) in enumerate(pending):
+        if row.id in moved:
+            owner_id = owner_ids.get(moved[row.id])
+            if owner_id is None:
+                errors[position] = HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Новый проект не найден",
+                )
+                continue
+            if not current_user.is_superuser and owner_id != current_user.id:
+                errors[position] = HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="У вас недостаточно прав для перемещения задачи в этот проект",
+                )
+                continue
+            # Зависимости возможны только внутри проекта
+            if row.id in with_dependencies:
+                errors[position] = HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Нельзя переместить задачу с зависимостями в другой проект",
+                )
+                continue
+        assigned_to = changes.get("assigned_to")
+        if assigned_to and assigned_to != row.assigned_to and assigned_to not in assignee_ids:
+            errors[position] = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Пользователь для назначения не найден",
+            )
+    return errors
+
+@router.patch("/bulk", response_model=schemas.TaskBulkUpdateResult)
+def update_tasks_bulk(
+    bulk_in: schemas.TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Изменить задачи списком
+
+    Принимает либо items - список {id, changes}, либо filter и общие изменения changes.
+    Задачи и права на них (владелец проекта, исполнитель или суперпользователь)
+    проверяются одним запросом, задачи с одинаковыми изменениями обновляются
+    одним UPDATE, все изменения записываются одной транзакцией.
+    Элементы items с ошибками пропускаются и возвращаются с текстом ошибки.
+    filter выбирает только доступные пользователю задачи, а ошибка в изменениях
+    любой из них отклоняет запрос целиком
+    """
+    if (bulk_in.items is None) == (bulk_in.filter is None) or (
+        (bulk_in.filter is None) != (bulk_in.changes is None)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Укажите либо items, либо filter и changes",
+        )
+    member_id = None if current_user.is_superuser else current_user.id
+    max_items = settings.TASK_BULK_MAX_ITEMS
+
+    errors: List[schemas.TaskBulkItemResult] = []
+    # (позиция в items, строка задачи, изменения)
+    pending: List[Tuple[int, Any, Dict[str, Any]]] = []
+    if bulk_in.items is not None:
+        if len(bulk_in.items) > max_items:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"В запросе может быть не больше {max_items} задач",
+            )
+        rows = {
+            row.id: row for row in crud.task.get_many_with_project_owner(
+                db, ids=list({item.id for item in bulk_in.items})
+            )
+        }
+        seen = set()
+        for index, item in enumerate(bulk_in.items):
+            row = rows.get(item.id)
+            if row is None:
+                error = "Задача не найдена"
+            elif member_id is not None and member_id not in (row.owner_id, row.assigned_to):
+                error = "У вас недостаточно прав для выполнения этого действия"
+            elif item.id in seen:
+                error = "Задача уже указана в запросе"
+            else:
+                seen.add(item.id)
+                pending.append((index, row, item.changes.model_dump(exclude_unset=True)))
+                continue
+            errors.append(schemas.TaskBulkItemResult(index=index, id=item.id, error=error))
+    else:
+        filters = bulk_in.filter.model_dump(exclude_none=True)
+        if not filters:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Фильтр задач не может быть пустым",
+            )
+        rows = crud.task.get_many_with_project_owner(
+            db, member_id=member_id, limit=max_items + 1, **filters
+        )
+        if len(rows) > max_items:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Фильтр выбирает больше {max_items} задач",
+            )
+        changes = bulk_in.changes.model_dump(exclude_unset=True)
+        pending = [(index, row, changes) for index, row in enumerate(rows)]
+
+    change_errors = _check_bulk_changes(db, pending, current_user)
+    if change_errors and bulk_in.filter is not None:
+        db.rollback()
+        raise next(iter(change_errors.values()))
+    for position, exception in change_errors.items():
+        index, row, _ = pending[position]
+        errors.append(schemas.TaskBulkItemResult(index=index, id=row.id, error=exception.detail))
+    errors.sort(key=lambda item: item.index)
+
+    valid = [item for position, item in enumerate(pending) if position not in change_errors]
+    task_ids = crud.task.bulk_update(
+        db, tasks=[row for _, row, _ in valid], changes=[changes for _, _, changes in valid]
+    )
+    return schemas.TaskBulkUpdateResult(
+        updated=len(task_ids), failed=len(errors), ids=task_ids, errors=errors
+    )
+
 @router.get("/", response_model=List[schemas.Task])
 def read_tasks(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: schemas.TaskOrder = schemas.TaskOrder.ID,
     project_id: Optional[int] = None,
     status: Optional[schemas.TaskStatus] = None,
     priority: Optional[schemas.TaskPriority] = None,
     assigned_to: Optional[int] = None,
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Получить список задач с возможностью фильтрации
+
+    Постраничное чтение: курсор следующей страницы возвращается в заголовке
+    X-Next-Cursor и передается в параметре cursor с тем же order_by.
+    Стоимость страницы не зависит от ее номера, в отличие от skip
     """
     if project_id:
         # Проверка доступа к проекту
@@ -74,10 +283,12 @@ def read_tasks(
     
     # Фильтрация задач
     if current_user.is_superuser:
-        tasks = crud.task.get_multi_filtered(
+        page = crud.task.get_page_filtered(
             db, 
+            cursor=cursor,
             skip=skip, 
             limit=limit,
+            order_by=order_by.value,
             project_id=project_id,
             status=status,
             priority=priority,
@@ -85,71 +296,44 @@ def read_tasks(
         )
     else:
         # Обычный пользователь видит задачи из своих проектов или назначенные ему
-        tasks = crud.task.get_multi_for_user(
+        page = crud.task.get_page_for_user(
             db,
             user_id=current_user.id,
+            cursor=cursor,
             skip=skip,
             limit=limit,
+            order_by=order_by.value,
             project_id=project_id,
             status=status,
             priority=priority,
             assigned_to=assigned_to
         )
     
-    return tasks
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return list_response(schemas.Task, page.items, headers=headers)
 
 @router.get("/{task_id}", response_model=schemas.Task)
 def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    access: TaskAccess = Depends(get_read_task_for_member),
 ) -> Any:
     """
     Получить задачу по ID
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Задача не найдена",
-        )
-    
-    # Проверка доступа (суперпользователь, владелец проекта или назначенный исполнитель)
-    if not current_user.is_superuser:
-        project = crud.project.get(db, id=task.project_id)
-        if project.owner_id != current_user.id and task.assigned_to != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="У вас недостаточно прав для выполнения этого действия",
-            )
-    
-    return task
+    return access.task
 
 @router.put("/{task_id}", response_model=schemas.Task)
 def update_task(
     task_id: int,
     task_in: schemas.TaskUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    access: TaskAccess = Depends(get_task_for_member),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Обновить задачу
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Задача не найдена",
-        )
-    
-    # Проверка доступа (суперпользователь, владелец проекта или назначенный исполнитель)
-    if not current_user.is_superuser:
-        project = crud.project.get(db, id=task.project_id)
-        if project.owner_id != current_user.id and task.assigned_to != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="У вас недостаточно прав для выполнения этого действия",
-            )
+    task = access.task
     
     # Если меняется проект, проверяем права на новый проект
     if task_in.project_id and task_in.project_id != task.project_id:
@@ -164,6 +348,12 @@ def update_task(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="У вас недостаточно прав для перемещения задачи в этот проект",
             )
+        # Зависимости возможны только внутри проекта
+        if crud.task_dependency.has_any(db, task_id=task.id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Нельзя переместить задачу с зависимостями в другой проект",
+            )
     
     # Если меняется назначенный пользователь, проверяем его существование
     if task_in.assigned_to and task_in.assigned_to != task.assigned_to:
@@ -181,26 +371,91 @@ def update_task(
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    access: TaskAccess = Depends(get_task_for_owner),
 ) -> Any:
     """
     Удалить задачу
     """
-    task = crud.task.get(db, id=task_id)
-    if not task:
+    task = crud.task.remove(db, id=task_id)
+    return task
+
+@router.get("/{task_id}/dependencies", response_model=List[schemas.TaskDependency])
+def read_task_dependencies(
+    task_id: int,
+    db: Session = Depends(get_read_db),
+    access: TaskAccess = Depends(get_read_task_for_member),
+) -> Any:
+    """
+    Получить задачи, блокирующие задачу
+    """
+    return [
+        {"task_id": task_id, "blocked_by_id": blocked_by_id}
+        for blocked_by_id in crud.task_dependency.get_blockers(db, task_id=task_id)
+    ]
+
+@router.post("/{task_id}/dependencies", response_model=schemas.TaskDependency)
+def add_task_dependency(
+    task_id: int,
+    dependency_in: schemas.TaskDependencyCreate,
+    db: Session = Depends(get_db),
+    access: TaskAccess = Depends(get_task_for_member),
+) -> Any:
+    """
+    Добавить зависимость: задача не может начаться раньше блокирующей
+
+    Зависимость, замыкающая цикл, отклоняется
+    """
+    task = access.task
+    
+    blocked_by = crud.task.get(db, id=dependency_in.blocked_by_id)
+    if not blocked_by:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Задача не найдена",
+            detail="Блокирующая задача не найдена",
+        )
+    if blocked_by.project_id != task.project_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Зависимости возможны только между задачами одного проекта",
+        )
+    # Проверки и вставка выполняются в одной транзакции под блокировкой проекта,
+    # иначе две встречные зависимости могут одновременно пройти проверку цикла
+    crud.task_dependency.lock_project(db, project_id=task.project_id)
+    if crud.task_dependency.has_dependency(
+        db, task_id=task.id, blocked_by_id=blocked_by.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Зависимость уже существует",
+        )
+    if crud.task_dependency.creates_cycle(
+        db, task_id=task.id, blocked_by_id=blocked_by.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Зависимость создает цикл",
         )
     
-    # Проверка прав (суперпользователь или владелец проекта)
-    if not current_user.is_superuser:
-        project = crud.project.get(db, id=task.project_id)
-        if project.owner_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="У вас недостаточно прав для выполнения этого действия",
-            )
+    crud.task_dependency.create(db, task=task, blocked_by=blocked_by)
+    return {"task_id": task_id, "blocked_by_id": dependency_in.blocked_by_id}
+
+@router.delete(
+    "/{task_id}/dependencies/{blocked_by_id}", response_model=schemas.TaskDependency
+)
+def delete_task_dependency(
+    task_id: int,
+    blocked_by_id: int,
+    db: Session = Depends(get_db),
+    access: TaskAccess = Depends(get_task_for_member),
+) -> Any:
+    """
+    Удалить зависимость
+    """
+    task = access.task
     
-    task = crud.task.remove(db, id=task_id)
-    return task
+    if not crud.task_dependency.remove(db, task=task, blocked_by_id=blocked_by_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Зависимость не найдена",
+        )
+    return {"task_id": task_id, "blocked_by_id": blocked_by_id}
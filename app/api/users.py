@@ -3,53 +3,59 @@ from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
-from app.core.dependencies import get_current_active_user, get_db
+from app import crud, schemas
+from app.core.dependencies import AuthUser, get_current_active_user, get_db, get_read_db
+from app.core.responses import list_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=schemas.User)
 def read_user_me(
-    current_user: models.User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Получить текущего пользователя
     """
-    return current_user
+    return crud.user.get(db, id=current_user.id)
 
 @router.put("/me", response_model=schemas.User)
 def update_user_me(
     user_in: schemas.UserUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Обновить информацию о себе
     """
-    user = crud.user.update(db, db_obj=current_user, obj_in=user_in)
+    user = crud.user.get(db, id=current_user.id)
+    user = crud.user.update(db, db_obj=user, obj_in=user_in)
     return user
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Получить список пользователей
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
     """
-    if current_user.is_superuser:
-        users = crud.user.get_multi(db, skip=skip, limit=limit)
-    else:
-        users = [current_user]
-    return users
+    if not current_user.is_superuser:
+        return list_response(schemas.User, [crud.user.get(db, id=current_user.id)])
+    page = crud.user.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return list_response(schemas.User, page.items, headers=headers)
 
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_active_user),
 ) -> Any:
     """
     Получить пользователя по ID
@@ -66,10 +72,24 @@ def read_user(
             detail="У вас недостаточно прав для выполнения этого действия",
         )
     return user
-    
-@router.get("/", response_model=List[schemas.User])
-def read_users(...):
-    if not current_user.is_superuser:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
-    return users
+
+@router.get("/{user_id}/stats", response_model=schemas.UserStats)
+def read_user_stats(
+    user_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> Any:
+    """
+    Получить сводку по задачам, назначенным пользователю
+    """
+    if not current_user.is_superuser and user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    if not crud.user.get(db, id=user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Пользователь не найден",
+        )
+    return {"user_id": user_id, **crud.task_stats.get_user_stats(db, user_id=user_id)}
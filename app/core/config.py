@@ -1,8 +1,11 @@
+import json
 import os
 import secrets
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, List, Optional, Union
 
-from pydantic import AnyHttpUrl, BaseSettings, PostgresDsn, validator
+from pydantic import AnyHttpUrl, Field, PostgresDsn, ValidationInfo, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+from typing_extensions import Annotated
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
@@ -10,13 +13,17 @@ class Settings(BaseSettings):
     # 60 минут * 24 часа * 7 дней = 7 дней
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
     # BACKEND_CORS_ORIGINS указывается как список строковых URL
-    BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
+    # NoDecode: строку из окружения разбирает валидатор (JSON-список или значения через запятую)
+    BACKEND_CORS_ORIGINS: Annotated[List[AnyHttpUrl], NoDecode] = []
 
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
-    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+    @field_validator("BACKEND_CORS_ORIGINS", "DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def assemble_url_list(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
             return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
+        elif isinstance(v, str):
+            return json.loads(v)
+        elif isinstance(v, list):
             return v
         raise ValueError(v)
 
@@ -27,22 +34,81 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "task_management")
-    DATABASE_URL: Optional[PostgresDsn] = None
+    # Без значения собирается из POSTGRES_*, поэтому валидатор выполняется и для значения по умолчанию
+    DATABASE_URL: Optional[PostgresDsn] = Field(None, validate_default=True)
 
-    @validator("DATABASE_URL", pre=True)
-    def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+    @field_validator("DATABASE_URL", mode="before")
+    @classmethod
+    def assemble_db_connection(cls, v: Optional[str], info: ValidationInfo) -> Any:
         if isinstance(v, str):
             return v
         return PostgresDsn.build(
             scheme="postgresql",
-            user=values.get("POSTGRES_USER"),
-            password=values.get("POSTGRES_PASSWORD"),
-            host=values.get("POSTGRES_SERVER"),
-            path=f"/{values.get('POSTGRES_DB') or ''}",
+            username=info.data.get("POSTGRES_USER"),
+            password=info.data.get("POSTGRES_PASSWORD"),
+            host=info.data.get("POSTGRES_SERVER"),
+            path=info.data.get("POSTGRES_DB") or "",
         )
 
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
+    # Реплики только для чтения (JSON-список или URL через запятую): GET маршруты читают
+    # с них по кругу, недоступная реплика пропускается DATABASE_REPLICA_RETRY_SECONDS секунд
+    DATABASE_REPLICA_URLS: Annotated[List[str], NoDecode] = []
+    DATABASE_REPLICA_RETRY_SECONDS: int = 30
+    # Чтение своих записей: после успешной записи пользователь читает с основной БД
+    # столько секунд (0 - выключено). Учитываются записи через этот процесс
+    READ_YOUR_WRITES_SECONDS: int = 0
+    # Число пользователей, недавние записи которых помнятся для чтения своих записей
+    READ_YOUR_WRITES_CACHE_SIZE: int = 10000
+
+    # Пул соединений с PostgreSQL (у SQLite свой пул). DB_POOL_RECYCLE: пересоздавать соединения
+    # старше N секунд (-1 - нет), DB_POOL_PRE_PING: проверять соединение перед выдачей
+    # (отсеивает разорванные после переключения БД), DB_STATEMENT_TIMEOUT_MS: 0 - без ограничения
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Асинхронный доступ к БД (asyncpg) для маршрутов чтения; синхронные маршруты остаются
+    ASYNC_DATABASE: bool = False
+
+    # Фоновые запуски оптимизатора
+    OPTIMIZER_JOB_WORKERS: int = 2
+    OPTIMIZER_JOB_QUEUE_SIZE: int = 8
+    OPTIMIZER_JOB_TTL_SECONDS: int = 60 * 60
+    # Порог перегрузки (часы) для инкрементальной перебалансировки по умолчанию
+    OPTIMIZER_OVERLOAD_THRESHOLD_HOURS: int = 40
+    # Стратегия capacity_aware: емкость по умолчанию (часов в день) и горизонт планирования
+    OPTIMIZER_DAILY_CAPACITY_HOURS: float = 8
+    OPTIMIZER_HORIZON_DAYS: int = 90
+    # Кэш планов предварительного просмотра (dry-run)
+    OPTIMIZER_PLAN_CACHE_SIZE: int = 256
+    OPTIMIZER_PLAN_TTL_SECONDS: int = 15 * 60
+    # Сценарии "что если": число процессов (None - по числу ядер, 0 - в процессе API)
+    # и максимальное число сценариев в запросе
+    OPTIMIZER_SCENARIO_WORKERS: Optional[int] = None
+    OPTIMIZER_MAX_SCENARIOS: int = 16
+    # Кэш графов зависимостей задач (по проектам). Граф обновляется инкрементально
+    # при изменениях через этот процесс, TTL ограничивает устаревание из-за других процессов
+    DEPENDENCY_GRAPH_CACHE_SIZE: int = 64
+    DEPENDENCY_GRAPH_TTL_SECONDS: int = 5 * 60
+    # Максимальное число задач в одном запросе создания и изменения списком (/tasks/bulk)
+    TASK_BULK_MAX_ITEMS: int = 10000
+    # Период сверки агрегатов задач (task_stats) с таблицей задач, 0 - не сверять
+    TASK_STATS_RECONCILE_SECONDS: int = 60 * 60
+    # Кэш пользователей для проверки прав (id, is_active, is_superuser).
+    # Сбрасывается при изменениях через этот процесс, TTL ограничивает устаревание в остальных
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Кэш проверенных JWT токенов (запись живет не дольше срока действия токена)
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 15 * 60
+    # Хеширование паролей: стоимость bcrypt (log2 числа раундов), число потоков
+    # и число запросов, ожидающих хеширования, сверх которого отвечаем 503
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+
+    model_config = SettingsConfigDict(case_sensitive=True, env_file=".env", extra="ignore")
 
 settings = Settings()
@@ -1,38 +1,105 @@
-from typing import Generator, Optional
+from typing import AsyncIterator, Generator, NamedTuple, Optional, Tuple
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
+from app import crud, models
+from app import database
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.database import get_db
+from app.crud.users import AuthUser
+from app.database import get_async_db, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.User:
+# Пользователи, недавно выполнившие запись: читают с основной БД (READ_YOUR_WRITES_SECONDS)
+recent_writers: "TTLCache[int, bool]" = TTLCache(
+    max_size=settings.READ_YOUR_WRITES_CACHE_SIZE, ttl=settings.READ_YOUR_WRITES_SECONDS
+)
+
+def request_user_id(request: Request) -> Optional[int]:
     """
-    Зависимость для получения текущего пользователя по JWT токену
+    ID пользователя из Bearer токена запроса (None - токена нет или он недействителен)
     """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-        token_data = schemas.TokenPayload(**payload)
+        return security.decode_access_token(token).sub
+    except (jwt.JWTError, ValidationError):
+        return None
+
+def get_read_db(
+    request: Request, db: Session = Depends(get_db)
+) -> Generator[Session, None, None]:
+    """
+    Зависимость для получения сессии БД для маршрутов только для чтения
+
+    Сессия открывается на реплике (см. database.ReplicaRouter), а если реплик
+    нет или все недоступны - используется сессия основной БД из get_db.
+    Пользователь, недавно выполнивший запись, читает с основной БД.
+    Ошибка соединения во время запроса к реплике не повторяется на основной БД:
+    запрос завершается ошибкой, а реплика пропускается следующими запросами
+    """
+    replica_db = database.read_replicas.session() if _reads_from_replica(request) else None
+    if replica_db is None:
+        yield db
+        return
+    try:
+        yield replica_db
+    except OperationalError:
+        database.read_replicas.mark_down(replica_db)
+        raise
+    finally:
+        replica_db.close()
+
+async def get_async_read_db(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> AsyncIterator[AsyncSession]:
+    """
+    Асинхронный вариант get_read_db: сессия реплики из database.async_read_replicas
+    или сессия основной БД из get_async_db
+    """
+    replica_db = (
+        await database.async_read_replicas.session() if _reads_from_replica(request) else None
+    )
+    if replica_db is None:
+        yield db
+        return
+    try:
+        yield replica_db
+    except OperationalError:
+        database.async_read_replicas.mark_down(replica_db)
+        raise
+    finally:
+        await replica_db.close()
+
+def _reads_from_replica(request: Request) -> bool:
+    """
+    Можно ли читать с реплики: пользователь запроса недавно не выполнял запись
+    """
+    user_id = request_user_id(request) if settings.READ_YOUR_WRITES_SECONDS else None
+    return user_id is None or not recent_writers.get(user_id)
+
+def _token_user_id(token: str) -> int:
+    try:
+        return security.decode_access_token(token).sub
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Невозможно проверить учетные данные",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = crud.user.get(db, id=token_data.sub)
+
+def _found_user(user: Optional[AuthUser]) -> AuthUser:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,22 +107,52 @@ def get_current_user(
         )
     return user
 
-def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
-    """
-    Зависимость для получения текущего активного пользователя
-    """
-    if not current_user.is_active:
+def _active_user(user: AuthUser) -> AuthUser:
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Неактивный пользователь"
         )
-    return current_user
+    return user
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> AuthUser:
+    """
+    Зависимость для получения текущего пользователя по JWT токену
+
+    Возвращает поля, нужные для проверки прав, из кэша пользователей
+    (см. crud.user.get_auth). Полная запись: crud.user.get(db, id=current_user.id)
+    """
+    return _found_user(crud.user.get_auth(db, id=_token_user_id(token)))
+
+def get_current_active_user(
+    current_user: AuthUser = Depends(get_current_user),
+) -> AuthUser:
+    """
+    Зависимость для получения текущего активного пользователя
+    """
+    return _active_user(current_user)
+
+async def get_async_current_user(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> AuthUser:
+    """
+    Асинхронный вариант get_current_user для маршрутов с AsyncSession
+    """
+    return _found_user(await crud.async_user.get_auth(db, id=_token_user_id(token)))
+
+async def get_async_current_active_user(
+    current_user: AuthUser = Depends(get_async_current_user),
+) -> AuthUser:
+    """
+    Асинхронный вариант get_current_active_user
+    """
+    return _active_user(current_user)
 
 def get_current_active_superuser(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: AuthUser = Depends(get_current_user),
+) -> AuthUser:
     """
     Зависимость для получения текущего активного суперпользователя
     """
@@ -65,3 +162,88 @@ def get_current_active_superuser(
             detail="Недостаточно прав"
         )
     return current_user
+
+class TaskAccess(NamedTuple):
+    """
+    Задача, доступ к которой проверен, и ID владельца ее проекта
+    """
+    task: models.Task
+    project_owner_id: int
+
+def _task_access(row: Optional[Tuple[models.Task, int]]) -> TaskAccess:
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена",
+        )
+    return TaskAccess(*row)
+
+def _member_access(access: TaskAccess, current_user: AuthUser) -> TaskAccess:
+    if (
+        not current_user.is_superuser
+        and access.project_owner_id != current_user.id
+        and access.task.assigned_to != current_user.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    return access
+
+def get_task_for_member(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> TaskAccess:
+    """
+    Зависимость для получения задачи, доступной пользователю
+    (суперпользователь, владелец проекта или назначенный исполнитель)
+
+    Задача и владелец проекта читаются одним запросом
+    """
+    return _member_access(
+        _task_access(crud.task.get_with_project_owner(db, id=task_id)), current_user
+    )
+
+def get_read_task_for_member(
+    task_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> TaskAccess:
+    """
+    get_task_for_member для маршрутов только для чтения: задача читается через get_read_db
+    """
+    return _member_access(
+        _task_access(crud.task.get_with_project_owner(db, id=task_id)), current_user
+    )
+
+async def get_async_read_task_for_member(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthUser = Depends(get_async_current_active_user),
+) -> TaskAccess:
+    """
+    Асинхронный вариант get_read_task_for_member: задача читается через get_async_read_db
+    """
+    return _member_access(
+        _task_access(await crud.async_task.get_with_project_owner(db, id=task_id)), current_user
+    )
+
+def get_task_for_owner(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user),
+) -> TaskAccess:
+    """
+    Зависимость для получения задачи, которой управляет пользователь
+    (суперпользователь или владелец проекта)
+
+    Задача и владелец проекта читаются одним запросом
+    """
+    access = _task_access(crud.task.get_with_project_owner(db, id=task_id))
+    if not current_user.is_superuser and access.project_owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="У вас недостаточно прав для выполнения этого действия",
+        )
+    return access
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolWaitStats:
+    """
+    Статистика ожидания соединения из пула
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool, измеряющий время получения соединения (wait_stats)
+
+    Время включает ожидание свободного соединения и открытие нового
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """
+    TimedQueuePool для асинхронного движка
+    """
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """
+    Состояние пула: размер, занятые и свободные соединения, переполнение и ожидание
+    """
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            # Отрицательное значение - неиспользованный запас до pool_size
+            overflow=max(pool.overflow(), 0),
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status["checkout_wait"] = wait_stats.as_dict()
+    return status
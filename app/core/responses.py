@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class RawJSONResponse(Response):
+    """
+    Ответ с уже сериализованным JSON (bytes передаются без изменений)
+    """
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def list_response(
+    schema: Type[BaseModel], items: Sequence[Any], *, headers: Optional[Dict[str, str]] = None
+) -> RawJSONResponse:
+    """
+    Сериализовать список ORM объектов по схеме сразу в JSON
+
+    Быстрый путь для списков: FastAPI не валидирует возвращенный Response
+    и не вызывает jsonable_encoder, а чтение атрибутов (from_attributes)
+    и запись JSON выполняет pydantic-core. response_model маршрута остается
+    для документации OpenAPI
+    """
+    adapter = _list_adapter(schema)
+    content = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    return RawJSONResponse(content, headers=headers)
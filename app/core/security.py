@@ -1,12 +1,29 @@
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.schemas.user import TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+T = TypeVar("T")
+
+# Хеши с другой стоимостью bcrypt считаются устаревшими и обновляются при входе
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
+
+# Кэш проверенных токенов: sha256(SECRET_KEY, токен) -> TokenPayload
+token_cache: "TTLCache[bytes, TokenPayload]" = TTLCache(
+    max_size=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -24,14 +41,135 @@ def create_access_token(
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
 
+def decode_access_token(token: str) -> TokenPayload:
+    """
+    Проверить подпись и срок действия JWT токена и получить его данные
+
+    Проверенный токен кэшируется до истечения срока действия, но не дольше
+    TOKEN_CACHE_TTL_SECONDS. Ключ кэша зависит от SECRET_KEY, поэтому после
+    смены ключа токены проверяются заново
+
+    Raises:
+        jwt.JWTError, ValidationError: токен недействителен или истек
+    """
+    key = hashlib.sha256(f"{settings.SECRET_KEY}:{token}".encode()).digest()
+    now = time.time()
+    payload = token_cache.get(key)
+    if payload is not None and payload.exp > now:
+        return payload
+    payload = TokenPayload(**jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]))
+    token_cache.set(key, payload, ttl=min(payload.exp - now, settings.TOKEN_CACHE_TTL_SECONDS))
+    return payload
+
+class PasswordHashingBusy(Exception):
+    """
+    Очередь хеширования паролей заполнена
+    """
+
+class PasswordHasher:
+    """
+    Ограниченный пул потоков для хеширования и проверки паролей
+
+    bcrypt намеренно медленный, поэтому выполняется не в общем пуле потоков
+    обработчиков запросов, а в max_workers отдельных потоках. Ждать результата
+    могут еще max_queued запросов, остальные сразу получают PasswordHashingBusy.
+    Асинхронные маршруты (вход, регистрация) ждут результат через run_async,
+    не занимая потоков обработчиков; run блокирует вызывающий поток
+    """
+
+    def __init__(self, *, max_workers: int, max_queued: int):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._active = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполнить func(*args) в пуле и дождаться результата
+        """
+        return self.submit(func, *args).result()
+
+    async def run_async(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполнить func(*args) в пуле и дождаться результата без блокировки цикла событий
+        """
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def submit(self, func: Callable[..., T], *args: Any) -> "Future[T]":
+        """
+        Поставить func(*args) в очередь пула
+
+        Raises:
+            PasswordHashingBusy: заняты все потоки и места в очереди
+        """
+        with self._lock:
+            if self._active >= self.max_workers + self.max_queued:
+                raise PasswordHashingBusy()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+            self._active += 1
+            executor = self._executor
+        try:
+            future = executor.submit(func, *args)
+        except RuntimeError:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._active -= 1
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queued=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Проверка пароля
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Проверка пароля с обновлением хеша
+
+    Returns:
+        (пароль верен, новый хеш или None, если хеш создан с текущими параметрами)
+    """
+    return password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Асинхронный вариант verify_and_update_password
+    """
+    return await password_hasher.run_async(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 def get_password_hash(password: str) -> str:
     """
     Хеширование пароля
     """
-    return pwd_context.hash(password)
+    return password_hasher.run(pwd_context.hash, password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Асинхронный вариант get_password_hash
+    """
+    return await password_hasher.run_async(pwd_context.hash, password)
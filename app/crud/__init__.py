@@ -1,4 +1,6 @@
-from app.crud.base import CRUDBase
-from app.crud.users import user
-from app.crud.projects import project
-from app.crud.tasks import task
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.users import async_user, user
+from app.crud.projects import async_project, project
+from app.crud.tasks import async_task, task
+from app.crud.task_dependencies import task_dependency
+from app.crud.task_stats import task_stats
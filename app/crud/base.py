@@ -2,8 +2,10 @@ from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.crud.pagination import Page, SortColumn, SortOrder, paginate
 from app.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -19,6 +21,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             model: SQLAlchemy модель
         """
         self.model = model
+        # Порядок постраничного чтения по умолчанию - по первичному ключу
+        self.default_order = SortOrder("id", [SortColumn(model.id)])
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         """
@@ -32,7 +36,25 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Получить несколько записей
         """
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self.get_page(db, skip=skip, limit=limit).items
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0
+    ) -> Page:
+        """
+        Получить страницу записей по курсору (см. app.crud.pagination)
+
+        Raises:
+            InvalidCursor: некорректный курсор
+        """
+        return paginate(
+            db.query(self.model), self.default_order, cursor=cursor, limit=limit, skip=skip
+        )
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
@@ -59,7 +81,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
@@ -76,3 +98,62 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, crud: CRUDBase[ModelType, CreateSchemaType, UpdateSchemaType]):
+        """
+        Асинхронный CRUD объект для AsyncSession
+
+        Чтение по ID выполняется напрямую, остальные операции - синхронной
+        реализацией crud в AsyncSession.run_sync. Запросы при этом идут через
+        асинхронный драйвер и не занимают поток, а логика операций
+        (пагинация, агрегаты, кэши) остается в одном месте
+
+        Args:
+            crud: синхронный CRUD объект той же модели
+        """
+        self.crud = crud
+        self.model = crud.model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """
+        Получить запись по ID
+        """
+        return await db.get(self.model, id)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0
+    ) -> Page:
+        """
+        Получить страницу записей по курсору (см. CRUDBase.get_page)
+        """
+        return await db.run_sync(self.crud.get_page, cursor=cursor, limit=limit, skip=skip)
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """
+        Создать запись
+        """
+        return await db.run_sync(self.crud.create, obj_in=obj_in)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Обновить запись
+        """
+        return await db.run_sync(self.crud.update, db_obj=db_obj, obj_in=obj_in)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
+        """
+        Удалить запись
+        """
+        return await db.run_sync(self.crud.remove, id=id)
@@ -0,0 +1,133 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import and_, false, or_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """
+    Курсор поврежден или относится к другому порядку сортировки
+    """
+
+
+class SortColumn(NamedTuple):
+    """
+    Столбец ключа сортировки
+    """
+    column: Any
+    descending: bool = False
+    # NULL сортируются в конце при любом направлении
+    nullable: bool = False
+
+
+class SortOrder(NamedTuple):
+    """
+    Порядок сортировки для постраничного чтения
+
+    Последний столбец должен быть уникальным (обычно id), чтобы порядок был полным
+    """
+    name: str
+    columns: Sequence[SortColumn]
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    # Курсор следующей страницы (None - страница последняя)
+    next_cursor: Optional[str]
+
+
+def encode_cursor(order: SortOrder, item: Any) -> str:
+    """
+    Закодировать ключ сортировки записи в непрозрачный курсор
+    """
+    values = []
+    for sort_column in order.columns:
+        value = getattr(item, sort_column.column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        values.append(value)
+    payload = json.dumps({"o": order.name, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(order: SortOrder, cursor: str) -> List[Any]:
+    """
+    Раскодировать курсор в значения ключа сортировки
+
+    Raises:
+        InvalidCursor: курсор поврежден или выдан для другого порядка
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = payload["k"]
+        if payload["o"] != order.name or len(values) != len(order.columns):
+            raise InvalidCursor()
+        return [
+            datetime.fromisoformat(value)
+            if value is not None and sort_column.column.type.python_type is datetime
+            else value
+            for sort_column, value in zip(order.columns, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor() from e
+
+
+def _order_by(sort_column: SortColumn) -> Any:
+    clause = sort_column.column.desc() if sort_column.descending else sort_column.column.asc()
+    return clause.nulls_last() if sort_column.nullable else clause
+
+
+def _after(columns: Sequence[SortColumn], values: Sequence[Any]) -> Any:
+    """
+    Условие "запись идет после ключа values" для порядка columns
+    """
+    sort_column, value = columns[0], values[0]
+    column = sort_column.column
+    if value is None:
+        # После NULL (в конце порядка) идут только NULL
+        greater = false()
+        equal = column.is_(None)
+    else:
+        greater = column < value if sort_column.descending else column > value
+        if sort_column.nullable:
+            greater = or_(greater, column.is_(None))
+        equal = column == value
+    if len(columns) == 1:
+        return greater
+    return or_(greater, and_(equal, _after(columns[1:], values[1:])))
+
+
+def paginate(
+    query: Query,
+    order: SortOrder,
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    skip: int = 0,
+) -> Page:
+    """
+    Прочитать страницу по ключу сортировки (keyset pagination)
+
+    Страница начинается сразу после записи, закодированной в курсоре, поэтому
+    ее стоимость не зависит от номера страницы (в отличие от OFFSET), а вставки
+    и удаления между запросами не приводят к пропускам и повторам.
+    skip поддерживается для совместимости и применяется после курсора
+    """
+    if limit <= 0:
+        return Page([], None)
+    if cursor:
+        query = query.filter(_after(order.columns, decode_cursor(order, cursor)))
+    query = query.order_by(*(_order_by(sort_column) for sort_column in order.columns))
+    if skip:
+        query = query.offset(skip)
+
+    # Лишняя запись показывает, есть ли следующая страница
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return Page(items, None)
+    items = items[:limit]
+    return Page(items, encode_cursor(order, items[-1]))
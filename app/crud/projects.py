@@ -1,9 +1,15 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Tuple
 
+from sqlalchemy import Select, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import Page, paginate
+from app.crud.task_dependencies import task_dependency
+from app.crud.task_stats import task_stats
 from app.models.project import Project
+from app.models.task import Task, TaskStatus
 from app.schemas.project import ProjectCreate, ProjectUpdate
 
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
@@ -13,25 +19,122 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
         """
         Создать проект с указанием владельца
         """
-        obj_in_data = obj_in.dict()
+        obj_in_data = obj_in.model_dump()
         db_obj = Project(**obj_in_data, owner_id=owner_id)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def get_with_task_counts(
+        self, db: Session, *, id: int
+    ) -> Optional[Tuple[Project, int, int]]:
+        """
+        Получить проект, число его задач и число выполненных задач одним запросом
+
+        Задачи не загружаются: счетчики считаются агрегатом COUNT(*) FILTER
+        по индексу (project_id, status, priority)
+        """
+        return db.execute(self._with_task_counts(id)).first()
+
+    def _with_task_counts(self, id: int) -> Select:
+        counts = (
+            select(
+                func.count().label("tasks_count"),
+                func.count().filter(Task.status == TaskStatus.DONE).label("completed_tasks_count"),
+            )
+            .where(Task.project_id == id)
+            .subquery()
+        )
+        return (
+            select(Project, counts.c.tasks_count, counts.c.completed_tasks_count)
+            .join(counts, true())
+            .where(Project.id == id)
+        )
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> List[Project]:
         """
         Получить все проекты для конкретного пользователя
         """
-        return (
-            db.query(Project)
-            .filter(Project.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return self.get_page_by_owner(db, owner_id=owner_id, skip=skip, limit=limit).items
+
+    def get_page_by_owner(
+        self,
+        db: Session,
+        *,
+        owner_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0
+    ) -> Page:
+        """
+        Получить страницу проектов пользователя по курсору
+        """
+        return paginate(
+            db.query(Project).filter(Project.owner_id == owner_id),
+            self.default_order,
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+        )
+
+    def get_owner_ids(self, db: Session, *, ids: List[int]) -> Dict[int, int]:
+        """
+        Получить владельцев существующих проектов из списка одним запросом: ID проекта -> ID владельца
+        """
+        if not ids:
+            return {}
+        return dict(
+            db.execute(select(Project.id, Project.owner_id).where(Project.id.in_(ids))).all()
         )
 
+    def remove(self, db: Session, *, id: int) -> Project:
+        """
+        Удалить проект вместе с задачами, их зависимостями и агрегатами
+        """
+        task_dependency.remove_for_project(db, project_id=id)
+        task_stats.remove_for_project(db, project_id=id)
+        project = super().remove(db, id=id)
+        task_dependency.project_removed(project_id=id)
+        return project
+
 project = CRUDProject(Project)
+
+class AsyncCRUDProject(AsyncCRUDBase[Project, ProjectCreate, ProjectUpdate]):
+    crud: CRUDProject
+
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: ProjectCreate, owner_id: int
+    ) -> Project:
+        """
+        Создать проект с указанием владельца
+        """
+        return await db.run_sync(self.crud.create_with_owner, obj_in=obj_in, owner_id=owner_id)
+
+    async def get_with_task_counts(
+        self, db: AsyncSession, *, id: int
+    ) -> Optional[Tuple[Project, int, int]]:
+        """
+        Получить проект, число его задач и число выполненных задач одним запросом
+        """
+        return (await db.execute(self.crud._with_task_counts(id))).first()
+
+    async def get_page_by_owner(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0
+    ) -> Page:
+        """
+        Получить страницу проектов пользователя по курсору
+        """
+        return await db.run_sync(
+            self.crud.get_page_by_owner, owner_id=owner_id, cursor=cursor, limit=limit, skip=skip
+        )
+
+async_project = AsyncCRUDProject(project)
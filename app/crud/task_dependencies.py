@@ -0,0 +1,280 @@
+import threading
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import delete, exists, insert, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.project import Project
+from app.models.task import Task, task_dependencies
+from app.optimizer.graph import CycleError, DependencyGraph
+
+
+class CRUDTaskDependency:
+    """
+    Зависимости между задачами и кэш графов зависимостей по проектам
+
+    Графы загружаются из БД один раз и затем обновляются инкрементально
+    при изменении зависимостей и оценок задач через этот объект
+    """
+
+    def __init__(self):
+        self.graphs: "TTLCache[int, DependencyGraph]" = TTLCache(
+            max_size=settings.DEPENDENCY_GRAPH_CACHE_SIZE,
+            ttl=settings.DEPENDENCY_GRAPH_TTL_SECONDS,
+        )
+        # Графы изменяются на месте, а запросы обрабатываются в нескольких потоках
+        self._lock = threading.Lock()
+
+    def get_blockers(self, db: Session, *, task_id: int) -> List[int]:
+        """
+        Получить ID задач, блокирующих задачу
+        """
+        rows = db.execute(
+            select(task_dependencies.c.blocked_by_id)
+            .where(task_dependencies.c.task_id == task_id)
+            .order_by(task_dependencies.c.blocked_by_id)
+        )
+        return [blocked_by_id for blocked_by_id, in rows]
+
+    def get_blockers_among(self, db: Session, *, task_ids: List[int]) -> Dict[int, List[int]]:
+        """
+        Получить зависимости внутри набора задач: ID задачи -> ID блокирующих задач
+        """
+        if not task_ids:
+            return {}
+        ids = set(task_ids)
+        rows = db.execute(
+            select(task_dependencies.c.task_id, task_dependencies.c.blocked_by_id)
+            .where(task_dependencies.c.task_id.in_(ids))
+        )
+        blockers: Dict[int, List[int]] = defaultdict(list)
+        for task_id, blocked_by_id in rows:
+            if blocked_by_id in ids:
+                blockers[task_id].append(blocked_by_id)
+        return dict(blockers)
+
+    def has_any(self, db: Session, *, task_id: int) -> bool:
+        """
+        Участвует ли задача в зависимостях
+        """
+        return db.query(
+            exists().where(
+                or_(
+                    task_dependencies.c.task_id == task_id,
+                    task_dependencies.c.blocked_by_id == task_id,
+                )
+            )
+        ).scalar()
+
+    def get_with_any(self, db: Session, *, task_ids: List[int]) -> Set[int]:
+        """
+        Получить ID задач из списка, участвующих в зависимостях, одним запросом
+        """
+        if not task_ids:
+            return set()
+        rows = db.execute(
+            select(task_dependencies.c.task_id).where(task_dependencies.c.task_id.in_(task_ids))
+            .union(
+                select(task_dependencies.c.blocked_by_id)
+                .where(task_dependencies.c.blocked_by_id.in_(task_ids))
+            )
+        )
+        return {task_id for task_id, in rows}
+
+    def lock_project(self, db: Session, *, project_id: int) -> None:
+        """
+        Заблокировать строку проекта (SELECT ... FOR UPDATE) до конца транзакции
+
+        Сериализует изменения зависимостей проекта: проверки has_dependency и
+        creates_cycle после блокировки видят все зафиксированные зависимости, а
+        вставка в create выполняется в той же транзакции. Блокировки только двух
+        задач недостаточно: цикл могут замкнуть вставки ребер между разными задачами
+        """
+        db.execute(select(Project.id).where(Project.id == project_id).with_for_update())
+
+    def has_dependency(self, db: Session, *, task_id: int, blocked_by_id: int) -> bool:
+        return db.query(
+            exists().where(
+                task_dependencies.c.task_id == task_id,
+                task_dependencies.c.blocked_by_id == blocked_by_id,
+            )
+        ).scalar()
+
+    def creates_cycle(self, db: Session, *, task_id: int, blocked_by_id: int) -> bool:
+        """
+        Создаст ли зависимость цикл
+
+        Проверяется по БД рекурсивным запросом: обходятся только задачи,
+        от которых транзитивно зависит blocked_by_id
+        """
+        if task_id == blocked_by_id:
+            return True
+        ancestors = (
+            select(task_dependencies.c.blocked_by_id.label("id"))
+            .where(task_dependencies.c.task_id == blocked_by_id)
+            .cte("ancestors", recursive=True)
+        )
+        ancestors = ancestors.union(
+            select(task_dependencies.c.blocked_by_id).select_from(
+                task_dependencies.join(
+                    ancestors, task_dependencies.c.task_id == ancestors.c.id
+                )
+            )
+        )
+        return db.query(exists().where(ancestors.c.id == task_id)).scalar()
+
+    def create(self, db: Session, *, task: Task, blocked_by: Task) -> None:
+        """
+        Добавить зависимость и зафиксировать транзакцию
+
+        Проверки проекта и цикла выполняются до вызова в той же транзакции
+        после lock_project
+        """
+        project_id = task.project_id
+        hours = {
+            task.id: task.estimated_hours or 0,
+            blocked_by.id: blocked_by.estimated_hours or 0,
+        }
+        db.execute(
+            insert(task_dependencies).values(task_id=task.id, blocked_by_id=blocked_by.id)
+        )
+        db.commit()
+
+        with self._lock:
+            graph = self.graphs.get(project_id)
+            if graph is not None:
+                try:
+                    graph.add_edge(task.id, blocked_by.id, hours=hours)
+                except CycleError:
+                    # Граф в кэше устарел относительно БД
+                    self.graphs.invalidate(project_id)
+
+    def remove(self, db: Session, *, task: Task, blocked_by_id: int) -> bool:
+        """
+        Удалить зависимость, вернуть False, если ее не было
+        """
+        project_id = task.project_id
+        result = db.execute(
+            delete(task_dependencies).where(
+                task_dependencies.c.task_id == task.id,
+                task_dependencies.c.blocked_by_id == blocked_by_id,
+            )
+        )
+        db.commit()
+        if not result.rowcount:
+            return False
+
+        with self._lock:
+            graph = self.graphs.get(project_id)
+            if graph is not None:
+                graph.remove_edge(task.id, blocked_by_id)
+        return True
+
+    def remove_for_task(self, db: Session, *, task_id: int) -> None:
+        """
+        Удалить все зависимости задачи без commit (перед удалением самой задачи)
+        """
+        db.execute(
+            delete(task_dependencies).where(
+                or_(
+                    task_dependencies.c.task_id == task_id,
+                    task_dependencies.c.blocked_by_id == task_id,
+                )
+            )
+        )
+
+    def remove_for_project(self, db: Session, *, project_id: int) -> None:
+        """
+        Удалить все зависимости задач проекта без commit (перед удалением проекта)
+        """
+        db.execute(
+            delete(task_dependencies).where(
+                task_dependencies.c.task_id.in_(
+                    select(Task.id).where(Task.project_id == project_id)
+                )
+            )
+        )
+
+    def get_graph(self, db: Session, *, project_id: int) -> DependencyGraph:
+        """
+        Получить граф зависимостей проекта (из кэша или из БД)
+
+        Граф загружается под блокировкой, чтобы изменения, закоммиченные
+        во время загрузки, применились к нему, а не потерялись
+        """
+        with self._lock:
+            graph = self.graphs.get(project_id)
+            if graph is None:
+                graph = self._load_graph(db, project_id=project_id)
+                self.graphs.set(project_id, graph)
+            return graph
+
+    def _load_graph(self, db: Session, *, project_id: int) -> DependencyGraph:
+        blocker = aliased(Task)
+        rows = (
+            db.query(
+                task_dependencies.c.task_id,
+                Task.estimated_hours,
+                task_dependencies.c.blocked_by_id,
+                blocker.estimated_hours,
+            )
+            .select_from(task_dependencies)
+            .join(Task, Task.id == task_dependencies.c.task_id)
+            .join(blocker, blocker.id == task_dependencies.c.blocked_by_id)
+            .filter(Task.project_id == project_id)
+            .all()
+        )
+        hours: Dict[int, float] = {}
+        edges = []
+        for task_id, task_hours, blocked_by_id, blocker_hours in rows:
+            hours[task_id] = task_hours or 0
+            hours[blocked_by_id] = blocker_hours or 0
+            edges.append((task_id, blocked_by_id))
+        return DependencyGraph.build(hours, edges)
+
+    def get_critical_path(
+        self, db: Session, *, project_id: int
+    ) -> Tuple[float, List[int], List[int]]:
+        """
+        Критический путь проекта
+
+        Returns:
+            длина критического пути в часах, задачи критического пути
+            и все задачи с зависимостями в топологическом порядке
+        """
+        graph = self.get_graph(db, project_id=project_id)
+        with self._lock:
+            return (
+                graph.critical_path_length(),
+                graph.critical_path(),
+                list(graph.topological_order()),
+            )
+
+    def hours_changed(self, *, project_id: int, hours: Dict[int, float]) -> None:
+        """
+        Обновить оценки задач в кэшированном графе проекта
+        """
+        with self._lock:
+            graph = self.graphs.get(project_id)
+            if graph is None:
+                return
+            for task_id, task_hours in hours.items():
+                graph.set_hours(task_id, task_hours or 0)
+
+    def task_removed(self, *, project_id: int, task_id: int) -> None:
+        """
+        Убрать удаленную задачу из кэшированного графа проекта
+        """
+        with self._lock:
+            graph = self.graphs.get(project_id)
+            if graph is not None:
+                graph.remove_task(task_id)
+
+    def project_removed(self, *, project_id: int) -> None:
+        with self._lock:
+            self.graphs.invalidate(project_id)
+
+task_dependency = CRUDTaskDependency()
@@ -0,0 +1,302 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.task_stats import TaskStat
+
+PROJECT_SCOPE = "project"
+USER_SCOPE = "user"
+
+# Строк агрегата в одном UPSERT (6 параметров на строку)
+UPSERT_BATCH_SIZE = 1000
+
+# Диапазон ID проектов (исполнителей), сверяемых за один снимок
+RECONCILE_BATCH_SIZE = 1000
+
+# Ключ строки агрегата: (scope, scope_id, status, priority)
+StatKey = Tuple[str, int, TaskStatus, int]
+
+
+class TaskFacts(NamedTuple):
+    """
+    Поля задачи, от которых зависят агрегаты
+    """
+    project_id: int
+    assigned_to: Optional[int]
+    status: TaskStatus
+    priority: int
+    hours: int
+
+    @classmethod
+    def of(cls, task: Task) -> "TaskFacts":
+        return cls(
+            project_id=task.project_id,
+            assigned_to=task.assigned_to,
+            status=TaskStatus(task.status),
+            priority=int(task.priority),
+            hours=task.estimated_hours or 0,
+        )
+
+    def updated(self, changes: Dict[str, Any]) -> "TaskFacts":
+        """
+        Поля задачи после изменения changes (поля модели Task)
+        """
+        values = self._asdict()
+        for field in ("project_id", "assigned_to", "status", "priority"):
+            # null в обязательных полях отклонит БД, агрегаты сохраняют прежние значения
+            if field in changes and (changes[field] is not None or field == "assigned_to"):
+                values[field] = changes[field]
+        if "estimated_hours" in changes:
+            values["hours"] = changes["estimated_hours"] or 0
+        values["status"] = TaskStatus(values["status"])
+        values["priority"] = int(values["priority"])
+        return TaskFacts(**values)
+
+
+class CRUDTaskStats:
+    """
+    Агрегаты задач по проектам и исполнителям (таблица task_stats)
+
+    Записи задач в CRUDTask передают сюда изменения полей, и агрегаты обновляются
+    в той же транзакции одним UPSERT с приращениями. reconcile пересчитывает
+    агрегаты по задачам и исправляет расхождения (например, после записи в обход CRUD)
+    """
+
+    def apply(self, db: Session, changes: Iterable[Tuple[TaskFacts, int]]) -> None:
+        """
+        Учесть изменения задач в агрегатах без commit
+
+        Args:
+            changes: пары (поля задачи, знак): +1 - задача с такими полями появилась,
+                -1 - исчезла. Изменение задачи - пара из старых полей с -1 и новых с +1
+        """
+        deltas: Dict[StatKey, List[int]] = defaultdict(lambda: [0, 0])
+        for facts, sign in changes:
+            scopes = [(PROJECT_SCOPE, facts.project_id)]
+            if facts.assigned_to is not None:
+                scopes.append((USER_SCOPE, facts.assigned_to))
+            for scope, scope_id in scopes:
+                delta = deltas[(scope, scope_id, facts.status, facts.priority)]
+                delta[0] += sign
+                delta[1] += sign * facts.hours
+
+        # Постоянный порядок строк исключает взаимные блокировки параллельных UPSERT
+        rows = [
+            self._row(key, task_count, hours)
+            for key, (task_count, hours) in sorted(deltas.items(), key=self._sort_key)
+            if task_count or hours
+        ]
+        if rows:
+            self._upsert(db, rows, increment=True)
+
+    def remove_for_project(self, db: Session, *, project_id: int) -> None:
+        """
+        Убрать из агрегатов задачи удаляемого проекта без commit
+        """
+        rows = (
+            db.query(
+                Task.assigned_to,
+                Task.status,
+                Task.priority,
+                func.count(),
+                func.coalesce(func.sum(Task.estimated_hours), 0),
+            )
+            .filter(Task.project_id == project_id, Task.assigned_to.isnot(None))
+            .group_by(Task.assigned_to, Task.status, Task.priority)
+            .all()
+        )
+        deltas = [
+            self._row((USER_SCOPE, user_id, status, priority), -task_count, -int(hours))
+            for user_id, status, priority, task_count, hours in rows
+        ]
+        if deltas:
+            self._upsert(db, deltas, increment=True)
+        db.execute(
+            delete(TaskStat).where(
+                TaskStat.scope == PROJECT_SCOPE, TaskStat.scope_id == project_id
+            )
+        )
+
+    def get_project_stats(self, db: Session, *, project_id: int) -> Dict[str, Any]:
+        """
+        Получить сводку по задачам проекта
+        """
+        return self._get_stats(
+            db, scope=PROJECT_SCOPE, scope_id=project_id, column=Task.project_id
+        )
+
+    def get_user_stats(self, db: Session, *, user_id: int) -> Dict[str, Any]:
+        """
+        Получить сводку по задачам, назначенным пользователю
+        """
+        return self._get_stats(db, scope=USER_SCOPE, scope_id=user_id, column=Task.assigned_to)
+
+    def reconcile(self, db: Session) -> int:
+        """
+        Пересчитать агрегаты по таблице задач и исправить расхождения
+
+        Агрегаты сверяются по областям (проекты, исполнители) и диапазонам
+        RECONCILE_BATCH_SIZE ID. Для диапазона задачи и агрегат читаются из одного
+        снимка БД (REPEATABLE READ в PostgreSQL), а расхождение записывается отдельной
+        короткой транзакцией как приращение. Таблицы не блокируются: приращения
+        параллельных записей задач, сделанные после снимка, складываются с поправкой
+        и не теряются. Вызывается вне транзакции сессии
+
+        Returns:
+            число исправленных строк агрегата
+        """
+        drift = 0
+        for scope, column in ((PROJECT_SCOPE, Task.project_id), (USER_SCOPE, Task.assigned_to)):
+            bounds = [
+                db.query(func.min(column), func.max(column)).one(),
+                db.query(func.min(TaskStat.scope_id), func.max(TaskStat.scope_id))
+                .filter(TaskStat.scope == scope)
+                .one(),
+            ]
+            db.commit()
+            lows = [low for low, _ in bounds if low is not None]
+            if not lows:
+                continue
+            high = max(high for _, high in bounds if high is not None)
+            for low in range(min(lows), high + 1, RECONCILE_BATCH_SIZE):
+                deltas = self._snapshot_deltas(
+                    db, scope=scope, column=column, low=low, high=low + RECONCILE_BATCH_SIZE - 1
+                )
+                if not deltas:
+                    continue
+                try:
+                    self._upsert(db, deltas, increment=True)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                drift += len(deltas)
+        return drift
+
+    def _snapshot_deltas(
+        self, db: Session, *, scope: str, column: Any, low: int, high: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Поправки агрегата области scope для ID из [low, high]: пересчет по задачам
+        минус агрегат, оба прочитаны из одного снимка
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        try:
+            deltas: Dict[StatKey, List[int]] = defaultdict(lambda: [0, 0])
+            rows = (
+                db.query(
+                    column,
+                    Task.status,
+                    Task.priority,
+                    func.count(),
+                    func.coalesce(func.sum(Task.estimated_hours), 0),
+                )
+                .filter(column.between(low, high))
+                .group_by(column, Task.status, Task.priority)
+            )
+            for scope_id, status, priority, task_count, hours in rows:
+                delta = deltas[(scope, scope_id, status, priority)]
+                delta[0] += task_count
+                delta[1] += int(hours)
+            rows = db.query(
+                TaskStat.scope_id, TaskStat.status, TaskStat.priority, TaskStat.task_count, TaskStat.hours
+            ).filter(TaskStat.scope == scope, TaskStat.scope_id.between(low, high))
+            for scope_id, status, priority, task_count, hours in rows:
+                delta = deltas[(scope, scope_id, status, priority)]
+                delta[0] -= task_count
+                delta[1] -= hours
+        finally:
+            # Снимок только читается, транзакция закрывается сразу
+            db.commit()
+        # Строки, ставшие нулевыми после удаления задач, остаются в агрегате
+        return [
+            self._row(key, task_count, hours)
+            for key, (task_count, hours) in sorted(deltas.items(), key=self._sort_key)
+            if task_count or hours
+        ]
+
+    def _get_stats(self, db: Session, *, scope: str, scope_id: int, column: Any) -> Dict[str, Any]:
+        by_status = {status: 0 for status in TaskStatus}
+        by_priority = {int(priority): 0 for priority in TaskPriority}
+        open_hours = 0
+        rows = db.query(
+            TaskStat.status, TaskStat.priority, TaskStat.task_count, TaskStat.hours
+        ).filter(TaskStat.scope == scope, TaskStat.scope_id == scope_id)
+        for status, priority, task_count, hours in rows:
+            by_status[status] += task_count
+            by_priority[priority] = by_priority.get(priority, 0) + task_count
+            if status != TaskStatus.DONE:
+                open_hours += hours
+
+        # Просрочка зависит от текущего времени, поэтому не хранится в агрегате,
+        # а считается по частичному индексу невыполненных задач
+        overdue_count = (
+            db.query(func.count())
+            .select_from(Task)
+            .filter(
+                column == scope_id,
+                Task.status != TaskStatus.DONE,
+                Task.deadline < datetime.now(timezone.utc),
+            )
+            .scalar()
+        )
+        return {
+            "tasks_count": sum(by_status.values()),
+            "by_status": by_status,
+            "by_priority": by_priority,
+            "open_hours": open_hours,
+            "overdue_count": overdue_count,
+        }
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]], *, increment: bool) -> None:
+        """
+        INSERT ... ON CONFLICT DO UPDATE: прибавить значения rows (increment)
+        или заменить ими существующие строки
+
+        Строки записываются пачками по UPSERT_BATCH_SIZE, чтобы не превысить
+        ограничение числа параметров запроса
+        """
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            insert = dialect.insert(TaskStat).values(rows[start:start + UPSERT_BATCH_SIZE])
+            if increment:
+                values = {
+                    "task_count": TaskStat.task_count + insert.excluded.task_count,
+                    "hours": TaskStat.hours + insert.excluded.hours,
+                }
+            else:
+                values = {"task_count": insert.excluded.task_count, "hours": insert.excluded.hours}
+            db.execute(
+                insert.on_conflict_do_update(
+                    index_elements=[
+                        TaskStat.scope, TaskStat.scope_id, TaskStat.status, TaskStat.priority
+                    ],
+                    set_=values,
+                )
+            )
+
+    @staticmethod
+    def _row(key: StatKey, task_count: int, hours: int) -> Dict[str, Any]:
+        scope, scope_id, status, priority = key
+        return {
+            "scope": scope,
+            "scope_id": scope_id,
+            "status": status,
+            "priority": priority,
+            "task_count": task_count,
+            "hours": hours,
+        }
+
+    @staticmethod
+    def _sort_key(item: Tuple[StatKey, Any]) -> Tuple[str, int, str, int]:
+        scope, scope_id, status, priority = item[0]
+        return scope, scope_id, status.name, priority
+
+
+task_stats = CRUDTaskStats()
@@ -1,13 +1,34 @@
-from typing import List, Optional, Dict, Any, Union
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple, Union
 
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import CompoundSelect, Row, Select, func, insert, or_, select, union_all, update
 
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import Page, SortColumn, SortOrder, paginate
+from app.crud.task_dependencies import task_dependency
+from app.crud.task_stats import TaskFacts, task_stats
 from app.models.task import Task, TaskStatus
 from app.models.project import Project
 from app.schemas.task import TaskCreate, TaskUpdate
 
+# Число задач в одном INSERT или UPDATE при создании и изменении списком
+BULK_BATCH_SIZE = 1000
+
+# Порядки постраничного чтения задач
+TASK_ORDERS = {
+    "id": SortOrder("id", [SortColumn(Task.id)]),
+    # Сначала высокий приоритет, затем ближайший дедлайн (без дедлайна - в конце)
+    "priority": SortOrder("priority", [
+        SortColumn(Task.priority, descending=True),
+        SortColumn(Task.deadline, nullable=True),
+        SortColumn(Task.id),
+    ]),
+}
+
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
     def create_with_creator(
         self, db: Session, *, obj_in: TaskCreate, creator_id: int
@@ -15,13 +36,95 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         """
         Создать задачу с указанием создателя
         """
-        obj_in_data = obj_in.dict()
+        obj_in_data = obj_in.model_dump()
         db_obj = Task(**obj_in_data, created_by=creator_id)
         db.add(db_obj)
+        task_stats.apply(db, [(TaskFacts.of(db_obj), 1)])
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def create_many_with_creator(
+        self, db: Session, *, objs_in: List[TaskCreate], creator_id: int
+    ) -> List[int]:
+        """
+        Создать задачи списком одной транзакцией и вернуть их ID в порядке objs_in
+
+        Задачи записываются пачками по BULK_BATCH_SIZE через executemany
+        INSERT ... RETURNING id: на PostgreSQL SQLAlchemy собирает пачку в многострочный
+        INSERT с сохранением порядка ID (на SQLite - по строке в той же транзакции).
+        Объекты Task не создаются и после commit не перечитываются
+        """
+        if not objs_in:
+            return []
+        rows = [{**obj_in.model_dump(), "created_by": creator_id} for obj_in in objs_in]
+        statement = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+        ids: List[int] = []
+        try:
+            task_stats.apply(db, [
+                (
+                    TaskFacts(
+                        project_id=row["project_id"],
+                        assigned_to=row["assigned_to"],
+                        status=TaskStatus(row["status"]),
+                        priority=int(row["priority"]),
+                        hours=row["estimated_hours"] or 0,
+                    ),
+                    1,
+                )
+                for row in rows
+            ])
+            for start in range(0, len(rows), BULK_BATCH_SIZE):
+                ids += db.scalars(statement, rows[start:start + BULK_BATCH_SIZE]).all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return ids
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Task,
+        obj_in: Union[TaskUpdate, Dict[str, Any]]
+    ) -> Task:
+        """
+        Обновить задачу, агрегаты задач и оценку в кэшированном графе зависимостей
+        """
+        estimated_hours = db_obj.estimated_hours
+        changes = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        facts = TaskFacts.of(db_obj)
+        task_stats.apply(db, [(facts, -1), (facts.updated(changes), 1)])
+        task = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        if task.estimated_hours != estimated_hours:
+            task_dependency.hours_changed(
+                project_id=task.project_id,
+                hours={task.id: task.estimated_hours}
+            )
+        return task
+
+    def remove(self, db: Session, *, id: int) -> Task:
+        """
+        Удалить задачу вместе с ее зависимостями и учесть удаление в агрегатах
+        """
+        task_stats.apply(db, [(TaskFacts.of(db.get(Task, id)), -1)])
+        task_dependency.remove_for_task(db, task_id=id)
+        task = super().remove(db, id=id)
+        task_dependency.task_removed(project_id=task.project_id, task_id=id)
+        return task
+
+    def get_with_project_owner(self, db: Session, *, id: int) -> Optional[Tuple[Task, int]]:
+        """
+        Получить задачу и ID владельца ее проекта одним запросом
+        """
+        return (
+            db.query(Task, Project.owner_id)
+            .join(Project, Project.id == Task.project_id)
+            .filter(Task.id == id)
+            .first()
+        )
+
     def get_multi_filtered(
         self, 
         db: Session, 
@@ -36,21 +139,43 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         """
         Получить задачи с фильтрацией
         """
-        query = db.query(Task)
-        
-        if project_id:
-            query = query.filter(Task.project_id == project_id)
-        
-        if status:
-            query = query.filter(Task.status == status)
-        
-        if priority:
-            query = query.filter(Task.priority == priority)
-        
-        if assigned_to:
-            query = query.filter(Task.assigned_to == assigned_to)
-        
-        return query.offset(skip).limit(limit).all()
+        return self.get_page_filtered(
+            db,
+            skip=skip,
+            limit=limit,
+            project_id=project_id,
+            status=status,
+            priority=priority,
+            assigned_to=assigned_to
+        ).items
+
+    def get_page_filtered(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        order_by: str = "id",
+        project_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[int] = None,
+        assigned_to: Optional[int] = None
+    ) -> Page:
+        """
+        Получить страницу задач с фильтрацией по курсору
+
+        Args:
+            order_by: порядок из TASK_ORDERS
+        """
+        query = self._filter(
+            db.query(Task),
+            project_id=project_id,
+            status=status,
+            priority=priority,
+            assigned_to=assigned_to
+        )
+        return paginate(query, TASK_ORDERS[order_by], cursor=cursor, limit=limit, skip=skip)
 
     def get_multi_for_user(
         self, 
@@ -67,36 +192,77 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         """
         Получить задачи для пользователя (созданные им, назначенные ему или из его проектов)
         """
-        # Сначала получаем проекты пользователя
-        user_projects = db.query(Project.id).filter(
-            Project.owner_id == user_id
-        ).limit(1000).all()
-        user_project_ids = [p.id for p in user_projects]
-        
-        # Формируем запрос
+        return self.get_page_for_user(
+            db,
+            user_id=user_id,
+            skip=skip,
+            limit=limit,
+            project_id=project_id,
+            status=status,
+            priority=priority,
+            assigned_to=assigned_to
+        ).items
+
+    def get_page_for_user(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        order_by: str = "id",
+        project_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[int] = None,
+        assigned_to: Optional[int] = None
+    ) -> Page:
+        """
+        Получить страницу задач пользователя по курсору (см. get_multi_for_user)
+        """
         query = db.query(Task).filter(
-            or_(
-                Task.project_id.in_(user_project_ids),
-                Task.assigned_to == user_id,
-                Task.created_by == user_id
-            )
+            Task.id.in_(self._visible_task_ids(user_id, project_id=project_id))
         )
-        
-        # Дополнительные фильтры
+        query = self._filter(query, status=status, priority=priority, assigned_to=assigned_to)
+        return paginate(query, TASK_ORDERS[order_by], cursor=cursor, limit=limit, skip=skip)
+
+    def _owned_project_ids(self, user_id: int) -> Select:
+        """
+        Подзапрос ID проектов, которыми владеет пользователь
+        """
+        return select(Project.id).where(Project.owner_id == user_id)
+
+    def _visible_task_ids(
+        self, user_id: int, *, project_id: Optional[int] = None
+    ) -> CompoundSelect:
+        """
+        Подзапрос ID задач, видимых пользователю: из его проектов, назначенных ему или созданных им
+
+        Каждая ветвь UNION ALL обслуживается своим индексом (projects.owner_id + tasks.project_id,
+        tasks.assigned_to, tasks.created_by), тогда как OR по трем столбцам сводится к полному
+        просмотру. Повторы ветвей не мешают: подзапрос используется в IN.
+        Фильтр по проекту добавляется в каждую ветвь
+        """
+        branches = [
+            select(Task.id).where(Task.project_id.in_(self._owned_project_ids(user_id))),
+            select(Task.id).where(Task.assigned_to == user_id),
+            select(Task.id).where(Task.created_by == user_id),
+        ]
         if project_id:
-            # Проверяем, принадлежит ли проект пользователю
-            if project_id in user_project_ids:
-                query = query.filter(Task.project_id == project_id)
-            else:
-                # Если проект не принадлежит пользователю, возвращаем только задачи,
-                # назначенные на пользователя или созданные им в этом проекте
-                query = query.filter(
-                    Task.project_id == project_id,
-                    or_(
-                        Task.assigned_to == user_id,
-                        Task.created_by == user_id
-                    )
-                )
+            branches = [branch.where(Task.project_id == project_id) for branch in branches]
+        return union_all(*branches)
+
+    def _filter(
+        self,
+        query: Query,
+        *,
+        project_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[int] = None,
+        assigned_to: Optional[int] = None
+    ) -> Query:
+        if project_id:
+            query = query.filter(Task.project_id == project_id)
         
         if status:
             query = query.filter(Task.status == status)
@@ -107,7 +273,7 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         if assigned_to:
             query = query.filter(Task.assigned_to == assigned_to)
         
-        return query.offset(skip).limit(limit).all()
+        return query
 
     def get_tasks_for_optimization(
         self,
@@ -115,10 +281,17 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         *,
         user_ids: List[int],
         project_id: Optional[int] = None,
-        current_user: Any = None
+        current_user: Any = None,
+        lock: bool = False
     ) -> List[Task]:
         """
         Получить задачи для оптимизации
+
+        Args:
+            lock: захватить задачи до конца транзакции (SELECT ... FOR UPDATE SKIP LOCKED).
+                Задачи, захваченные параллельным запуском, пропускаются, поэтому
+                независимые запуски не перезаписывают назначения друг друга.
+                SQLite не поддерживает блокировки строк, там задачи читаются без захвата
         """
         query = db.query(Task).filter(
             or_(
@@ -136,11 +309,10 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         elif not current_user.is_superuser:
             # Если пользователь не суперпользователь и проект не указан,
             # возвращаем только задачи из его проектов
-            user_projects = db.query(Project.id).filter(
-                Project.owner_id == user_id
-            ).limit(1000).all()
-            user_project_ids = [p.id for p in user_projects]
-            query = query.filter(Task.project_id.in_(user_project_ids))
+            query = query.filter(Task.project_id.in_(self._owned_project_ids(current_user.id)))
+        
+        if lock and db.get_bind().dialect.name != "sqlite":
+            query = query.with_for_update(skip_locked=True, of=Task)
         
         return query.all()
 
@@ -162,4 +334,210 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             .all()
         )
 
+    def get_loads_for_users(
+        self,
+        db: Session,
+        *,
+        user_ids: List[int]
+    ) -> Dict[int, int]:
+        """
+        Получить текущую нагрузку пользователей (сумма часов невыполненных задач)
+
+        Считается одним GROUP BY запросом без загрузки задач в Python.
+        Задачи без оценки (NULL или 0) считаются часовыми, как и в оптимизаторе
+        """
+        hours = func.coalesce(func.nullif(Task.estimated_hours, 0), 1)
+        rows = (
+            db.query(Task.assigned_to, func.sum(hours))
+            .filter(
+                Task.assigned_to.in_(user_ids),
+                Task.status != TaskStatus.DONE
+            )
+            .group_by(Task.assigned_to)
+            .all()
+        )
+        loads = {user_id: 0 for user_id in user_ids}
+        loads.update({user_id: int(load) for user_id, load in rows})
+        return loads
+
+    def bulk_assign(
+        self,
+        db: Session,
+        *,
+        tasks: List[Task],
+        assignments: Dict[int, int]
+    ) -> List[Task]:
+        """
+        Назначить задачи пользователям одной транзакцией
+
+        Args:
+            tasks: задачи, загруженные в текущей сессии
+            assignments: ID задачи -> ID пользователя
+
+        Все изменения записываются одним executemany UPDATE по первичному ключу
+        и одним commit: план применяется целиком или не применяется совсем.
+        Задачи обновляются в памяти и отсоединяются от сессии до commit,
+        поэтому после записи их не нужно перечитывать из БД
+        """
+        assigned = [task for task in tasks if task.id in assignments]
+        changed = [
+            task for task in assigned
+            if task.assigned_to != assignments[task.id]
+        ]
+        if not changed:
+            return assigned
+
+        now = datetime.now(timezone.utc)
+        try:
+            stats_changes = []
+            for task in changed:
+                facts = TaskFacts.of(task)
+                stats_changes += [(facts, -1), (facts._replace(assigned_to=assignments[task.id]), 1)]
+            task_stats.apply(db, stats_changes)
+            db.execute(
+                update(Task),
+                [
+                    {"id": task.id, "assigned_to": assignments[task.id], "updated_at": now}
+                    for task in changed
+                ],
+            )
+            for task in changed:
+                set_committed_value(task, "assigned_to", assignments[task.id])
+                set_committed_value(task, "updated_at", now)
+            for task in assigned:
+                db.expunge(task)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return assigned
+
+    def get_many_with_project_owner(
+        self,
+        db: Session,
+        *,
+        ids: Optional[List[int]] = None,
+        member_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        **filters: Any
+    ) -> List[Row]:
+        """
+        Получить поля задач, от которых зависят агрегаты, и ID владельцев их проектов одним запросом
+
+        Args:
+            ids: только задачи из списка
+            member_id: только задачи, доступные пользователю (из его проектов или назначенные ему)
+            filters: фильтры get_page_filtered (project_id, status, priority, assigned_to)
+
+        Объекты Task не загружаются. Строки блокируются до конца транзакции
+        (SELECT ... FOR UPDATE на PostgreSQL), чтобы агрегаты не разошлись с задачами
+        """
+        query = (
+            db.query(
+                Task.id,
+                Task.project_id,
+                Task.assigned_to,
+                Task.status,
+                Task.priority,
+                Task.estimated_hours,
+                Project.owner_id,
+            )
+            .join(Project, Project.id == Task.project_id)
+        )
+        if ids is not None:
+            query = query.filter(Task.id.in_(ids))
+        if member_id is not None:
+            query = query.filter(or_(Project.owner_id == member_id, Task.assigned_to == member_id))
+        query = self._filter(query, **filters).order_by(Task.id).with_for_update(of=Task)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def bulk_update(
+        self,
+        db: Session,
+        *,
+        tasks: List[Row],
+        changes: List[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Изменить задачи одной транзакцией и вернуть их ID
+
+        Args:
+            tasks: строки get_many_with_project_owner
+            changes: изменения (поля модели Task) для каждой строки tasks
+
+        Задачи с одинаковыми изменениями обновляются одним UPDATE ... WHERE id IN (...)
+        (пачками по BULK_BATCH_SIZE), агрегаты задач и оценки в кэшированных графах
+        зависимостей обновляются так же, как в update
+        """
+        groups: Dict[Tuple[Tuple[str, Any], ...], List[int]] = defaultdict(list)
+        stats_changes = []
+        hours: Dict[int, Dict[int, float]] = defaultdict(dict)
+        for row, task_changes in zip(tasks, changes):
+            if not task_changes:
+                continue
+            groups[tuple(sorted(task_changes.items()))].append(row.id)
+            facts = TaskFacts.of(row)
+            stats_changes += [(facts, -1), (facts.updated(task_changes), 1)]
+            if task_changes.get("estimated_hours", row.estimated_hours) != row.estimated_hours:
+                project_id = task_changes.get("project_id", row.project_id)
+                hours[project_id][row.id] = task_changes["estimated_hours"]
+
+        try:
+            task_stats.apply(db, stats_changes)
+            for values, ids in groups.items():
+                for start in range(0, len(ids), BULK_BATCH_SIZE):
+                    db.execute(
+                        update(Task)
+                        .where(Task.id.in_(ids[start:start + BULK_BATCH_SIZE]))
+                        .values(dict(values))
+                        .execution_options(synchronize_session=False)
+                    )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for project_id, project_hours in hours.items():
+            task_dependency.hours_changed(project_id=project_id, hours=project_hours)
+        return [row.id for row in tasks]
+
 task = CRUDTask(Task)
+
+class AsyncCRUDTask(AsyncCRUDBase[Task, TaskCreate, TaskUpdate]):
+    crud: CRUDTask
+
+    async def create_with_creator(
+        self, db: AsyncSession, *, obj_in: TaskCreate, creator_id: int
+    ) -> Task:
+        """
+        Создать задачу с указанием создателя
+        """
+        return await db.run_sync(self.crud.create_with_creator, obj_in=obj_in, creator_id=creator_id)
+
+    async def get_with_project_owner(
+        self, db: AsyncSession, *, id: int
+    ) -> Optional[Tuple[Task, int]]:
+        """
+        Получить задачу и ID владельца ее проекта одним запросом
+        """
+        result = await db.execute(
+            select(Task, Project.owner_id)
+            .join(Project, Project.id == Task.project_id)
+            .where(Task.id == id)
+        )
+        return result.first()
+
+    async def get_page_filtered(self, db: AsyncSession, **kwargs: Any) -> Page:
+        """
+        Получить страницу задач с фильтрацией (см. CRUDTask.get_page_filtered)
+        """
+        return await db.run_sync(self.crud.get_page_filtered, **kwargs)
+
+    async def get_page_for_user(self, db: AsyncSession, *, user_id: int, **kwargs: Any) -> Page:
+        """
+        Получить страницу задач пользователя (см. CRUDTask.get_page_for_user)
+        """
+        return await db.run_sync(self.crud.get_page_for_user, user_id=user_id, **kwargs)
+
+async_task = AsyncCRUDTask(task)
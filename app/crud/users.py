@@ -1,13 +1,56 @@
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, NamedTuple, Optional, Union, List, Set
 
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
-from app.crud.base import CRUDBase
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_and_update_password_async,
+)
+from app.crud.base import AsyncCRUDBase, CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+class AuthUser(NamedTuple):
+    """
+    Поля пользователя, нужные для проверки прав
+    """
+    id: int
+    is_active: bool
+    is_superuser: bool
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    def __init__(self, model: type):
+        super().__init__(model)
+        # Кэш AuthUser по ID. Сбрасывается при изменении пользователя через этот процесс,
+        # TTL ограничивает устаревание из-за изменений в других процессах
+        self.auth_cache: "TTLCache[int, AuthUser]" = TTLCache(
+            max_size=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+        )
+
+    def get_auth(self, db: Session, *, id: int) -> Optional[AuthUser]:
+        """
+        Получить поля пользователя для проверки прав (из кэша или одним запросом)
+        """
+        auth_user = self.auth_cache.get(id)
+        if auth_user is not None:
+            return auth_user
+        row = (
+            db.query(User.id, User.is_active, User.is_superuser)
+            .filter(User.id == id)
+            .first()
+        )
+        if row is None:
+            return None
+        auth_user = AuthUser(row.id, bool(row.is_active), bool(row.is_superuser))
+        self.auth_cache.set(id, auth_user)
+        return auth_user
+
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         """
         Получить пользователя по email
@@ -20,14 +63,28 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         """
         return db.query(User).filter(User.username == username).first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    def get_existing_ids(self, db: Session, *, ids: List[int]) -> Set[int]:
+        """
+        Получить ID существующих пользователей из списка одним запросом
+        """
+        if not ids:
+            return set()
+        return {
+            user_id for (user_id,) in db.query(User.id).filter(User.id.in_(ids)).all()
+        }
+
+    def create(
+        self, db: Session, *, obj_in: UserCreate, hashed_password: Optional[str] = None
+    ) -> User:
         """
         Создать нового пользователя с хешированием пароля
+
+        Уже посчитанный хеш (например, get_password_hash_async) передается в hashed_password
         """
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashed_password or get_password_hash(obj_in.password),
             is_active=obj_in.is_active,
             is_superuser=obj_in.is_superuser,
         )
@@ -45,24 +102,95 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         
         if "password" in update_data and update_data["password"]:
             hashed_password = get_password_hash(update_data["password"])
             update_data["hashed_password"] = hashed_password
             del update_data["password"]
         
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        self.auth_cache.invalidate(user.id)
+        return user
+
+    def remove(self, db: Session, *, id: int) -> User:
+        """
+        Удалить пользователя
+        """
+        user = super().remove(db, id=id)
+        self.auth_cache.invalidate(id)
+        return user
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         """
         Аутентификация пользователя по email и паролю
+
+        Хеш, созданный с устаревшей стоимостью bcrypt, заменяется новым
         """
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not verified:
+            return None
+        if new_hash:
+            self._store_hash(db, user=user, hashed_password=new_hash)
+        return user
+
+    async def authenticate_async(
+        self, db: Session, *, email: str, password: str
+    ) -> Optional[User]:
+        """
+        Аутентификация для асинхронных маршрутов
+
+        Запросы к БД выполняются в пуле потоков обработчиков, а проверка пароля
+        ожидается на отдельном пуле bcrypt без блокировки потока обработчика
+        """
+        user = await run_in_threadpool(self.get_by_email, db, email=email)
+        if not user:
+            return None
+        verified, new_hash = await verify_and_update_password_async(
+            password, user.hashed_password
+        )
+        if not verified:
             return None
+        if new_hash:
+            await run_in_threadpool(self._store_hash, db, user=user, hashed_password=new_hash)
         return user
 
+    def _store_hash(self, db: Session, *, user: User, hashed_password: str) -> None:
+        user.hashed_password = hashed_password
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
 user = CRUDUser(User)
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    crud: CRUDUser
+
+    async def get_auth(self, db: AsyncSession, *, id: int) -> Optional[AuthUser]:
+        """
+        Получить поля пользователя для проверки прав (из общего с CRUDUser кэша или одним запросом)
+        """
+        auth_user = self.crud.auth_cache.get(id)
+        if auth_user is not None:
+            return auth_user
+        row = (
+            await db.execute(
+                select(User.id, User.is_active, User.is_superuser).where(User.id == id)
+            )
+        ).first()
+        if row is None:
+            return None
+        auth_user = AuthUser(row.id, bool(row.is_active), bool(row.is_superuser))
+        self.crud.auth_cache.set(id, auth_user)
+        return auth_user
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        """
+        Получить пользователя по email
+        """
+        return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+async_user = AsyncCRUDUser(user)
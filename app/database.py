@@ -1,14 +1,209 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.pool import TimedAsyncQueuePool, TimedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Асинхронные драйверы для СУБД синхронного URL
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url(url: str) -> str:
+    """
+    URL асинхронного движка для той же БД, что и синхронный url
+    """
+    sync_url = make_url(url)
+    return sync_url.set(
+        drivername=ASYNC_DRIVERS[sync_url.get_backend_name()]
+    ).render_as_string(hide_password=False)
+
+def engine_options(url: str, *, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Параметры create_engine/create_async_engine для url из настроек DB_*
+
+    Для PostgreSQL задаются пул с замером ожидания соединения (app.core.pool)
+    и statement_timeout, для SQLite остаются параметры по умолчанию
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    options: Dict[str, Any] = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        options["connect_args"] = (
+            {"server_settings": {"statement_timeout": timeout}}
+            if is_async
+            else {"options": f"-c statement_timeout={timeout}"}
+        )
+    return options
 
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+SQLALCHEMY_DATABASE_URL = str(settings.DATABASE_URL)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок создается только при ASYNC_DATABASE, чтобы синхронному
+# развертыванию не требовался асинхронный драйвер. expire_on_commit=False:
+# после commit атрибуты не перечитываются неявно (ленивая загрузка в async недоступна)
+async_engine = (
+    create_async_engine(
+        async_database_url(SQLALCHEMY_DATABASE_URL),
+        **engine_options(SQLALCHEMY_DATABASE_URL, is_async=True),
+    )
+    if settings.ASYNC_DATABASE
+    else None
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+class ReplicaRouter:
+    """
+    Сессии чтения с реплик по кругу
+
+    Соединение открывается сразу при выдаче сессии: если реплика недоступна,
+    берется следующая, а отказавшая пропускается retry_seconds секунд.
+    На основную БД чтение переходит только при ошибке соединения: если запрос
+    на уже выданной сессии реплики завершился ошибкой (mark_down), этот HTTP
+    запрос завершается ошибкой, а реплика пропускается следующими запросами
+    """
+
+    def __init__(self, engines: List[Engine], *, retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._sessionmakers = [
+            sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in engines
+        ]
+        self._next = itertools.count()
+        # Индекс реплики -> время (monotonic), до которого она пропускается
+        self._down_until: Dict[int, float] = {}
+
+    def session(self) -> Optional[Session]:
+        """
+        Сессия с открытым соединением к доступной реплике (None - доступных реплик нет)
+        """
+        for index in self._available():
+            db = self._sessionmakers[index]()
+            db.info["replica_index"] = index
+            try:
+                db.connection()
+            except SQLAlchemyError:
+                db.close()
+                self.mark_down(db)
+                continue
+            return db
+        return None
+
+    def _available(self) -> Iterator[int]:
+        """
+        Индексы реплик, которые не пропускаются, начиная со следующей по кругу
+        """
+        if not self.engines:
+            return
+        start = next(self._next)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._down_until.get(index, 0) <= time.monotonic():
+                yield index
+
+    def mark_down(self, db: Union[Session, AsyncSession]) -> None:
+        """
+        Пропускать реплику сессии db retry_seconds секунд
+        """
+        index = db.info.get("replica_index")
+        if index is None:
+            return
+        logger.warning("Read replica %s is unavailable", index, exc_info=True)
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+class AsyncReplicaRouter(ReplicaRouter):
+    """
+    Асинхронный вариант ReplicaRouter: сессии AsyncSession на асинхронных движках реплик
+    """
+
+    def __init__(self, engines: List[AsyncEngine], *, retry_seconds: float):
+        super().__init__([], retry_seconds=retry_seconds)
+        self.engines = engines
+        self._sessionmakers = [
+            async_sessionmaker(replica, autoflush=False, expire_on_commit=False)
+            for replica in engines
+        ]
+
+    async def session(self) -> Optional[AsyncSession]:
+        """
+        Сессия с открытым соединением к доступной реплике (None - доступных реплик нет)
+        """
+        for index in self._available():
+            db = self._sessionmakers[index]()
+            db.info["replica_index"] = index
+            try:
+                await db.connection()
+            except SQLAlchemyError:
+                await db.close()
+                self.mark_down(db)
+                continue
+            return db
+        return None
+
+read_replicas = ReplicaRouter(
+    [create_engine(url, **engine_options(url)) for url in settings.DATABASE_REPLICA_URLS],
+    retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS,
+)
+
+# Асинхронные движки реплик, как и основной, создаются только при ASYNC_DATABASE
+async_read_replicas = AsyncReplicaRouter(
+    [
+        create_async_engine(async_database_url(url), **engine_options(url, is_async=True))
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+    if settings.ASYNC_DATABASE
+    else [],
+    retry_seconds=settings.DATABASE_REPLICA_RETRY_SECONDS,
+)
+
+@contextmanager
+def advisory_lock(bind: Engine, key: int) -> Iterator[bool]:
+    """
+    Неблокирующая advisory блокировка PostgreSQL на время блока with: True, если получена
+
+    Блокировка держится на отдельном соединении, поэтому транзакции внутри блока
+    ее не снимают. Для остальных СУБД (одна копия приложения) всегда True
+    """
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+    with bind.connect() as connection:
+        acquired = connection.execute(select(func.pg_try_advisory_lock(key))).scalar()
+        connection.commit()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                connection.execute(select(func.pg_advisory_unlock(key)))
+                connection.commit()
+
 Base = declarative_base()
 
 # Функция зависимости для получения сессии БД
@@ -18,3 +213,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Функция зависимости для получения асинхронной сессии БД
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
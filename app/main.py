@@ -1,8 +1,27 @@
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
-from app.api import auth, users, projects, tasks, optimizer
+from app import crud
+from app.api import async_routes, auth, users, projects, tasks, optimizer
 from app.core.config import settings
+from app.core.dependencies import recent_writers, request_user_id
+from app.core.periodic import PeriodicTask
+from app.core.pool import pool_status
+from app.core.security import PasswordHashingBusy, password_hasher, token_cache
+from app.crud.pagination import InvalidCursor
+from app.database import SessionLocal, advisory_lock, async_engine, engine
+from app.optimizer.jobs import job_manager
+from app.optimizer.scenarios import scenario_pool
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory блокировки сверки агрегатов задач (общий для всех процессов API)
+TASK_STATS_RECONCILE_LOCK = 7_400_016
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -14,19 +33,93 @@ app = FastAPI(
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    # AnyHttpUrl добавляет к адресу без пути "/", а Origin приходит без него
+    allow_origins=[str(origin).rstrip("/") for origin in settings.BACKEND_CORS_ORIGINS],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Включение API маршрутов
+if settings.ASYNC_DATABASE:
+    # Асинхронные маршруты чтения подключаются первыми и перекрывают синхронные;
+    # читают, как и они, с реплик с учетом READ_YOUR_WRITES_SECONDS (get_async_read_db)
+    app.include_router(async_routes.users_router, prefix=settings.API_V1_STR)
+    app.include_router(async_routes.projects_router, prefix=settings.API_V1_STR)
+    app.include_router(async_routes.tasks_router, prefix=settings.API_V1_STR)
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(users.router, prefix=settings.API_V1_STR)
 app.include_router(projects.router, prefix=settings.API_V1_STR)
 app.include_router(tasks.router, prefix=settings.API_V1_STR)
 app.include_router(optimizer.router, prefix=settings.API_V1_STR)
 
+if settings.DATABASE_REPLICA_URLS and settings.READ_YOUR_WRITES_SECONDS:
+    @app.middleware("http")
+    async def track_writers(request: Request, call_next):
+        """
+        Запомнить пользователя после успешной записи, чтобы его чтения шли в основную БД
+        """
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            user_id = request_user_id(request)
+            if user_id is not None:
+                recent_writers.set(user_id, True)
+        return response
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": "Некорректный курсор"},
+    )
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Слишком много входов и регистраций, повторите позже"},
+        headers={"Retry-After": "1"},
+    )
+
+def reconcile_task_stats():
+    """
+    Сверить агрегаты задач с таблицей задач
+
+    Сверка запускается в каждом процессе API, но выполняет ее только процесс,
+    получивший advisory блокировку, остальные пропускают этот период
+    """
+    with advisory_lock(engine, TASK_STATS_RECONCILE_LOCK) as acquired:
+        if not acquired:
+            return
+        db = SessionLocal()
+        try:
+            drift = crud.task_stats.reconcile(db)
+        finally:
+            db.close()
+    if drift:
+        logger.warning("Task stats reconciliation fixed %s rows", drift)
+
+stats_reconciler = PeriodicTask(
+    "task-stats-reconcile", settings.TASK_STATS_RECONCILE_SECONDS, reconcile_task_stats
+)
+
+@app.on_event("startup")
+def start_background_tasks():
+    stats_reconciler.start()
+
+@app.on_event("shutdown")
+def shutdown_optimizer_jobs():
+    job_manager.shutdown()
+    scenario_pool.shutdown()
+    stats_reconciler.stop()
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Task Management API"}
@@ -34,3 +127,25 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/health/ready")
+def ready():
+    """
+    Готовность к приему запросов: БД отвечает; состояние пулов соединений
+    и счетчики кэшей пользователей и токенов этого процесса
+    """
+    # Состояние снимается до проверки, чтобы не учитывать ее соединение
+    pools = {"sync": pool_status(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine.pool)
+    caches = {"auth": crud.user.auth_cache.stats(), "token": token_cache.stats()}
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        logger.exception("Database readiness check failed")
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "pools": pools, "caches": caches},
+        )
+    return {"status": "ready", "pools": pools, "caches": caches}
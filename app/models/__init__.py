@@ -1,4 +1,5 @@
 # Импортируем модели для Alembic
 from app.models.user import User
 from app.models.project import Project
-from app.models.task import Task
+from app.models.task import Task, task_dependencies
+from app.models.task_stats import TaskStat
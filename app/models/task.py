@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Text, Enum
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Text, Enum, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -15,6 +15,17 @@ class TaskPriority(int, enum.Enum):
     MEDIUM = 2
     HIGH = 3
 
+# Зависимости между задачами: task_id не может начаться раньше blocked_by_id
+task_dependencies = Table(
+    "task_dependencies",
+    Base.metadata,
+    Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column(
+        "blocked_by_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True, index=True
+    ),
+)
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -26,7 +37,7 @@ class Task(Base):
     estimated_hours = Column(Integer, default=0)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     deadline = Column(DateTime(timezone=True), nullable=True)
@@ -35,3 +46,23 @@ class Task(Base):
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", foreign_keys=[assigned_to], backref="assigned_tasks")
     creator = relationship("User", foreign_keys=[created_by], backref="created_tasks")
+
+    __table_args__ = (
+        # Фильтры списка задач; префикс project_id обслуживает и связь Project.tasks
+        Index("ix_tasks_project_id_status_priority", project_id, status, priority),
+        # Задачи пользователя (назначенные ему) с фильтром по статусу
+        Index("ix_tasks_assigned_to_status", assigned_to, status),
+        # Частичные индексы по невыполненным задачам (оптимизатор и нагрузка пользователей).
+        # estimated_hours в индексе позволяет считать нагрузку без чтения таблицы
+        Index(
+            "ix_tasks_open_assigned_to", assigned_to, estimated_hours,
+            postgresql_where=status != TaskStatus.DONE,
+            sqlite_where=status != TaskStatus.DONE,
+        ),
+        # deadline позволяет считать просроченные задачи проекта диапазоном по индексу
+        Index(
+            "ix_tasks_open_project_id_deadline", project_id, deadline,
+            postgresql_where=status != TaskStatus.DONE,
+            sqlite_where=status != TaskStatus.DONE,
+        ),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Enum, Integer, String
+
+from app.database import Base
+from app.models.task import TaskStatus
+
+class TaskStat(Base):
+    """
+    Агрегат задач: число задач и сумма оценок по статусу и приоритету
+    в разрезе проекта (scope="project") или исполнителя (scope="user")
+
+    Поддерживается инкрементально при записи задач через CRUDTask
+    и периодически сверяется с таблицей задач
+    """
+    __tablename__ = "task_stats"
+
+    scope = Column(String(16), primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    priority = Column(Integer, primary_key=True)
+    task_count = Column(Integer, default=0, nullable=False)
+    hours = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,16 @@
+from app.optimizer.engine import (
+    DEFAULT_STRATEGY,
+    STRATEGIES,
+    BalanceMetrics,
+    OptimizationParams,
+    OptimizationResult,
+    OptimizationStrategy,
+    TaskSnapshot,
+    balance_metrics,
+    dependency_order,
+    get_strategy,
+    register_strategy,
+    select_incremental,
+)
+from app.optimizer.capacity import CapacityAwareStrategy, WorkloadTimeline
+from app.optimizer.graph import CycleError, DependencyGraph
@@ -0,0 +1,183 @@
+import copy
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.optimizer.engine import (
+    Dependencies,
+    OptimizationResult,
+    OptimizationStrategy,
+    TaskSnapshot,
+    deadline_key,
+    register_strategy,
+)
+
+
+class WorkloadTimeline:
+    """
+    Дневная нагрузка пользователей на горизонте планирования
+
+    Часы раскладываются по дням с начала горизонта: каждый пользователь сначала
+    заполняет самые ранние свободные дни. Поэтому для проверки, успевает ли
+    пользователь к дню d, достаточно сравнить накопленную емкость к этому дню
+    с уже занятыми часами, и проверка выполняется сразу для всех пользователей
+    одной векторной операцией. Часы, не уложившиеся в емкость, считаются
+    переработкой и приходятся на день дедлайна
+
+    Args:
+        capacities: емкость пользователей, часов в день (вектор длины U)
+        horizon_days: длина горизонта в днях
+        initial_loads: уже назначенные часы (вектор длины U), занимают начало горизонта
+    """
+
+    def __init__(
+        self,
+        capacities: np.ndarray,
+        horizon_days: int,
+        initial_loads: Optional[np.ndarray] = None,
+    ):
+        users = len(capacities)
+        self.horizon_days = horizon_days
+        # Емкость по дням (U x D) и накопленная емкость, транспонированная
+        # для непрерывного доступа к столбцу дня (D x U)
+        self.capacity = np.repeat(
+            np.asarray(capacities, dtype=float)[:, None], horizon_days, axis=1
+        )
+        self._cumulative_by_day = np.ascontiguousarray(
+            np.cumsum(self.capacity, axis=1).T
+        )
+        # Часы в пределах емкости (заполняют дни с начала горизонта)
+        self.filled = (
+            np.zeros(users) if initial_loads is None
+            else np.asarray(initial_loads, dtype=float).copy()
+        )
+        # Переработка: по дням дедлайна и итого
+        self.overflow = np.zeros((users, horizon_days))
+        self.overflow_total = np.zeros(users)
+
+    def place(self, hours: float, day: int) -> int:
+        """
+        Назначить задачу, которую нужно закончить к дню day
+
+        Выбирается пользователь с наименьшей переработкой, при равенстве -
+        с наименьшей общей нагрузкой. Возвращает индекс пользователя
+        """
+        free = np.maximum(self._cumulative_by_day[day] - self.filled, 0.0)
+        overflow = np.maximum(hours - free, 0.0)
+        total = self.filled + self.overflow_total
+        best = np.where(overflow <= overflow.min(), total, np.inf)
+        index = int(np.argmin(best))
+
+        over = overflow[index]
+        self.filled[index] += hours - over
+        if over:
+            self.overflow[index, day] += over
+            self.overflow_total[index] += over
+        return index
+
+    def daily_load(self) -> np.ndarray:
+        """
+        Гистограмма нагрузки по дням (U x D), включая переработку
+        """
+        cumulative = np.minimum(self._cumulative_by_day.T, self.filled[:, None])
+        return np.diff(cumulative, axis=1, prepend=0.0) + self.overflow
+
+
+def _to_date(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+@register_strategy
+class CapacityAwareStrategy(OptimizationStrategy):
+    name = "capacity_aware"
+    description = (
+        "С учетом дневной емкости: задача достается тому, кто успевает к дедлайну "
+        "с наименьшей переработкой"
+    )
+
+    def __init__(
+        self,
+        *,
+        capacities: Optional[Dict[int, float]] = None,
+        default_capacity: float = 8,
+        horizon_days: int = 90,
+        start: Optional[date] = None,
+        **options: Any
+    ):
+        """
+        Args:
+            capacities: емкость пользователей, часов в день (ID пользователя -> часы)
+            default_capacity: емкость пользователей, не указанных в capacities
+            horizon_days: горизонт планирования в днях; задачи без дедлайна
+                и с дедлайном за горизонтом должны уложиться в горизонт
+            start: первый день горизонта (по умолчанию сегодня по UTC)
+        """
+        super().__init__(**options)
+        self.capacities = capacities or {}
+        self.default_capacity = default_capacity
+        self.horizon_days = max(horizon_days, 1)
+        self.start = start or datetime.now(timezone.utc).date()
+
+    def cache_key(self) -> Tuple:
+        return (
+            self.name,
+            tuple(sorted(self.capacities.items())),
+            self.default_capacity,
+            self.horizon_days,
+            self.start,
+        )
+
+    def with_capacities(self, capacities: Dict[int, float]) -> "CapacityAwareStrategy":
+        strategy = copy.copy(self)
+        strategy.capacities = {**self.capacities, **capacities}
+        return strategy
+
+    def sort_key(self, task: TaskSnapshot) -> Tuple:
+        # Порядок EDF: при заполнении дней с начала горизонта он дает
+        # допустимое расписание, если оно вообще существует
+        return (deadline_key(task), -task.priority, -task.hours)
+
+    def day_index(self, task: TaskSnapshot) -> int:
+        """
+        Индекс дня дедлайна задачи на горизонте
+        """
+        if task.deadline is None:
+            return self.horizon_days - 1
+        days = (_to_date(task.deadline) - self.start).days
+        return min(max(days, 0), self.horizon_days - 1)
+
+    def build_timeline(self, user_ids: List[int], user_loads: Dict[int, float]) -> WorkloadTimeline:
+        return WorkloadTimeline(
+            np.array(
+                [self.capacities.get(user_id, self.default_capacity) for user_id in user_ids],
+                dtype=float,
+            ),
+            self.horizon_days,
+            np.array([user_loads[user_id] for user_id in user_ids], dtype=float),
+        )
+
+    def assign(
+        self,
+        tasks: Sequence[TaskSnapshot],
+        user_loads: Dict[int, float],
+        dependencies: Optional[Dependencies] = None,
+    ) -> OptimizationResult:
+        user_ids = list(user_loads)
+        distribution: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return OptimizationResult(distribution, {}, {})
+
+        timeline = self.build_timeline(user_ids, user_loads)
+        for task in self.order(tasks, dependencies):
+            index = timeline.place(task.hours, self.day_index(task))
+            distribution[user_ids[index]].append(task.id)
+
+        totals = timeline.filled + timeline.overflow_total
+        return OptimizationResult(
+            distribution,
+            {user_id: float(totals[i]) for i, user_id in enumerate(user_ids)},
+            {user_id: float(timeline.overflow_total[i]) for i, user_id in enumerate(user_ids)},
+        )
@@ -0,0 +1,343 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+
+class TaskSnapshot(NamedTuple):
+    """
+    Облегченное представление задачи для алгоритма оптимизации
+
+    Не зависит от ORM и сессии БД, поэтому алгоритм можно запускать
+    и измерять отдельно от HTTP и базы данных
+    """
+    id: int
+    priority: int
+    estimated_hours: Optional[int]
+    deadline: Optional[datetime]
+    assigned_to: Optional[int] = None
+    project_id: Optional[int] = None
+
+    @property
+    def hours(self) -> int:
+        """
+        Нагрузка задачи (задачи без оценки считаются часовыми)
+        """
+        return self.estimated_hours or 1
+
+    @classmethod
+    def from_object(cls, obj: Any) -> "TaskSnapshot":
+        """
+        Создать снимок из любого объекта с атрибутами задачи (например, ORM модели)
+        """
+        return cls(
+            id=obj.id,
+            priority=int(obj.priority),
+            estimated_hours=obj.estimated_hours,
+            deadline=obj.deadline,
+            assigned_to=obj.assigned_to,
+            project_id=obj.project_id,
+        )
+
+
+class OptimizationResult(NamedTuple):
+    """
+    Результат работы стратегии
+    """
+    # ID пользователя -> ID назначенных задач в порядке назначения
+    distribution: Dict[int, List[int]]
+    # ID пользователя -> итоговая нагрузка в часах
+    loads: Dict[int, float]
+    # ID пользователя -> часы, не укладывающиеся в дедлайны (для стратегий с учетом емкости)
+    overflow: Optional[Dict[int, float]] = None
+
+
+class BalanceMetrics(NamedTuple):
+    """
+    Показатели баланса нагрузки (в часах)
+    """
+    makespan: float
+    min_load: float
+    mean_load: float
+    spread: float
+    overflow_hours: float = 0
+
+
+def balance_metrics(
+    loads: Dict[int, float], overflow: Optional[Dict[int, float]] = None
+) -> BalanceMetrics:
+    """
+    Посчитать показатели баланса по нагрузкам пользователей
+    """
+    if not loads:
+        return BalanceMetrics(0, 0, 0, 0)
+    values = list(loads.values())
+    makespan = max(values)
+    min_load = min(values)
+    return BalanceMetrics(
+        makespan=makespan,
+        min_load=min_load,
+        mean_load=round(sum(values) / len(values), 2),
+        spread=makespan - min_load,
+        overflow_hours=sum(overflow.values()) if overflow else 0,
+    )
+
+
+def deadline_key(task: TaskSnapshot) -> Tuple[bool, float]:
+    """
+    Ключ сортировки по дедлайну: задачи без дедлайна в конце
+    """
+    if task.deadline is None:
+        return (True, 0.0)
+    return (False, task.deadline.timestamp())
+
+
+# ID задачи -> ID блокирующих ее задач
+Dependencies = Dict[int, List[int]]
+
+
+def dependency_order(
+    tasks: Sequence[TaskSnapshot], dependencies: Dependencies
+) -> List[TaskSnapshot]:
+    """
+    Переупорядочить задачи так, чтобы блокирующие шли раньше зависимых
+
+    Из готовых задач (все блокирующие уже выбраны) каждый раз берется задача,
+    стоящая раньше в исходном порядке, поэтому порядок стратегии меняется
+    только там, где этого требуют зависимости. Зависимости от задач вне набора
+    не учитываются, задачи из цикла добавляются в конец в исходном порядке
+    """
+    index = {task.id: position for position, task in enumerate(tasks)}
+    pending = [0] * len(tasks)
+    dependents: Dict[int, List[int]] = defaultdict(list)
+    for task_id, blocker_ids in dependencies.items():
+        if task_id not in index:
+            continue
+        for blocker_id in blocker_ids:
+            if blocker_id in index and blocker_id != task_id:
+                pending[index[task_id]] += 1
+                dependents[index[blocker_id]].append(index[task_id])
+
+    # Позиции по возрастанию уже образуют кучу
+    ready = [position for position, count in enumerate(pending) if count == 0]
+    ordered = []
+    while ready:
+        position = heapq.heappop(ready)
+        ordered.append(tasks[position])
+        for dependent in dependents[position]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    if len(ordered) < len(tasks):
+        ordered.extend(tasks[position] for position, count in enumerate(pending) if count > 0)
+    return ordered
+
+
+class OptimizationStrategy:
+    """
+    Базовая стратегия распределения задач
+
+    Стратегия задает порядок обработки задач, а назначение выполняется жадно:
+    очередная задача достается наименее загруженному пользователю. Нагрузки
+    хранятся в куче, поэтому выбор пользователя стоит O(log U), а не O(U)
+    """
+    name: str = ""
+    description: str = ""
+
+    def __init__(self, **options: Any):
+        """
+        Стратегии принимают общий набор параметров и используют только нужные им
+        """
+
+    def cache_key(self) -> Tuple:
+        """
+        Ключ стратегии и ее параметров для токена снимка
+        """
+        return (self.name,)
+
+    def with_capacities(self, capacities: Dict[int, float]) -> "OptimizationStrategy":
+        """
+        Стратегия с переопределенной емкостью пользователей
+
+        Стратегии, не учитывающие емкость, возвращают себя
+        """
+        return self
+
+    def sort_key(self, task: TaskSnapshot) -> Tuple:
+        raise NotImplementedError
+
+    def order(
+        self,
+        tasks: Sequence[TaskSnapshot],
+        dependencies: Optional[Dependencies] = None,
+    ) -> List[TaskSnapshot]:
+        """
+        Порядок, в котором задачи будут распределяться
+
+        Args:
+            dependencies: ID задачи -> ID блокирующих задач; если заданы,
+                блокирующие задачи идут раньше зависимых
+        """
+        ordered = sorted(tasks, key=self.sort_key)
+        if dependencies:
+            ordered = dependency_order(ordered, dependencies)
+        return ordered
+
+    def assign(
+        self,
+        tasks: Sequence[TaskSnapshot],
+        user_loads: Dict[int, float],
+        dependencies: Optional[Dependencies] = None,
+    ) -> OptimizationResult:
+        """
+        Распределить задачи между пользователями
+
+        Args:
+            tasks: задачи для распределения
+            user_loads: текущая нагрузка пользователей в часах
+            dependencies: зависимости между задачами (см. order)
+
+        При равной нагрузке задача достается пользователю, указанному раньше
+        """
+        distribution: Dict[int, List[int]] = {user_id: [] for user_id in user_loads}
+        loads = dict(user_loads)
+        if not loads:
+            return OptimizationResult(distribution, loads)
+
+        heap = [
+            (load, index, user_id)
+            for index, (user_id, load) in enumerate(loads.items())
+        ]
+        heapq.heapify(heap)
+
+        for task in self.order(tasks, dependencies):
+            load, index, user_id = heap[0]
+            distribution[user_id].append(task.id)
+            heapq.heapreplace(heap, (load + task.hours, index, user_id))
+
+        for load, _, user_id in heap:
+            loads[user_id] = load
+        return OptimizationResult(distribution, loads)
+
+
+STRATEGIES: Dict[str, Type[OptimizationStrategy]] = {}
+
+
+def register_strategy(cls: Type[OptimizationStrategy]) -> Type[OptimizationStrategy]:
+    """
+    Зарегистрировать стратегию под ее именем
+    """
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+def get_strategy(name: str, **options: Any) -> OptimizationStrategy:
+    """
+    Получить экземпляр стратегии по имени
+
+    Args:
+        options: параметры стратегий (например, capacities для capacity_aware)
+    """
+    try:
+        strategy_cls = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестная стратегия оптимизации: {name}. "
+            f"Доступные стратегии: {', '.join(sorted(STRATEGIES))}"
+        )
+    return strategy_cls(**options)
+
+
+@register_strategy
+class PriorityWeightedStrategy(OptimizationStrategy):
+    name = "priority_weighted"
+    description = "Сначала высокий приоритет, затем ближайший дедлайн и короткие задачи"
+
+    def sort_key(self, task: TaskSnapshot) -> Tuple:
+        return (-task.priority, deadline_key(task), task.estimated_hours or 0)
+
+
+@register_strategy
+class GreedyLPTStrategy(OptimizationStrategy):
+    name = "greedy_lpt"
+    description = "Longest Processing Time: сначала самые длинные задачи, лучший баланс нагрузки"
+
+    def sort_key(self, task: TaskSnapshot) -> Tuple:
+        return (-task.hours, -task.priority, deadline_key(task))
+
+
+@register_strategy
+class DeadlineFirstStrategy(OptimizationStrategy):
+    name = "deadline_first"
+    description = "Earliest Deadline First: сначала задачи с ближайшим дедлайном"
+
+    def sort_key(self, task: TaskSnapshot) -> Tuple:
+        return (deadline_key(task), -task.priority, -task.hours)
+
+
+DEFAULT_STRATEGY = PriorityWeightedStrategy.name
+
+
+class OptimizationParams(NamedTuple):
+    """
+    Параметры запуска оптимизации
+    """
+    user_ids: List[int]
+    project_id: Optional[int]
+    strategy: OptimizationStrategy
+    # Порог перегрузки в часах для инкрементального режима (None - полная перебалансировка)
+    overload_threshold: Optional[float] = None
+    # Учитывать зависимости между задачами при выборе порядка распределения
+    respect_dependencies: bool = False
+
+    @property
+    def incremental(self) -> bool:
+        return self.overload_threshold is not None
+
+    def cache_key(self) -> Tuple:
+        """
+        Ключ параметров для токена снимка
+        """
+        return (
+            self.strategy.cache_key(),
+            self.project_id,
+            tuple(self.user_ids),
+            self.overload_threshold,
+            self.respect_dependencies,
+        )
+
+
+def select_incremental(
+    tasks: Sequence[TaskSnapshot],
+    user_loads: Dict[int, float],
+    *,
+    overload_threshold: float,
+    strategy: OptimizationStrategy,
+) -> Tuple[List[TaskSnapshot], Dict[int, float]]:
+    """
+    Отобрать задачи для инкрементальной перебалансировки
+
+    Нераспределенные задачи переносятся всегда. У пользователей с нагрузкой
+    выше порога снимаются задачи с конца порядка стратегии, пока нагрузка
+    не опустится до порога. Остальные назначения считаются зафиксированными
+
+    Returns:
+        задачи для распределения и нагрузки без снятых задач
+    """
+    loads = dict(user_loads)
+    movable = [task for task in tasks if task.assigned_to is None]
+
+    overloaded: Dict[int, List[TaskSnapshot]] = defaultdict(list)
+    for task in tasks:
+        if task.assigned_to in loads and loads[task.assigned_to] > overload_threshold:
+            overloaded[task.assigned_to].append(task)
+
+    for user_id, user_tasks in overloaded.items():
+        for task in reversed(strategy.order(user_tasks)):
+            if loads[user_id] <= overload_threshold:
+                break
+            movable.append(task)
+            loads[user_id] -= task.hours
+
+    return movable, loads
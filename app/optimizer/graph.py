@@ -0,0 +1,250 @@
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class CycleError(ValueError):
+    """
+    Зависимость создает цикл
+    """
+
+
+class DependencyGraph:
+    """
+    Граф зависимостей задач проекта
+
+    Хранит топологический порядок и самое раннее время завершения каждой задачи
+    (ее оценка плюс максимум по блокирующим задачам) и обновляет их инкрементально:
+    - порядок при добавлении связи перестраивается только на участке между
+      концами связи (алгоритм Pearce-Kelly), там же обнаруживаются циклы;
+    - время завершения пересчитывается только для задач, зависящих от изменения.
+
+    Длина критического пути проекта - максимальное время завершения.
+    В граф входят только задачи, участвующие в зависимостях
+    """
+
+    def __init__(self):
+        self.hours: Dict[int, float] = {}
+        self.blocked_by: Dict[int, Set[int]] = {}
+        self.blocks: Dict[int, Set[int]] = {}
+        self.position: Dict[int, int] = {}
+        self.finish: Dict[int, float] = {}
+        self._next_position = 0
+        self._order: Optional[List[int]] = None
+        self._longest: Optional[float] = None
+
+    @classmethod
+    def build(
+        cls, hours: Dict[int, float], edges: Iterable[Tuple[int, int]]
+    ) -> "DependencyGraph":
+        """
+        Построить граф целиком
+
+        Args:
+            hours: ID задачи -> оценка в часах
+            edges: пары (ID задачи, ID блокирующей задачи)
+        """
+        graph = cls()
+        for task_id, task_hours in hours.items():
+            graph._add_node(task_id, task_hours)
+        for task_id, blocked_by_id in edges:
+            graph.blocked_by[task_id].add(blocked_by_id)
+            graph.blocks[blocked_by_id].add(task_id)
+
+        # Алгоритм Кана
+        pending = {task_id: len(blockers) for task_id, blockers in graph.blocked_by.items()}
+        ready = deque(task_id for task_id, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            task_id = ready.popleft()
+            order.append(task_id)
+            for dependent_id in graph.blocks[task_id]:
+                pending[dependent_id] -= 1
+                if pending[dependent_id] == 0:
+                    ready.append(dependent_id)
+        if len(order) != len(graph.hours):
+            raise CycleError("Граф зависимостей содержит цикл")
+
+        for position, task_id in enumerate(order):
+            graph.position[task_id] = position
+            graph.finish[task_id] = graph._earliest_finish(task_id)
+        graph._next_position = len(order)
+        return graph
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self.hours
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def add_edge(
+        self, task_id: int, blocked_by_id: int, *, hours: Optional[Dict[int, float]] = None
+    ) -> None:
+        """
+        Добавить зависимость: task_id блокируется blocked_by_id
+
+        Args:
+            hours: оценки задач, которых еще нет в графе
+
+        Raises:
+            CycleError: зависимость создает цикл (граф не меняется)
+        """
+        if task_id == blocked_by_id:
+            raise CycleError("Задача не может зависеть от самой себя")
+        for node_id in (task_id, blocked_by_id):
+            if node_id not in self.hours:
+                self._add_node(node_id, (hours or {}).get(node_id, 0))
+                self.finish[node_id] = self.hours[node_id]
+        if blocked_by_id in self.blocked_by[task_id]:
+            return
+
+        if self.position[task_id] < self.position[blocked_by_id]:
+            self._reorder(blocked_by_id, task_id)
+        self.blocked_by[task_id].add(blocked_by_id)
+        self.blocks[blocked_by_id].add(task_id)
+        self._update_finish([task_id])
+
+    def remove_edge(self, task_id: int, blocked_by_id: int) -> None:
+        """
+        Удалить зависимость (топологический порядок при этом остается верным)
+        """
+        if task_id not in self.hours or blocked_by_id not in self.blocked_by[task_id]:
+            return
+        self.blocked_by[task_id].discard(blocked_by_id)
+        self.blocks[blocked_by_id].discard(task_id)
+        self._update_finish([task_id])
+        for node_id in (task_id, blocked_by_id):
+            if not self.blocked_by[node_id] and not self.blocks[node_id]:
+                self._remove_node(node_id)
+
+    def remove_task(self, task_id: int) -> None:
+        """
+        Удалить задачу со всеми ее зависимостями
+        """
+        if task_id not in self.hours:
+            return
+        blockers = list(self.blocked_by[task_id])
+        dependents = list(self.blocks[task_id])
+        for blocked_by_id in blockers:
+            self.blocks[blocked_by_id].discard(task_id)
+        for dependent_id in dependents:
+            self.blocked_by[dependent_id].discard(task_id)
+        self._remove_node(task_id)
+        self._update_finish(dependents)
+        for node_id in blockers + dependents:
+            if node_id in self.hours and not self.blocked_by[node_id] and not self.blocks[node_id]:
+                self._remove_node(node_id)
+
+    def set_hours(self, task_id: int, hours: float) -> None:
+        """
+        Обновить оценку задачи
+        """
+        if task_id not in self.hours or self.hours[task_id] == hours:
+            return
+        self.hours[task_id] = hours
+        self._update_finish([task_id])
+
+    def topological_order(self) -> List[int]:
+        """
+        Задачи в порядке выполнения: блокирующие раньше зависимых
+        """
+        if self._order is None:
+            self._order = sorted(self.position, key=self.position.__getitem__)
+        return self._order
+
+    def critical_path_length(self) -> float:
+        if self._longest is None:
+            self._longest = max(self.finish.values(), default=0)
+        return self._longest
+
+    def critical_path(self) -> List[int]:
+        """
+        Задачи критического пути от первой к последней
+        """
+        if not self.finish:
+            return []
+        task_id = max(self.finish, key=self.finish.__getitem__)
+        path = [task_id]
+        while self.blocked_by[task_id]:
+            task_id = max(self.blocked_by[task_id], key=self.finish.__getitem__)
+            path.append(task_id)
+        path.reverse()
+        return path
+
+    def _add_node(self, task_id: int, hours: float) -> None:
+        self.hours[task_id] = hours
+        self.blocked_by[task_id] = set()
+        self.blocks[task_id] = set()
+        self.position[task_id] = self._next_position
+        self._next_position += 1
+        self._order = None
+        self._longest = None
+
+    def _remove_node(self, task_id: int) -> None:
+        for mapping in (self.hours, self.blocked_by, self.blocks, self.position, self.finish):
+            mapping.pop(task_id, None)
+        self._order = None
+        self._longest = None
+
+    def _reorder(self, source: int, target: int) -> None:
+        """
+        Переставить задачи так, чтобы source оказалась раньше target
+
+        Затрагиваются только задачи, чьи позиции лежат между target и source
+        """
+        lower, upper = self.position[target], self.position[source]
+
+        forward = []
+        stack, seen = [target], {target}
+        while stack:
+            node_id = stack.pop()
+            forward.append(node_id)
+            for dependent_id in self.blocks[node_id]:
+                if dependent_id == source:
+                    raise CycleError("Зависимость создает цикл")
+                if dependent_id not in seen and self.position[dependent_id] < upper:
+                    seen.add(dependent_id)
+                    stack.append(dependent_id)
+
+        backward = []
+        stack, seen = [source], {source}
+        while stack:
+            node_id = stack.pop()
+            backward.append(node_id)
+            for blocker_id in self.blocked_by[node_id]:
+                if blocker_id not in seen and self.position[blocker_id] > lower:
+                    seen.add(blocker_id)
+                    stack.append(blocker_id)
+
+        backward.sort(key=self.position.__getitem__)
+        forward.sort(key=self.position.__getitem__)
+        nodes = backward + forward
+        slots = sorted(self.position[node_id] for node_id in nodes)
+        for node_id, position in zip(nodes, slots):
+            self.position[node_id] = position
+        self._order = None
+
+    def _earliest_finish(self, task_id: int) -> float:
+        return self.hours[task_id] + max(
+            (self.finish[blocker_id] for blocker_id in self.blocked_by[task_id]), default=0
+        )
+
+    def _update_finish(self, task_ids: Iterable[int]) -> None:
+        """
+        Пересчитать время завершения задач и зависящих от них в топологическом порядке
+        """
+        heap = [(self.position[task_id], task_id) for task_id in task_ids if task_id in self.hours]
+        heapq.heapify(heap)
+        queued = {task_id for _, task_id in heap}
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            queued.discard(task_id)
+            finish = self._earliest_finish(task_id)
+            if self.finish.get(task_id) == finish:
+                continue
+            self.finish[task_id] = finish
+            self._longest = None
+            for dependent_id in self.blocks[task_id]:
+                if dependent_id not in queued:
+                    queued.add(dependent_id)
+                    heapq.heappush(heap, (self.position[dependent_id], dependent_id))
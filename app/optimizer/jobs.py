@@ -0,0 +1,133 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.schemas.optimizer import OptimizationJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """
+    Очередь фоновых задач оптимизации заполнена
+    """
+
+
+class OptimizationJob:
+    """
+    Состояние фонового запуска оптимизации
+    """
+
+    def __init__(self, owner_id: int):
+        self.id = uuid.uuid4().hex
+        self.owner_id = owner_id
+        self.status = OptimizationJobStatus.QUEUED
+        self.progress = 0.0
+        self.submitted_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        # ID пользователя -> ID назначенных задач
+        self.distribution: Optional[Dict[int, List[int]]] = None
+        self.error: Optional[str] = None
+
+    def set_progress(self, value: float) -> None:
+        self.progress = round(min(max(value, 0.0), 1.0), 2)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (OptimizationJobStatus.SUCCEEDED, OptimizationJobStatus.FAILED)
+
+
+JobFunction = Callable[[OptimizationJob], Dict[int, List[int]]]
+
+
+class OptimizationJobManager:
+    """
+    Ограниченный пул фоновых запусков оптимизации
+
+    Одновременно выполняется не более max_workers запусков (и столько же
+    соединений с БД), еще max_queued ждут в очереди. Остальные запросы
+    отклоняются сразу. Результаты хранятся ttl_seconds после завершения
+    """
+
+    def __init__(self, *, max_workers: int, max_queued: int, ttl_seconds: int):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._jobs: Dict[str, OptimizationJob] = {}
+        self._active = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, func: JobFunction, *, owner_id: int) -> OptimizationJob:
+        """
+        Поставить запуск в очередь
+
+        func получает объект задания и возвращает итоговое распределение
+        """
+        with self._lock:
+            self._purge_expired()
+            if self._active >= self.max_workers + self.max_queued:
+                raise JobQueueFull()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="optimizer-job"
+                )
+            job = OptimizationJob(owner_id=owner_id)
+            self._jobs[job.id] = job
+            self._active += 1
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[OptimizationJob]:
+        """
+        Получить задание по ID (None, если не найдено или устарело)
+        """
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: OptimizationJob, func: JobFunction) -> None:
+        job.status = OptimizationJobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        status = OptimizationJobStatus.FAILED
+        try:
+            job.distribution = func(job)
+            job.set_progress(1.0)
+            status = OptimizationJobStatus.SUCCEEDED
+        except Exception as e:
+            logger.exception("Optimization job %s failed", job.id)
+            job.error = str(e)
+        finally:
+            # Итоговый статус и время завершения меняются вместе под блокировкой:
+            # _purge_expired не видит завершенное задание без finished_at
+            with self._lock:
+                job.finished_at = datetime.now(timezone.utc)
+                job.status = status
+                self._active -= 1
+
+    def _purge_expired(self) -> None:
+        deadline = datetime.now(timezone.utc) - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at is not None and job.finished_at < deadline
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+job_manager = OptimizationJobManager(
+    max_workers=settings.OPTIMIZER_JOB_WORKERS,
+    max_queued=settings.OPTIMIZER_JOB_QUEUE_SIZE,
+    ttl_seconds=settings.OPTIMIZER_JOB_TTL_SECONDS,
+)
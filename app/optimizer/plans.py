@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.optimizer.engine import (
+    BalanceMetrics,
+    Dependencies,
+    OptimizationParams,
+    TaskSnapshot,
+)
+
+
+class PlanConflict(Exception):
+    """
+    Задачи изменились с момента расчета плана
+    """
+
+
+class OptimizationPlan:
+    """
+    Рассчитанный, но не примененный план распределения задач
+    """
+
+    def __init__(
+        self,
+        *,
+        token: str,
+        owner_id: int,
+        params: OptimizationParams,
+        distribution: Dict[int, List[int]],
+        loads: Dict[int, float],
+        metrics: BalanceMetrics,
+    ):
+        self.token = token
+        self.owner_id = owner_id
+        self.params = params
+        self.distribution = distribution
+        self.loads = loads
+        self.metrics = metrics
+        self.created_at = datetime.now(timezone.utc)
+
+    @property
+    def user_ids(self) -> List[int]:
+        return self.params.user_ids
+
+    @property
+    def project_id(self) -> Optional[int]:
+        return self.params.project_id
+
+    @property
+    def strategy(self) -> str:
+        return self.params.strategy.name
+
+    @property
+    def incremental(self) -> bool:
+        return self.params.incremental
+
+
+def plan_token(
+    tasks: Sequence[TaskSnapshot],
+    user_loads: Dict[int, float],
+    params: OptimizationParams,
+    dependencies: Optional[Dependencies] = None,
+    *,
+    owner_id: int,
+) -> str:
+    """
+    Токен снимка входных данных оптимизации
+
+    Одинаковые владелец, параметры и неизменившийся набор задач (состав, приоритеты,
+    оценки, дедлайны, назначения, зависимости) и нагрузки дают один и тот же токен.
+    Владелец входит в токен, чтобы одинаковый предпросмотр другого пользователя
+    не заменял план в кэше
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(owner_id).encode())
+    digest.update(repr(params.cache_key()).encode())
+    for task in sorted(tasks):
+        digest.update(repr(tuple(task)).encode())
+    digest.update(repr(sorted(user_loads.items())).encode())
+    if dependencies:
+        digest.update(repr(sorted(
+            (task_id, sorted(blocker_ids)) for task_id, blocker_ids in dependencies.items()
+        )).encode())
+    return digest.hexdigest()
+
+
+plan_cache: "TTLCache[str, OptimizationPlan]" = TTLCache(
+    max_size=settings.OPTIMIZER_PLAN_CACHE_SIZE,
+    ttl=settings.OPTIMIZER_PLAN_TTL_SECONDS,
+)
@@ -0,0 +1,178 @@
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from app.core.config import settings
+from app.optimizer.engine import (
+    BalanceMetrics,
+    Dependencies,
+    OptimizationStrategy,
+    TaskSnapshot,
+    balance_metrics,
+)
+
+
+class Scenario(NamedTuple):
+    """
+    Вариант состава команды и входных данных для сравнения
+    """
+    name: str
+    add_user_ids: Sequence[int] = ()
+    remove_user_ids: Sequence[int] = ()
+    # ID пользователя -> емкость, часов в день (для стратегий, которые ее учитывают)
+    capacities: Optional[Dict[int, float]] = None
+    # ID задачи -> новый приоритет
+    priorities: Optional[Dict[int, int]] = None
+
+
+class ScenarioSnapshot(NamedTuple):
+    """
+    Снимок входных данных, общий для всех сценариев одного запроса
+    """
+    tasks: List[TaskSnapshot]
+    user_ids: List[int]
+    # Нагрузка всех пользователей, участвующих хотя бы в одном сценарии
+    user_loads: Dict[int, float]
+    dependencies: Dependencies
+    strategy: OptimizationStrategy
+
+
+class ScenarioResult(NamedTuple):
+    name: str
+    user_ids: List[int]
+    distribution: Dict[int, List[int]]
+    loads: Dict[int, float]
+    metrics: BalanceMetrics
+    # Сколько задач сменит исполнителя по сравнению с текущими назначениями
+    reassigned: int
+
+
+def evaluate_scenario(snapshot: ScenarioSnapshot, scenario: Scenario) -> ScenarioResult:
+    """
+    Рассчитать распределение для сценария без обращения к БД
+    """
+    removed = set(scenario.remove_user_ids)
+    user_ids = [
+        user_id
+        for user_id in dict.fromkeys([*snapshot.user_ids, *scenario.add_user_ids])
+        if user_id not in removed
+    ]
+    user_loads = {user_id: snapshot.user_loads[user_id] for user_id in user_ids}
+
+    tasks = snapshot.tasks
+    if scenario.priorities:
+        tasks = [
+            task._replace(priority=scenario.priorities[task.id])
+            if task.id in scenario.priorities else task
+            for task in tasks
+        ]
+
+    strategy = snapshot.strategy
+    if scenario.capacities:
+        strategy = strategy.with_capacities(scenario.capacities)
+
+    result = strategy.assign(tasks, user_loads, snapshot.dependencies)
+    assigned_to = {task.id: task.assigned_to for task in snapshot.tasks}
+    reassigned = sum(
+        assigned_to[task_id] != user_id
+        for user_id, task_ids in result.distribution.items()
+        for task_id in task_ids
+    )
+    return ScenarioResult(
+        name=scenario.name,
+        user_ids=user_ids,
+        distribution=result.distribution,
+        loads=result.loads,
+        metrics=balance_metrics(result.loads, result.overflow),
+        reassigned=reassigned,
+    )
+
+
+def _evaluate_batch(payload: bytes, scenarios: List[Scenario]) -> List[ScenarioResult]:
+    """
+    Рассчитать пакет сценариев в процессе-исполнителе над одним распакованным снимком
+    """
+    snapshot = pickle.loads(payload)
+    return [evaluate_scenario(snapshot, scenario) for scenario in scenarios]
+
+
+def split_batches(scenarios: Sequence[Scenario], count: int) -> List[List[Scenario]]:
+    """
+    Разбить сценарии на count пакетов почти равного размера с сохранением порядка
+    """
+    size, extra = divmod(len(scenarios), count)
+    batches, start = [], 0
+    for index in range(count):
+        end = start + size + (index < extra)
+        batches.append(list(scenarios[start:end]))
+        start = end
+    return batches
+
+
+class ScenarioPool:
+    """
+    Пул процессов для параллельного расчета сценариев
+
+    Расчет распределения - чистый Python, поэтому потоки упираются в GIL,
+    а процессы используют все ядра. Снимок сериализуется один раз на запрос,
+    а сценарии отправляются пакетами, не больше одного на процесс: снимок
+    передается в процессы один раз на пакет, а не с каждым сценарием.
+    Процессы запускаются через spawn (безопасно для многопоточного сервера)
+    при первом обращении и переиспользуются между запросами
+
+    Args:
+        max_workers: число процессов (None - по числу ядер,
+            0 - считать сценарии в текущем процессе)
+    """
+
+    def __init__(self, *, max_workers: Optional[int]):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def evaluate(
+        self, snapshot: ScenarioSnapshot, scenarios: Sequence[Scenario]
+    ) -> List[ScenarioResult]:
+        """
+        Рассчитать сценарии, результаты в порядке сценариев
+        """
+        if self.max_workers == 0 or len(scenarios) < 2:
+            return [evaluate_scenario(snapshot, scenario) for scenario in scenarios]
+
+        executor = self._get_executor()
+        payload = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        workers = self.max_workers or os.cpu_count() or 1
+        try:
+            futures = [
+                executor.submit(_evaluate_batch, payload, batch)
+                for batch in split_batches(scenarios, min(workers, len(scenarios)))
+            ]
+            return [result for future in futures for result in future.result()]
+        except BrokenProcessPool:
+            # Процесс-исполнитель упал: следующий запрос создаст новый пул
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+scenario_pool = ScenarioPool(max_workers=settings.OPTIMIZER_SCENARIO_WORKERS)
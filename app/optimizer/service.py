@@ -0,0 +1,228 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models.task import Task
+from app.optimizer.engine import (
+    Dependencies,
+    OptimizationParams,
+    TaskSnapshot,
+    balance_metrics,
+    select_incremental,
+)
+from app.optimizer.plans import OptimizationPlan, PlanConflict, plan_cache, plan_token
+from app.optimizer.scenarios import Scenario, ScenarioResult, ScenarioSnapshot, scenario_pool
+
+ProgressCallback = Callable[[float], None]
+
+
+class OptimizationInput(NamedTuple):
+    """
+    Входные данные оптимизации
+    """
+    tasks: List[Task]
+    # ID пользователя -> нагрузка, которая не перераспределяется
+    user_loads: Dict[int, float]
+    # Зависимости внутри набора задач (пусто, если не учитываются)
+    dependencies: Dependencies
+
+    def snapshots(self) -> List[TaskSnapshot]:
+        return [TaskSnapshot.from_object(task) for task in self.tasks]
+
+
+def load_optimization_input(
+    db: Session, *, params: OptimizationParams, current_user: Any, lock: bool = False
+) -> OptimizationInput:
+    """
+    Получить задачи для распределения, базовую нагрузку пользователей
+    и зависимости между задачами
+
+    В инкрементальном режиме загружаются только нераспределенные задачи
+    и задачи перегруженных пользователей, остальные назначения не меняются.
+    С lock=True задачи захватываются до commit в save_distribution
+    """
+    tasks, user_loads = _load_tasks(
+        db, params=params, current_user=current_user, lock=lock
+    )
+    dependencies: Dependencies = {}
+    if params.respect_dependencies:
+        dependencies = crud.task_dependency.get_blockers_among(
+            db, task_ids=[task.id for task in tasks]
+        )
+    return OptimizationInput(tasks, user_loads, dependencies)
+
+
+def _load_tasks(
+    db: Session, *, params: OptimizationParams, current_user: Any, lock: bool
+) -> Tuple[List[Task], Dict[int, float]]:
+    user_loads = crud.task.get_loads_for_users(db, user_ids=params.user_ids)
+
+    if not params.incremental:
+        tasks = crud.task.get_tasks_for_optimization(
+            db,
+            user_ids=params.user_ids,
+            project_id=params.project_id,
+            current_user=current_user,
+            lock=lock
+        )
+        return tasks, user_loads
+
+    overloaded_user_ids = [
+        user_id for user_id in params.user_ids
+        if user_loads[user_id] > params.overload_threshold
+    ]
+    tasks = crud.task.get_tasks_for_optimization(
+        db,
+        user_ids=overloaded_user_ids,
+        project_id=params.project_id,
+        current_user=current_user,
+        lock=lock
+    )
+    movable, base_loads = select_incremental(
+        [TaskSnapshot.from_object(task) for task in tasks],
+        user_loads,
+        overload_threshold=params.overload_threshold,
+        strategy=params.strategy,
+    )
+    movable_ids = {task.id for task in movable}
+    return [task for task in tasks if task.id in movable_ids], base_loads
+
+
+def save_distribution(
+    db: Session, *, tasks: List[Task], distribution: Dict[int, List[int]]
+) -> Dict[int, List[Task]]:
+    """
+    Сохранить назначения одной транзакцией, вернуть задачи по пользователям
+    """
+    tasks_by_id = {task.id: task for task in tasks}
+    assignments = {
+        task_id: user_id
+        for user_id, task_ids in distribution.items()
+        for task_id in task_ids
+    }
+    crud.task.bulk_assign(db, tasks=tasks, assignments=assignments)
+    return {
+        user_id: [tasks_by_id[task_id] for task_id in task_ids]
+        for user_id, task_ids in distribution.items()
+    }
+
+
+def run_optimization(
+    db: Session,
+    *,
+    params: OptimizationParams,
+    current_user: Any,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[int, List[Task]]:
+    """
+    Выполнить оптимизацию и сохранить назначения
+
+    Проверки доступа выполняются до вызова (см. app.api.optimizer).
+    Возвращает распределение: ID пользователя -> назначенные задачи
+    """
+    report = progress or (lambda value: None)
+
+    data = load_optimization_input(
+        db, params=params, current_user=current_user, lock=True
+    )
+    report(0.4)
+
+    result = params.strategy.assign(data.snapshots(), data.user_loads, data.dependencies)
+    report(0.7)
+
+    distribution = save_distribution(db, tasks=data.tasks, distribution=result.distribution)
+    report(1.0)
+    return distribution
+
+
+def preview_optimization(
+    db: Session, *, params: OptimizationParams, current_user: Any
+) -> OptimizationPlan:
+    """
+    Рассчитать план без записи в БД
+
+    План кэшируется по токену снимка входных данных: повторный просмотр
+    при неизменившихся задачах не пересчитывает распределение
+    """
+    data = load_optimization_input(db, params=params, current_user=current_user)
+    snapshots = data.snapshots()
+    token = plan_token(
+        snapshots, data.user_loads, params, data.dependencies, owner_id=current_user.id
+    )
+
+    plan = plan_cache.get(token)
+    if plan is not None:
+        return plan
+
+    result = params.strategy.assign(snapshots, data.user_loads, data.dependencies)
+    plan = OptimizationPlan(
+        token=token,
+        owner_id=current_user.id,
+        params=params,
+        distribution=result.distribution,
+        loads=result.loads,
+        metrics=balance_metrics(result.loads, result.overflow),
+    )
+    plan_cache.set(token, plan)
+    return plan
+
+
+def apply_plan(
+    db: Session, *, plan: OptimizationPlan, current_user: Any
+) -> Dict[int, List[Task]]:
+    """
+    Применить ранее рассчитанный план без пересчета
+
+    Raises:
+        PlanConflict: задачи или нагрузки изменились после расчета плана
+    """
+    data = load_optimization_input(
+        db, params=plan.params, current_user=current_user, lock=True
+    )
+    token = plan_token(
+        data.snapshots(), data.user_loads, plan.params, data.dependencies, owner_id=plan.owner_id
+    )
+    if token != plan.token:
+        plan_cache.invalidate(plan.token)
+        raise PlanConflict()
+
+    distribution = save_distribution(db, tasks=data.tasks, distribution=plan.distribution)
+    plan_cache.invalidate(plan.token)
+    return distribution
+
+
+def compare_scenarios(
+    db: Session,
+    *,
+    params: OptimizationParams,
+    scenarios: List[Scenario],
+    current_user: Any,
+) -> List[ScenarioResult]:
+    """
+    Рассчитать распределение для каждого сценария без записи в БД
+
+    Задачи и нагрузки читаются один раз, сценарии считаются параллельно
+    в пуле процессов над общим снимком
+    """
+    data = load_optimization_input(db, params=params, current_user=current_user)
+    user_loads = dict(data.user_loads)
+    added_user_ids = [
+        user_id
+        for scenario in scenarios
+        for user_id in scenario.add_user_ids
+        if user_id not in user_loads
+    ]
+    if added_user_ids:
+        user_loads.update(crud.task.get_loads_for_users(
+            db, user_ids=list(dict.fromkeys(added_user_ids))
+        ))
+
+    snapshot = ScenarioSnapshot(
+        tasks=data.snapshots(),
+        user_ids=params.user_ids,
+        user_loads=user_loads,
+        dependencies=data.dependencies,
+        strategy=params.strategy,
+    )
+    return scenario_pool.evaluate(snapshot, scenarios)
@@ -1 +1,36 @@
-
+from app.schemas.user import User, UserCreate, UserUpdate, UserLogin, Token, TokenPayload
+from app.schemas.project import (
+    Project,
+    ProjectCreate,
+    ProjectUpdate,
+    ProjectDetail,
+    ProjectCriticalPath,
+)
+from app.schemas.task import (
+    Task,
+    TaskCreate,
+    TaskUpdate,
+    TaskStatus,
+    TaskPriority,
+    TaskOrder,
+    TaskBulkItemResult,
+    TaskBulkCreateResult,
+    TaskBulkUpdateItem,
+    TaskFilter,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskDependency,
+    TaskDependencyCreate,
+    OptimizationRequest,
+)
+from app.schemas.stats import TaskStats, ProjectStats, UserStats
+from app.schemas.optimizer import (
+    OptimizationJob,
+    OptimizationJobStatus,
+    OptimizationPlan,
+    BalanceMetrics,
+    OptimizationScenario,
+    ScenarioComparisonRequest,
+    ScenarioResult,
+    ScenarioComparison,
+)
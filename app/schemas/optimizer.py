@@ -0,0 +1,89 @@
+from typing import Optional, List, Dict
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from enum import Enum
+
+from app.optimizer.engine import DEFAULT_STRATEGY
+from app.schemas.task import CapacityHours, TaskPriority
+
+# Статусы фонового запуска оптимизации
+class OptimizationJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+# Состояние фонового запуска оптимизации
+class OptimizationJob(BaseModel):
+    id: str
+    status: OptimizationJobStatus
+    progress: float
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # ID пользователя -> ID назначенных задач
+    distribution: Optional[Dict[int, List[int]]] = None
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Показатели баланса нагрузки (в часах)
+class BalanceMetrics(BaseModel):
+    makespan: float
+    min_load: float
+    mean_load: float
+    spread: float
+    # Часы, не укладывающиеся в дедлайны (стратегия capacity_aware)
+    overflow_hours: float = 0
+
+# План распределения, рассчитанный без записи в БД
+class OptimizationPlan(BaseModel):
+    token: str
+    strategy: str
+    user_ids: List[int]
+    project_id: Optional[int] = None
+    incremental: bool = False
+    # ID пользователя -> ID назначенных задач
+    distribution: Dict[int, List[int]]
+    # ID пользователя -> нагрузка после применения плана
+    loads: Dict[int, float]
+    metrics: BalanceMetrics
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Вариант состава команды для сравнения
+class OptimizationScenario(BaseModel):
+    name: str
+    add_user_ids: List[int] = []
+    remove_user_ids: List[int] = []
+    # ID пользователя -> емкость, часов в день (стратегия capacity_aware)
+    capacities: Dict[int, CapacityHours] = {}
+    # ID задачи -> новый приоритет
+    priorities: Dict[int, TaskPriority] = {}
+
+# Запрос сравнения сценариев: базовый состав (user_ids) и его варианты
+class ScenarioComparisonRequest(BaseModel):
+    user_ids: List[int]
+    project_id: Optional[int] = None
+    strategy: str = DEFAULT_STRATEGY
+    capacities: Optional[Dict[int, CapacityHours]] = None
+    respect_dependencies: bool = False
+    scenarios: List[OptimizationScenario] = Field(..., min_length=1)
+
+# Результат сценария
+class ScenarioResult(BaseModel):
+    name: str
+    user_ids: List[int]
+    # ID пользователя -> ID назначенных задач
+    distribution: Dict[int, List[int]]
+    loads: Dict[int, float]
+    metrics: BalanceMetrics
+    # Число задач, которые сменят исполнителя
+    reassigned: int
+
+# Сравнение сценариев; первый результат - базовый состав без изменений
+class ScenarioComparison(BaseModel):
+    strategy: str
+    project_id: Optional[int] = None
+    results: List[ScenarioResult]
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
 # Общие атрибуты
@@ -23,13 +23,16 @@ class Project(ProjectBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Расширенная модель с информацией о задачах
 class ProjectDetail(Project):
     tasks_count: int
     completed_tasks_count: int
 
-    class Config:
-        orm_mode = True
+# Критический путь по зависимостям задач проекта
+class ProjectCriticalPath(BaseModel):
+    project_id: int
+    length_hours: float
+    critical_path: List[int]
+    order: List[int]  # Задачи с зависимостями в допустимом порядке выполнения
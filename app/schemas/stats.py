@@ -0,0 +1,21 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+from app.schemas.task import TaskStatus
+
+# Сводка по задачам
+class TaskStats(BaseModel):
+    tasks_count: int
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[int, int]
+    open_hours: int  # Сумма оценок невыполненных задач
+    overdue_count: int  # Невыполненные задачи с прошедшим дедлайном
+
+# Сводка по задачам проекта
+class ProjectStats(TaskStats):
+    project_id: int
+
+# Сводка по задачам, назначенным пользователю
+class UserStats(TaskStats):
+    user_id: int
@@ -1,8 +1,10 @@
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List, Dict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from enum import Enum
 
+from app.optimizer.engine import DEFAULT_STRATEGY
+
 # Статусы задачи
 class TaskStatus(str, Enum):
     TODO = "todo"
@@ -15,13 +17,21 @@ class TaskPriority(int, Enum):
     MEDIUM = 2
     HIGH = 3
 
+# Порядок списка задач
+class TaskOrder(str, Enum):
+    ID = "id"
+    PRIORITY = "priority"  # Приоритет по убыванию, затем дедлайн
+
+# Емкость пользователя, часов в день (стратегия capacity_aware): только положительная
+CapacityHours = Annotated[float, Field(gt=0)]
+
 # Общие атрибуты
 class TaskBase(BaseModel):
     title: str
     description: Optional[str] = None
     status: TaskStatus = TaskStatus.TODO
     priority: TaskPriority = TaskPriority.MEDIUM
-    estimated_hours: Optional[int] = Field(ge=0, le=24, example=2)
+    estimated_hours: Optional[int] = Field(None, ge=0, le=24, examples=[2])
     deadline: Optional[datetime] = None
 
 # Свойства для создания задачи
@@ -44,15 +54,68 @@ class TaskUpdate(BaseModel):
 class Task(TaskBase):
     id: int
     project_id: int
-    assigned_to: Optional[int]
+    assigned_to: Optional[int] = None
     created_by: int
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Результат создания одной задачи из списка: ID созданной задачи или ошибка
+class TaskBulkItemResult(BaseModel):
+    index: int  # Позиция задачи в запросе
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+# Результат создания задач списком
+class TaskBulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    items: List[TaskBulkItemResult]
+
+# Изменение одной задачи в запросе изменения списком
+class TaskBulkUpdateItem(BaseModel):
+    id: int
+    changes: TaskUpdate
+
+# Фильтр задач (как у списка задач)
+class TaskFilter(BaseModel):
+    project_id: Optional[int] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assigned_to: Optional[int] = None
+
+# Изменение задач списком: либо items, либо filter и общие изменения changes
+class TaskBulkUpdate(BaseModel):
+    items: Optional[List[TaskBulkUpdateItem]] = None
+    filter: Optional[TaskFilter] = None
+    changes: Optional[TaskUpdate] = None
+
+# Результат изменения задач списком
+class TaskBulkUpdateResult(BaseModel):
+    updated: int
+    failed: int
+    ids: List[int]  # ID измененных задач
+    errors: List[TaskBulkItemResult]  # Ошибки элементов items (index - позиция в items)
+
+# Зависимость задачи: задача не может начаться раньше блокирующей
+class TaskDependencyCreate(BaseModel):
+    blocked_by_id: int
+
+class TaskDependency(TaskDependencyCreate):
+    task_id: int
 
 # Запрос оптимизации задач
 class OptimizationRequest(BaseModel):
     user_ids: List[int]
     project_id: Optional[int] = None  # Если None, то оптимизируем задачи по всем проектам
+    strategy: str = DEFAULT_STRATEGY  # Имя стратегии из app.optimizer.STRATEGIES
+    # Инкрементальный режим: переносятся только нераспределенные задачи
+    # и задачи пользователей с нагрузкой выше порога
+    incremental: bool = False
+    overload_threshold_hours: Optional[float] = Field(None, ge=0)  # По умолчанию из настроек
+    # Емкость пользователей в часах в день для стратегии capacity_aware:
+    # ID пользователя -> часы (по умолчанию из настроек)
+    capacities: Optional[Dict[int, CapacityHours]] = None
+    # Распределять блокирующие задачи раньше зависимых от них
+    respect_dependencies: bool = False
@@ -1,11 +1,10 @@
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, constr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from datetime import datetime
 
 # Общие атрибуты
 class UserBase(BaseModel):
     email: EmailStr
-    password: constr(min_length=8, regex=r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}$")
     username: str
     is_active: Optional[bool] = True
     is_superuser: Optional[bool] = False
@@ -28,8 +27,7 @@ class User(UserBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Свойства для логина
 class UserLogin(BaseModel):
@@ -0,0 +1,111 @@
+import asyncio
+import shutil
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app import crud
+from app.api import async_routes
+from app import database
+from app.core.security import create_access_token
+from app.database import AsyncReplicaRouter, Base, async_database_url, get_async_db
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([
+            User(id=1, email="owner@example.com", username="owner", hashed_password="x"),
+            User(id=2, email="other@example.com", username="other", hashed_password="x"),
+        ])
+        db.add(Project(id=1, name="p", owner_id=1))
+        db.add_all(
+            Task(id=i, title=f"t{i}", project_id=1, created_by=1, status=status)
+            for i, status in enumerate([TaskStatus.TODO, TaskStatus.DONE, TaskStatus.DONE], start=1)
+        )
+        db.commit()
+    engine.dispose()
+    crud.user.auth_cache.clear()
+    yield url
+    crud.user.auth_cache.clear()
+
+
+def test_async_crud_matches_sync(database_url):
+    assert async_database_url(database_url).startswith("sqlite+aiosqlite:///")
+
+    async def run():
+        engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            page = await crud.async_task.get_page_for_user(db, user_id=1, limit=2)
+            counts = await crud.async_project.get_with_task_counts(db, id=1)
+            auth_user = await crud.async_user.get_auth(db, id=2)
+            missing = await crud.async_task.get_with_project_owner(db, id=99)
+        await engine.dispose()
+        return page, counts, auth_user, missing
+
+    page, counts, auth_user, missing = asyncio.run(run())
+    assert [task.id for task in page.items] == [1, 2] and page.next_cursor
+    assert counts[1:] == (3, 2)
+    assert (auth_user.id, auth_user.is_superuser) == (2, False)
+    assert missing is None
+
+
+def test_async_routes(database_url):
+    engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    for router in (async_routes.users_router, async_routes.projects_router, async_routes.tasks_router):
+        app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    client = TestClient(app)
+    owner = {"Authorization": f"Bearer {create_access_token(1)}"}
+    other = {"Authorization": f"Bearer {create_access_token(2)}"}
+
+    response = client.get("/tasks/?limit=2&status=done", headers=owner)
+    assert [task["id"] for task in response.json()] == [2, 3]
+    assert "X-Next-Cursor" not in response.headers
+    response = client.get("/projects/1", headers=owner)
+    assert (response.json()["tasks_count"], response.json()["completed_tasks_count"]) == (3, 2)
+    assert client.get("/users/me", headers=other).json()["username"] == "other"
+    assert client.get("/tasks/1", headers=other).status_code == 403
+    assert client.get("/tasks/99", headers=owner).status_code == 404
+
+
+def test_async_routes_read_from_replica(database_url, tmp_path, monkeypatch):
+    replica_path = tmp_path / "replica.db"
+    shutil.copy(tmp_path / "async.db", replica_path)
+    replica = create_engine(f"sqlite:///{replica_path}")
+    with replica.begin() as connection:
+        connection.execute(update(Project).values(name="replica"))
+    replica.dispose()
+    replica = create_async_engine(f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool)
+    monkeypatch.setattr(
+        database, "async_read_replicas", AsyncReplicaRouter([replica], retry_seconds=60)
+    )
+    primary = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+    session_factory = async_sessionmaker(primary, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_routes.projects_router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    owner = {"Authorization": f"Bearer {create_access_token(1)}"}
+    assert TestClient(app).get("/projects/1", headers=owner).json()["name"] == "replica"
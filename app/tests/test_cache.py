@@ -0,0 +1,41 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_get_returns_cached_value_and_counts_hits():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_expired_entries_are_dropped():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+
+    assert cache.get("a") is None
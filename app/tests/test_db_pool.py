@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.core.pool import TimedAsyncQueuePool, TimedQueuePool, pool_status
+from app.database import engine_options
+
+
+def test_pool_status_counts_connections_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        status = pool_status(engine.pool)
+        assert (status["size"], status["checked_out"], status["idle"], status["overflow"]) == (1, 1, 0, 0)
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    status = pool_status(engine.pool)
+    assert (status["checked_out"], status["idle"]) == (0, 1)
+    assert status["checkout_wait"]["count"] == 2
+    assert status["checkout_wait"]["timeouts"] == 1
+    assert status["checkout_wait"]["max_ms"] >= 50
+    engine.dispose()
+
+
+def test_engine_options_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    assert engine_options("sqlite:///tasks.db") == {}
+    options = engine_options("postgresql://u:p@db/tasks")
+    assert options["poolclass"] is TimedQueuePool and options["pool_size"] == 20
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    options = engine_options("postgresql://u:p@db/tasks", is_async=True)
+    assert options["poolclass"] is TimedAsyncQueuePool
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
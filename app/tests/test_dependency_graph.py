@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from app.optimizer import CycleError, DependencyGraph
+
+
+def assert_consistent(graph):
+    """
+    Инкрементальное состояние совпадает с построенным заново
+    """
+    edges = [
+        (task_id, blocked_by_id)
+        for task_id, blockers in graph.blocked_by.items()
+        for blocked_by_id in blockers
+    ]
+    rebuilt = DependencyGraph.build(dict(graph.hours), edges)
+    assert graph.finish == rebuilt.finish
+    assert graph.critical_path_length() == rebuilt.critical_path_length()
+    for task_id, blocked_by_id in edges:
+        assert graph.position[blocked_by_id] < graph.position[task_id]
+    # Задачи без зависимостей в графе не хранятся
+    assert set(graph.hours) == {task_id for edge in edges for task_id in edge}
+
+
+def test_build_computes_critical_path():
+    graph = DependencyGraph.build({1: 2, 2: 3, 3: 10, 4: 1}, [(2, 1), (4, 2), (4, 3)])
+
+    assert graph.critical_path_length() == 11
+    assert graph.critical_path() == [3, 4]
+    order = graph.topological_order()
+    assert order.index(1) < order.index(2) < order.index(4)
+
+
+def test_build_rejects_cycle():
+    with pytest.raises(CycleError):
+        DependencyGraph.build({1: 1, 2: 1}, [(1, 2), (2, 1)])
+
+
+def test_add_edge_reorders_and_extends_path():
+    graph = DependencyGraph.build({1: 2, 2: 3}, [(2, 1)])
+
+    # 3 добавляется в конец порядка, затем 1 начинает зависеть от 3
+    graph.add_edge(1, 3, hours={3: 5})
+
+    assert graph.topological_order() == [3, 1, 2]
+    assert graph.critical_path() == [3, 1, 2]
+    assert graph.critical_path_length() == 10
+
+
+def test_add_edge_detects_cycle_without_changes():
+    graph = DependencyGraph.build({1: 1, 2: 1, 3: 1}, [(2, 1), (3, 2)])
+
+    with pytest.raises(CycleError):
+        graph.add_edge(1, 3)
+    with pytest.raises(CycleError):
+        graph.add_edge(1, 1)
+
+    assert graph.blocked_by[1] == set()
+    assert graph.critical_path_length() == 3
+
+
+def test_set_hours_propagates_to_dependents():
+    graph = DependencyGraph.build({1: 1, 2: 1, 3: 4}, [(2, 1)])
+    graph.add_edge(3, 2)
+
+    graph.set_hours(1, 6)
+
+    assert graph.finish == {1: 6, 2: 7, 3: 11}
+    graph.set_hours(1, 0)
+    assert graph.critical_path_length() == 5
+
+
+def test_remove_edge_and_task_drop_isolated_tasks():
+    graph = DependencyGraph.build({1: 1, 2: 2, 3: 3}, [(2, 1), (3, 2)])
+
+    graph.remove_edge(3, 2)
+    assert 3 not in graph
+    assert graph.critical_path_length() == 3
+
+    graph.remove_task(2)
+    assert len(graph) == 0
+    assert graph.critical_path() == []
+
+
+def test_random_changes_match_full_rebuild():
+    rng = random.Random(7)
+    graph = DependencyGraph()
+    task_ids = list(range(60))
+    hours = {task_id: rng.randint(0, 8) for task_id in task_ids}
+
+    for _ in range(400):
+        action = rng.random()
+        task_id, blocked_by_id = rng.sample(task_ids, 2)
+        if action < 0.6:
+            try:
+                graph.add_edge(task_id, blocked_by_id, hours=hours)
+            except CycleError:
+                pass
+        elif action < 0.8:
+            graph.remove_edge(task_id, blocked_by_id)
+        elif action < 0.95:
+            hours[task_id] = rng.randint(0, 8)
+            graph.set_hours(task_id, hours[task_id])
+        else:
+            graph.remove_task(task_id)
+        assert_consistent(graph)
@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.optimizer import TaskSnapshot, WorkloadTimeline, get_strategy
+from app.schemas import OptimizationRequest, ScenarioComparisonRequest
+
+START = date(2024, 1, 1)
+
+
+def due(days):
+    return datetime(2024, 1, 1, 12, tzinfo=timezone.utc) + timedelta(days=days)
+
+
+def make_task(id, hours, deadline=None, priority=2):
+    return TaskSnapshot(id=id, priority=priority, estimated_hours=hours, deadline=deadline)
+
+
+def capacity_strategy(**options):
+    return get_strategy("capacity_aware", start=START, horizon_days=10, **options)
+
+
+def test_task_goes_to_user_who_can_meet_deadline():
+    # Пользователь 1 уже занят на весь завтрашний день, пользователь 2 - на 4 часа
+    strategy = capacity_strategy(default_capacity=8)
+
+    result = strategy.assign([make_task(1, hours=8, deadline=due(1))], {1: 16, 2: 12})
+
+    assert result.distribution == {1: [], 2: [1]}
+    assert result.overflow == {1: 0, 2: 4}
+
+
+def test_capacity_overrides_are_respected():
+    strategy = capacity_strategy(capacities={1: 2, 2: 8})
+    tasks = [make_task(1, hours=6, deadline=due(0)), make_task(2, hours=2, deadline=due(0))]
+
+    result = strategy.assign(tasks, {1: 0, 2: 0})
+
+    assert result.distribution == {1: [2], 2: [1]}
+    assert result.overflow == {1: 0, 2: 0}
+
+
+def test_overflow_lands_on_deadline_day():
+    timeline = WorkloadTimeline(np.array([8.0]), horizon_days=3)
+
+    timeline.place(20, day=1)
+
+    assert timeline.daily_load().tolist() == [[8.0, 12.0, 0.0]]
+    assert timeline.overflow_total.tolist() == [4.0]
+
+
+def test_tasks_without_deadline_fill_the_horizon():
+    strategy = capacity_strategy(default_capacity=1)
+    tasks = [make_task(i, hours=5) for i in range(4)]
+
+    result = strategy.assign(tasks, {1: 0, 2: 0})
+
+    assert result.overflow == {1: 0, 2: 0}
+    assert result.loads == {1: 10, 2: 10}
+
+
+@pytest.mark.parametrize("hours", [0, -4])
+def test_non_positive_capacities_are_rejected(hours):
+    with pytest.raises(ValidationError):
+        OptimizationRequest(user_ids=[1], capacities={1: hours})
+    with pytest.raises(ValidationError):
+        ScenarioComparisonRequest(
+            user_ids=[1], scenarios=[{"name": "s", "capacities": {1: hours}}]
+        )
+    assert OptimizationRequest(user_ids=[1], capacities={1: 0.5}).capacities == {1: 0.5}
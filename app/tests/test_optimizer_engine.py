@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.optimizer import (
+    STRATEGIES,
+    OptimizationParams,
+    TaskSnapshot,
+    get_strategy,
+    select_incremental,
+)
+from app.optimizer.plans import plan_token
+
+
+def make_task(id, priority=2, hours=1, deadline=None, assigned_to=None):
+    return TaskSnapshot(
+        id=id, priority=priority, estimated_hours=hours, deadline=deadline, assigned_to=assigned_to
+    )
+
+
+def test_least_loaded_user_gets_next_task():
+    strategy = get_strategy("priority_weighted")
+    tasks = [make_task(1, hours=5), make_task(2, hours=3), make_task(3, hours=2)]
+
+    result = strategy.assign(tasks, {10: 4, 20: 0})
+
+    assert result.distribution == {10: [1], 20: [3, 2]}
+    assert result.loads == {10: 9, 20: 5}
+
+
+def test_ties_go_to_first_listed_user():
+    strategy = get_strategy("priority_weighted")
+
+    result = strategy.assign([make_task(1)], {20: 0, 10: 0})
+
+    assert result.distribution == {20: [1], 10: []}
+
+
+def test_tasks_without_estimate_count_as_one_hour():
+    strategy = get_strategy("greedy_lpt")
+    tasks = [make_task(1, hours=None), make_task(2, hours=0)]
+
+    result = strategy.assign(tasks, {1: 0})
+
+    assert result.loads == {1: 2}
+
+
+def test_priority_weighted_orders_by_priority_then_deadline():
+    now = datetime(2024, 1, 1)
+    tasks = [
+        make_task(1, priority=1),
+        make_task(2, priority=3),
+        make_task(3, priority=3, deadline=now + timedelta(days=1)),
+    ]
+
+    ordered = get_strategy("priority_weighted").order(tasks)
+
+    assert [t.id for t in ordered] == [3, 2, 1]
+
+
+def test_greedy_lpt_places_longest_tasks_first():
+    tasks = [make_task(1, hours=1), make_task(2, hours=8), make_task(3, hours=4)]
+
+    ordered = get_strategy("greedy_lpt").order(tasks)
+
+    assert [t.id for t in ordered] == [2, 3, 1]
+
+
+def test_deadline_first_puts_tasks_without_deadline_last():
+    now = datetime(2024, 1, 1)
+    tasks = [
+        make_task(1, priority=3),
+        make_task(2, deadline=now + timedelta(days=5)),
+        make_task(3, deadline=now + timedelta(days=1)),
+    ]
+
+    ordered = get_strategy("deadline_first").order(tasks)
+
+    assert [t.id for t in ordered] == [3, 2, 1]
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_every_task_is_assigned_once(name):
+    tasks = [make_task(i, priority=i % 3 + 1, hours=i % 7) for i in range(100)]
+
+    result = get_strategy(name).assign(tasks, {1: 0, 2: 10, 3: 5})
+
+    assigned = [task_id for ids in result.distribution.values() for task_id in ids]
+    assert sorted(assigned) == list(range(100))
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        get_strategy("random")
+
+
+def test_incremental_moves_unassigned_and_overload_only():
+    tasks = [
+        make_task(1),
+        make_task(2, priority=3, hours=6, assigned_to=10),
+        make_task(3, priority=1, hours=4, assigned_to=10),
+        make_task(4, priority=1, hours=8, assigned_to=20),
+    ]
+
+    movable, loads = select_incremental(
+        tasks, {10: 10, 20: 8}, overload_threshold=8, strategy=get_strategy("priority_weighted")
+    )
+
+    # У пользователя 10 снимается задача с наименьшим приоритетом, пользователь 20 не перегружен
+    assert [t.id for t in movable] == [1, 3]
+    assert loads == {10: 6, 20: 8}
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_blocking_tasks_are_assigned_first(name):
+    strategy = get_strategy(name)
+    # Задача 2 важнее и длиннее, но заблокирована задачей 1
+    tasks = [
+        make_task(1, priority=1, hours=1, deadline=datetime(2030, 1, 2)),
+        make_task(2, priority=3, hours=5, deadline=datetime(2030, 1, 1)),
+    ]
+
+    ordered = strategy.order(tasks, {2: [1]})
+
+    assert [task.id for task in ordered] == [1, 2]
+    assert [task.id for task in strategy.order(tasks)] == [2, 1]
+
+
+def test_plan_token_depends_on_owner():
+    params = OptimizationParams(user_ids=[1, 2], project_id=None, strategy=get_strategy("greedy_lpt"))
+    tasks = [make_task(1), make_task(2)]
+
+    first = plan_token(tasks, {1: 0, 2: 0}, params, owner_id=1)
+    assert first == plan_token(tasks, {1: 0, 2: 0}, params, owner_id=1)
+    assert first != plan_token(tasks, {1: 0, 2: 0}, params, owner_id=2)
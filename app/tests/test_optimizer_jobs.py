@@ -0,0 +1,32 @@
+import threading
+import time
+
+from app.optimizer.jobs import OptimizationJob, OptimizationJobManager
+from app.schemas.optimizer import OptimizationJobStatus
+
+
+def test_job_finishes_and_expires():
+    manager = OptimizationJobManager(max_workers=1, max_queued=0, ttl_seconds=0)
+    done = threading.Event()
+
+    def run(job):
+        done.wait(5)
+        return {1: [1]}
+
+    job = manager.submit(run, owner_id=1)
+    assert manager.get(job.id) is job
+    done.set()
+    deadline = time.monotonic() + 5
+    while not job.is_finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == OptimizationJobStatus.SUCCEEDED and job.finished_at is not None
+    assert manager.get(job.id) is None
+    manager.shutdown()
+
+
+def test_purge_skips_finished_job_without_finished_at():
+    manager = OptimizationJobManager(max_workers=1, max_queued=0, ttl_seconds=0)
+    job = OptimizationJob(owner_id=1)
+    job.status = OptimizationJobStatus.SUCCEEDED
+    manager._jobs[job.id] = job
+    assert manager.get(job.id) is job
@@ -0,0 +1,89 @@
+from datetime import date
+
+from app.optimizer import TaskSnapshot, get_strategy
+from app.optimizer.scenarios import (
+    Scenario,
+    ScenarioPool,
+    ScenarioSnapshot,
+    evaluate_scenario,
+    split_batches,
+)
+
+
+def make_snapshot(strategy="priority_weighted", **options):
+    tasks = [
+        TaskSnapshot(id=1, priority=3, estimated_hours=4, deadline=None, assigned_to=10),
+        TaskSnapshot(id=2, priority=2, estimated_hours=4, deadline=None, assigned_to=10),
+        TaskSnapshot(id=3, priority=1, estimated_hours=2, deadline=None, assigned_to=20),
+    ]
+    return ScenarioSnapshot(
+        tasks=tasks,
+        user_ids=[10, 20],
+        user_loads={10: 0, 20: 0, 30: 1},
+        dependencies={},
+        strategy=get_strategy(strategy, **options),
+    )
+
+
+def test_baseline_uses_snapshot_users():
+    result = evaluate_scenario(make_snapshot(), Scenario(name="baseline"))
+
+    assert result.user_ids == [10, 20]
+    assert result.distribution == {10: [1, 3], 20: [2]}
+    assert result.reassigned == 2
+    assert result.metrics.makespan == 6
+
+
+def test_added_and_removed_users():
+    scenario = Scenario(name="swap", add_user_ids=[30], remove_user_ids=[10])
+
+    result = evaluate_scenario(make_snapshot(), scenario)
+
+    assert result.user_ids == [20, 30]
+    assert result.distribution == {20: [1, 3], 30: [2]}
+    assert result.loads == {20: 6, 30: 5}
+
+
+def test_priority_override_changes_order():
+    scenario = Scenario(name="bump", priorities={3: 3}, remove_user_ids=[20])
+
+    result = evaluate_scenario(make_snapshot(), scenario)
+
+    assert result.distribution == {10: [3, 1, 2]}
+
+
+def test_capacity_override_does_not_change_snapshot_strategy():
+    snapshot = make_snapshot(
+        "capacity_aware", start=date(2030, 1, 1), horizon_days=1, default_capacity=4
+    )
+    scenario = Scenario(name="overtime", capacities={10: 12})
+
+    base = evaluate_scenario(snapshot, Scenario(name="baseline"))
+    overtime = evaluate_scenario(snapshot, scenario)
+
+    assert base.metrics.overflow_hours == 2
+    assert overtime.metrics.overflow_hours == 0
+    assert snapshot.strategy.capacities == {}
+
+
+def test_process_pool_matches_inline_evaluation():
+    snapshot = make_snapshot()
+    scenarios = [
+        Scenario(name="baseline"),
+        Scenario(name="plus", add_user_ids=[30]),
+        Scenario(name="minus", remove_user_ids=[20]),
+    ]
+    pool = ScenarioPool(max_workers=2)
+    try:
+        results = pool.evaluate(snapshot, scenarios)
+    finally:
+        pool.shutdown()
+
+    assert results == [evaluate_scenario(snapshot, scenario) for scenario in scenarios]
+
+
+def test_split_batches_keeps_order():
+    scenarios = [Scenario(name=str(i)) for i in range(5)]
+    batches = split_batches(scenarios, 2)
+    assert [[scenario.name for scenario in batch] for batch in batches] == [["0", "1", "2"], ["3", "4"]]
+    assert [len(batch) for batch in split_batches(scenarios, 5)] == [1] * 5
@@ -0,0 +1,173 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud.users import AuthUser
+from app.database import Base
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+from app.optimizer import OptimizationParams, get_strategy
+from app.optimizer.plans import PlanConflict, plan_cache
+from app.optimizer.service import apply_plan, preview_optimization, run_optimization
+
+OWNER = AuthUser(1, True, False)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'optimizer.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([
+            User(id=i, email=f"u{i}@example.com", username=f"u{i}", hashed_password="x")
+            for i in (1, 2, 3)
+        ])
+        db.add(Project(id=1, name="p", owner_id=1))
+        db.add_all([
+            Task(id=i, title=str(i), project_id=1, created_by=1, estimated_hours=i)
+            for i in range(1, 7)
+        ])
+        db.commit()
+        crud.task_stats.reconcile(db)
+    plan_cache.clear()
+    yield engine
+    plan_cache.clear()
+    engine.dispose()
+
+
+def make_params(**kwargs):
+    return OptimizationParams(
+        user_ids=[2, 3], project_id=1, strategy=get_strategy("greedy_lpt"), **kwargs
+    )
+
+
+def assignments(engine):
+    with Session(engine) as db:
+        return {task.id: task.assigned_to for task in db.query(Task).order_by(Task.id)}
+
+
+def test_run_optimization_saves_assignments_in_one_commit(engine):
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(connection))
+
+    with Session(engine) as db:
+        distribution = run_optimization(db, params=make_params(), current_user=OWNER)
+
+    assert len(commits) == 1
+    saved = assignments(engine)
+    assert {
+        task.id: user_id for user_id, tasks in distribution.items() for task in tasks
+    } == saved
+    assert set(saved.values()) == {2, 3}
+    with Session(engine) as db:
+        assert crud.task_stats.reconcile(db) == 0
+
+
+def test_run_optimization_rolls_back_on_write_failure(engine):
+    with engine.begin() as connection:
+        # Запись падает на середине пакетного UPDATE
+        connection.execute(text(
+            "CREATE TRIGGER fail_task_4 BEFORE UPDATE OF assigned_to ON tasks "
+            "WHEN NEW.id = 4 BEGIN SELECT RAISE(ABORT, 'task 4'); END"
+        ))
+
+    with Session(engine) as db:
+        with pytest.raises(IntegrityError):
+            run_optimization(db, params=make_params(), current_user=OWNER)
+
+    assert set(assignments(engine).values()) == {None}
+    with Session(engine) as db:
+        assert crud.task_stats.reconcile(db) == 0
+
+
+def count_assign_calls(monkeypatch, strategy):
+    calls = []
+    assign = strategy.assign
+
+    def counted(*args):
+        calls.append(args)
+        return assign(*args)
+
+    monkeypatch.setattr(strategy, "assign", counted)
+    return calls
+
+
+def test_repeated_preview_is_cache_hit_and_apply_evicts_plan(engine, monkeypatch):
+    params = make_params()
+    calls = count_assign_calls(monkeypatch, params.strategy)
+    with Session(engine) as db:
+        plan = preview_optimization(db, params=params, current_user=OWNER)
+        assert preview_optimization(db, params=params, current_user=OWNER) is plan
+        assert len(calls) == 1
+        assert set(assignments(engine).values()) == {None}
+
+        distribution = apply_plan(db, plan=plan, current_user=OWNER)
+    assert len(calls) == 1
+    assert plan_cache.get(plan.token) is None
+    assert {
+        task.id: user_id for user_id, tasks in distribution.items() for task in tasks
+    } == assignments(engine)
+
+
+@pytest.mark.parametrize("changes", [{"priority": 3}, {"estimated_hours": 10}])
+def test_apply_after_task_change_conflicts_and_evicts_plan(engine, changes):
+    with Session(engine) as db:
+        plan = preview_optimization(db, params=make_params(), current_user=OWNER)
+        crud.task.update(db, db_obj=db.get(Task, 2), obj_in=changes)
+
+        with pytest.raises(PlanConflict):
+            apply_plan(db, plan=plan, current_user=OWNER)
+    assert plan_cache.get(plan.token) is None
+    assert set(assignments(engine).values()) == {None}
+
+
+def test_sqlite_reads_tasks_without_row_locks(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with Session(engine) as db:
+        tasks = crud.task.get_tasks_for_optimization(
+            db, user_ids=[2, 3], project_id=1, current_user=OWNER, lock=True
+        )
+    assert len(tasks) == 6
+    assert not any("FOR UPDATE" in statement for statement in statements)
+
+
+def test_incremental_run_moves_unassigned_and_overload_only(engine):
+    with Session(engine) as db:
+        # Пользователь 2 перегружен (5 + 6 часов), у пользователя 3 один час
+        for task_id, user_id in ((1, 3), (5, 2), (6, 2)):
+            crud.task.update(db, db_obj=db.get(Task, task_id), obj_in={"assigned_to": user_id})
+    before = assignments(engine)
+
+    with Session(engine) as db:
+        run_optimization(db, params=make_params(overload_threshold=8), current_user=OWNER)
+
+    after = assignments(engine)
+    moved = {task_id for task_id in after if after[task_id] != before[task_id]}
+    # Распределяются нераспределенные задачи 2-4 и снятая с перегруженного пользователя задача 5;
+    # задача 1 неперегруженного пользователя и задача 6 остаются на месте
+    assert moved == {2, 3, 4, 5}
+    assert (after[1], after[5], after[6]) == (3, 3, 2)
+    with Session(engine) as db:
+        assert crud.task_stats.reconcile(db) == 0
+
+
+def test_loads_and_existing_users(engine):
+    with Session(engine) as db:
+        db.add_all([
+            Task(title="null", project_id=1, created_by=1, assigned_to=2, estimated_hours=None),
+            Task(title="zero", project_id=1, created_by=1, assigned_to=2, estimated_hours=0),
+            Task(title="three", project_id=1, created_by=1, assigned_to=2, estimated_hours=3),
+            Task(
+                title="done", project_id=1, created_by=1, assigned_to=3,
+                estimated_hours=5, status=TaskStatus.DONE,
+            ),
+        ])
+        db.commit()
+
+        # Задачи без оценки (NULL или 0) считаются часовыми, выполненные не учитываются
+        assert crud.task.get_loads_for_users(db, user_ids=[1, 2, 3]) == {1: 0, 2: 5, 3: 0}
+        assert crud.user.get_existing_ids(db, ids=[3, 42, 1]) == {1, 3}
+        assert crud.user.get_existing_ids(db, ids=[]) == set()
@@ -0,0 +1,99 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.crud.pagination import InvalidCursor, SortColumn, SortOrder, paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    priority = Column(Integer, nullable=False)
+    deadline = Column(DateTime, nullable=True)
+
+
+BY_ID = SortOrder("id", [SortColumn(Item.id)])
+BY_PRIORITY = SortOrder("priority", [
+    SortColumn(Item.priority, descending=True),
+    SortColumn(Item.deadline, nullable=True),
+    SortColumn(Item.id),
+])
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    rng = random.Random(1)
+    start = datetime(2030, 1, 1)
+    with Session(engine) as session:
+        session.add_all(
+            Item(
+                id=i,
+                priority=rng.randint(1, 3),
+                deadline=start + timedelta(days=rng.randint(0, 5)) if rng.random() < 0.7 else None,
+            )
+            for i in range(1, 101)
+        )
+        session.commit()
+        yield session
+
+
+def read_all(db, order, limit):
+    ids, cursor = [], None
+    while True:
+        page = paginate(db.query(Item), order, cursor=cursor, limit=limit)
+        ids.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+def test_pages_follow_id_order(db):
+    assert read_all(db, BY_ID, 7) == list(range(1, 101))
+
+
+def test_pages_follow_priority_deadline_order_with_nulls_last(db):
+    expected = sorted(
+        db.query(Item).all(),
+        key=lambda item: (-item.priority, item.deadline is None, item.deadline or datetime.min, item.id),
+    )
+
+    assert read_all(db, BY_PRIORITY, 9) == [item.id for item in expected]
+
+
+def test_inserts_between_pages_do_not_shift_results(db):
+    first = paginate(db.query(Item), BY_ID, limit=10)
+    db.query(Item).filter(Item.id <= 5).delete()
+    db.add(Item(id=101, priority=1))
+    db.commit()
+
+    second = paginate(db.query(Item), BY_ID, cursor=first.next_cursor, limit=10)
+
+    assert [item.id for item in second.items] == list(range(11, 21))
+
+
+def test_last_page_has_no_cursor(db):
+    page = paginate(db.query(Item), BY_ID, limit=100)
+
+    assert len(page.items) == 100
+    assert page.next_cursor is None
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "e30"])
+def test_invalid_cursor(db, cursor):
+    with pytest.raises(InvalidCursor):
+        paginate(db.query(Item), BY_ID, cursor=cursor)
+
+
+def test_cursor_of_another_order_is_rejected(db):
+    page = paginate(db.query(Item), BY_ID, limit=10)
+
+    with pytest.raises(InvalidCursor):
+        paginate(db.query(Item), BY_PRIORITY, cursor=page.next_cursor)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.security import PasswordHasher, PasswordHashingBusy, pwd_context
+from app.database import Base
+from app.models import User
+
+
+def test_hasher_rejects_calls_over_queue_limit():
+    hasher = PasswordHasher(max_workers=1, max_queued=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow() -> str:
+        started.set()
+        release.wait(5)
+        return "done"
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(hasher.run(slow)))
+    worker.start()
+    try:
+        started.wait(5)
+        with pytest.raises(PasswordHashingBusy):
+            hasher.run(str, "x")
+    finally:
+        release.set()
+        worker.join(5)
+    assert results == ["done"]
+    assert hasher.run(str, "x") == "x"
+    hasher.shutdown()
+
+
+def test_hasher_run_async_does_not_block_event_loop():
+    hasher = PasswordHasher(max_workers=1, max_queued=0)
+    release = threading.Event()
+
+    async def main():
+        slow = asyncio.ensure_future(hasher.run_async(lambda: release.wait(5) and "done"))
+        await asyncio.sleep(0.05)
+        # Цикл событий свободен, пока bcrypt занят; лишний вызов сразу отклоняется
+        with pytest.raises(PasswordHashingBusy):
+            await hasher.run_async(str, "x")
+        release.set()
+        return await slow
+
+    assert asyncio.run(main()) == "done"
+    hasher.shutdown()
+
+
+def test_outdated_hash_is_upgraded_on_login():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("Secret123")
+    with Session(engine) as db:
+        db.add(User(id=1, email="a@example.com", username="a", hashed_password=old_hash))
+        db.commit()
+
+        assert crud.user.authenticate(db, email="a@example.com", password="wrong") is None
+        assert crud.user.get(db, id=1).hashed_password == old_hash
+
+        user = crud.user.authenticate(db, email="a@example.com", password="Secret123")
+        assert user.hashed_password != old_hash
+        assert not pwd_context.needs_update(user.hashed_password)
+        assert crud.user.authenticate(db, email="a@example.com", password="Secret123")
+
+
+def test_authenticate_async(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'auth.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, email="a@example.com", username="a", hashed_password=pwd_context.hash("Secret123")))
+        db.commit()
+
+        async def login(password):
+            return await crud.user.authenticate_async(db, email="a@example.com", password=password)
+
+        assert asyncio.run(login("wrong")) is None
+        assert asyncio.run(login("Secret123")).id == 1
+    engine.dispose()
@@ -0,0 +1,25 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+
+
+def test_project_task_counts():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, email="a@example.com", username="a", hashed_password="x"))
+        db.add_all([Project(id=1, name="full", owner_id=1), Project(id=2, name="empty", owner_id=1)])
+        db.add_all(
+            Task(title=f"t{i}", project_id=1, created_by=1, status=status)
+            for i, status in enumerate([TaskStatus.TODO, TaskStatus.DONE, TaskStatus.DONE])
+        )
+        db.commit()
+
+        project, tasks_count, completed_tasks_count = crud.project.get_with_task_counts(db, id=1)
+        assert (project.id, tasks_count, completed_tasks_count) == (1, 3, 2)
+        assert crud.project.get_with_task_counts(db, id=2)[1:] == (0, 0)
+        assert crud.project.get_with_task_counts(db, id=3) is None
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api import projects, tasks
+from app.core import dependencies
+from app.core.config import settings
+from app.core.dependencies import get_current_active_user, get_db, recent_writers
+from app.core.security import create_access_token
+from app.crud.users import AuthUser
+from app.database import AsyncReplicaRouter, Base, ReplicaRouter
+from app.models import Project, Task, User
+
+
+def make_database(path, project_name):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, email="a@example.com", username="a", hashed_password="x"))
+        db.add(Project(id=1, name=project_name, owner_id=1))
+        db.add(Task(id=1, title=project_name, project_id=1, created_by=1))
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    primary = make_database(tmp_path / "primary.db", "primary")
+    replica = make_database(tmp_path / "replica.db", "replica")
+    # Реплика в несуществующем каталоге: соединение с ней не открывается
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter([broken, replica], retry_seconds=60)
+    monkeypatch.setattr(dependencies.database, "read_replicas", router)
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+    monkeypatch.setattr(recent_writers, "ttl", 5)
+    recent_writers.clear()
+
+    primary_session = sessionmaker(bind=primary)
+
+    def override_get_db():
+        db = primary_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(projects.router)
+    app.include_router(tasks.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: AuthUser(1, True, False)
+    yield TestClient(app), router
+    recent_writers.clear()
+
+
+def test_reads_go_to_available_replica(client):
+    client, router = client
+    headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+
+    for _ in range(3):
+        assert client.get("/projects/", headers=headers).json()[0]["name"] == "replica"
+    # Отказавшая реплика пропускается до истечения retry_seconds
+    assert list(router._down_until) == [0]
+
+    # После записи пользователь читает с основной БД
+    recent_writers.set(1, True)
+    assert client.get("/projects/1", headers=headers).json()["name"] == "primary"
+    assert client.get("/projects/1").json()["name"] == "replica"
+
+
+def test_falls_back_to_primary_without_replicas(client, monkeypatch):
+    client, _ = client
+    monkeypatch.setattr(dependencies.database, "read_replicas", ReplicaRouter([], retry_seconds=60))
+    assert client.get("/projects/").json()[0]["name"] == "primary"
+
+
+def test_task_detail_reads_from_replica(client):
+    client, _ = client
+    assert client.get("/tasks/1").json()["title"] == "replica"
+    assert client.get("/tasks/1/dependencies").json() == []
+
+
+def test_replica_query_error_marks_replica_down(client):
+    _, router = client
+    request = Request({"type": "http", "headers": []})
+    primary = object()
+
+    dependency = dependencies.get_read_db(request, db=primary)
+    replica_db = next(dependency)
+    index = replica_db.info["replica_index"]
+    with pytest.raises(OperationalError):
+        dependency.throw(OperationalError("SELECT 1", {}, Exception("connection lost")))
+    assert index in router._down_until
+
+    # Следующий запрос берет другую реплику или основную БД
+    dependency = dependencies.get_read_db(request, db=primary)
+    assert next(dependency) is primary
+
+
+def test_async_read_db_uses_async_replicas(tmp_path, monkeypatch):
+    make_database(tmp_path / "replica.db", "replica").dispose()
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+    monkeypatch.setattr(recent_writers, "ttl", 5)
+    recent_writers.clear()
+    request = Request({
+        "type": "http",
+        "headers": [(b"authorization", f"Bearer {create_access_token(1)}".encode())],
+    })
+    primary = object()
+
+    async def main():
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = AsyncReplicaRouter([broken, replica], retry_seconds=60)
+        monkeypatch.setattr(dependencies.database, "async_read_replicas", router)
+        try:
+            names = []
+            for _ in range(2):
+                dependency = dependencies.get_async_read_db(request, db=primary)
+                db = await dependency.__anext__()
+                names.append((await db.execute(select(Project.name))).scalar())
+                await dependency.aclose()
+            assert names == ["replica", "replica"] and list(router._down_until) == [0]
+
+            # После записи пользователь читает с основной БД
+            recent_writers.set(1, True)
+            dependency = dependencies.get_async_read_db(request, db=primary)
+            assert await dependency.__anext__() is primary
+        finally:
+            await replica.dispose()
+            await broken.dispose()
+
+    asyncio.run(main())
+    recent_writers.clear()
@@ -0,0 +1,158 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud
+from app.api import tasks
+from app.core.dependencies import get_current_active_user, get_db
+from app.crud.users import AuthUser
+from app.database import Base
+from app.models import Project, Task, User
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([
+            User(id=1, email="a@example.com", username="a", hashed_password="x"),
+            User(id=2, email="b@example.com", username="b", hashed_password="x"),
+        ])
+        db.add_all([
+            Project(id=1, name="own", owner_id=1),
+            Project(id=2, name="foreign", owner_id=2),
+        ])
+        db.commit()
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(tasks.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: AuthUser(1, True, False)
+    yield TestClient(app), engine
+    engine.dispose()
+
+
+def test_bulk_create_reports_item_errors(client):
+    client, engine = client
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = client.post("/tasks/bulk", json=[
+        {"title": "a", "project_id": 1, "estimated_hours": 3, "assigned_to": 2},
+        {"title": "b", "project_id": 99},
+        {"title": "c", "project_id": 2},
+        {"title": "d", "project_id": 1, "assigned_to": 42},
+        {"title": "e", "project_id": 1, "status": "done", "priority": 3},
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 3)
+    assert [item["error"] for item in body["items"]] == [
+        None,
+        "Проект не найден",
+        "У вас недостаточно прав для выполнения этого действия",
+        "Пользователь для назначения не найден",
+        None,
+    ]
+    # Одна проверка проектов и одна проверка исполнителей на весь список
+    assert sum(statement.startswith("SELECT") for statement in statements) == 2
+
+    with Session(engine) as db:
+        created = {task.id: task for task in db.query(Task)}
+        first, last = body["items"][0]["id"], body["items"][4]["id"]
+        assert (created[first].title, created[first].assigned_to, created[first].created_by) == ("a", 2, 1)
+        assert created[last].title == "e" and created[last].created_at is not None
+        stats = crud.task_stats.get_project_stats(db, project_id=1)
+        assert (stats["tasks_count"], stats["open_hours"]) == (2, 3)
+        assert crud.task_stats.reconcile(db) == 0
+
+
+def test_bulk_create_limits(client, monkeypatch):
+    client, _ = client
+    monkeypatch.setattr(crud.tasks, "BULK_BATCH_SIZE", 2)
+    response = client.post("/tasks/bulk", json=[{"title": str(i), "project_id": 1} for i in range(5)])
+    ids = [item["id"] for item in response.json()["items"]]
+    assert len(set(ids)) == 5 and ids == sorted(ids)
+
+    assert client.post("/tasks/bulk", json=[]).status_code == 422
+
+
+def add_tasks(engine):
+    with Session(engine) as db:
+        db.add(Project(id=3, name="own2", owner_id=1))
+        db.add_all([
+            Task(id=1, title="a", project_id=1, created_by=1, estimated_hours=2),
+            Task(id=2, title="b", project_id=1, created_by=1, estimated_hours=4),
+            Task(id=3, title="c", project_id=2, created_by=2, assigned_to=1),
+            Task(id=4, title="d", project_id=2, created_by=2),
+            Task(id=5, title="e", project_id=1, created_by=1),
+        ])
+        db.commit()
+        crud.task_stats.reconcile(db)
+        crud.task_dependency.create(db, task=db.get(Task, 2), blocked_by=db.get(Task, 1))
+
+
+def test_bulk_update_items(client):
+    client, engine = client
+    add_tasks(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = client.patch("/tasks/bulk", json={"items": [
+        {"id": 1, "changes": {"status": "done"}},
+        {"id": 3, "changes": {"status": "done"}},
+        {"id": 4, "changes": {"status": "done"}},
+        {"id": 99, "changes": {"status": "done"}},
+        {"id": 2, "changes": {"project_id": 3}},
+        {"id": 5, "changes": {"project_id": 3, "assigned_to": 2, "estimated_hours": 6}},
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["updated"], body["failed"], body["ids"]) == (3, 3, [1, 3, 5])
+    assert [(error["index"], error["error"]) for error in body["errors"]] == [
+        (2, "У вас недостаточно прав для выполнения этого действия"),
+        (3, "Задача не найдена"),
+        (4, "Нельзя переместить задачу с зависимостями в другой проект"),
+    ]
+    # Задачи 1 и 3 с одинаковыми изменениями меняются одним UPDATE
+    assert sum(statement.startswith("UPDATE tasks ") for statement in statements) == 2
+
+    with Session(engine) as db:
+        tasks = {task.id: task for task in db.query(Task)}
+        assert [tasks[i].status.value for i in (1, 3, 4)] == ["done", "done", "todo"]
+        assert (tasks[5].project_id, tasks[5].assigned_to, tasks[5].estimated_hours) == (3, 2, 6)
+        assert tasks[1].updated_at is not None and tasks[4].updated_at is None
+        assert crud.task_stats.reconcile(db) == 0
+
+
+def test_bulk_update_filter(client):
+    client, engine = client
+    add_tasks(engine)
+
+    # Задача 4 из чужого проекта не назначена пользователю и не выбирается фильтром
+    response = client.patch("/tasks/bulk", json={"filter": {"status": "todo"}, "changes": {"priority": 3}})
+    assert response.json()["ids"] == [1, 2, 3, 5]
+
+    # Ошибка в изменениях отклоняет весь запрос
+    response = client.patch("/tasks/bulk", json={"filter": {"project_id": 1}, "changes": {"project_id": 3}})
+    assert response.status_code == 400
+    with Session(engine) as db:
+        assert db.query(Task).filter(Task.project_id == 3).count() == 0
+        assert db.get(Task, 4).priority == 2
+        assert crud.task_stats.reconcile(db) == 0
+
+    assert client.patch("/tasks/bulk", json={"filter": {}, "changes": {"priority": 1}}).status_code == 400
+    assert client.patch("/tasks/bulk", json={"filter": {"project_id": 1}}).status_code == 400
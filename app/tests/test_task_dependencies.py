@@ -0,0 +1,60 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api import tasks
+from app.core.dependencies import get_current_active_user, get_db
+from app.crud.users import AuthUser
+from app.database import Base
+from app.models import Project, Task, User
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dependencies.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(User(id=1, email="a@example.com", username="a", hashed_password="x"))
+        db.add(Project(id=1, name="own", owner_id=1))
+        db.add_all([
+            Task(id=i, title=str(i), project_id=1, created_by=1) for i in (1, 2, 3)
+        ])
+        db.commit()
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(tasks.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: AuthUser(1, True, False)
+    yield TestClient(app), engine
+    engine.dispose()
+
+
+def test_cycle_check_runs_under_project_lock(client):
+    client, engine = client
+    assert client.post("/tasks/2/dependencies", json={"blocked_by_id": 1}).status_code == 200
+    assert client.post("/tasks/3/dependencies", json={"blocked_by_id": 2}).status_code == 200
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.post("/tasks/1/dependencies", json={"blocked_by_id": 3})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Зависимость создает цикл"
+
+    lock = next(
+        i for i, statement in enumerate(statements)
+        if statement.startswith("SELECT projects.id") and "WHERE projects.id" in statement
+    )
+    cycle = next(i for i, statement in enumerate(statements) if "RECURSIVE" in statement)
+    assert lock < cycle
+
+    assert client.post("/tasks/2/dependencies", json={"blocked_by_id": 1}).status_code == 400
@@ -0,0 +1,93 @@
+import importlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+from app.crud.task_stats import TaskFacts
+from app.schemas.task import TaskCreate, TaskUpdate
+
+# crud.task_stats - объект агрегатов, модуль берется по имени
+task_stats_module = importlib.import_module("app.crud.task_stats")
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            User(id=1, email="a@example.com", username="a", hashed_password="x"),
+            User(id=2, email="b@example.com", username="b", hashed_password="x"),
+        ])
+        session.add_all([
+            Project(id=1, name="p1", owner_id=1),
+            Project(id=2, name="p2", owner_id=1),
+        ])
+        session.commit()
+        yield session
+
+
+def create(db, **fields):
+    task_in = TaskCreate(title="t", project_id=1, **fields)
+    return crud.task.create_with_creator(db, obj_in=task_in, creator_id=1)
+
+
+def test_stats_follow_task_writes(db):
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    first = create(db, priority=3, estimated_hours=5, assigned_to=2, deadline=past)
+    second = create(db, priority=1, estimated_hours=3)
+    third = create(db, priority=2, estimated_hours=4, assigned_to=2)
+
+    crud.task.update(db, db_obj=second, obj_in=TaskUpdate(status="done", assigned_to=2))
+    crud.task.update(db, db_obj=third, obj_in={"project_id": 2, "estimated_hours": 6})
+    crud.task.bulk_assign(db, tasks=[db.get(Task, first.id)], assignments={first.id: 1})
+
+    stats = crud.task_stats.get_project_stats(db, project_id=1)
+    assert stats["tasks_count"] == 2
+    assert stats["by_status"] == {TaskStatus.TODO: 1, TaskStatus.IN_PROGRESS: 0, TaskStatus.DONE: 1}
+    assert stats["by_priority"] == {1: 1, 2: 0, 3: 1}
+    assert stats["open_hours"] == 5
+    assert stats["overdue_count"] == 1
+    assert crud.task_stats.get_user_stats(db, user_id=2)["tasks_count"] == 2
+    assert crud.task_stats.get_user_stats(db, user_id=1)["open_hours"] == 5
+
+    crud.task.remove(db, id=first.id)
+    crud.project.remove(db, id=2)
+
+    assert crud.task_stats.get_user_stats(db, user_id=2)["tasks_count"] == 1
+    assert crud.task_stats.get_project_stats(db, project_id=2)["tasks_count"] == 0
+    assert crud.task_stats.reconcile(db) == 0
+
+
+def test_reconcile_fixes_writes_that_bypass_crud(db):
+    task = create(db, estimated_hours=2, assigned_to=2)
+    db.execute(update(Task).where(Task.id == task.id).values(status=TaskStatus.DONE))
+    db.commit()
+
+    assert crud.task_stats.get_project_stats(db, project_id=1)["open_hours"] == 2
+    assert crud.task_stats.reconcile(db) == 4
+    assert crud.task_stats.get_project_stats(db, project_id=1)["open_hours"] == 0
+    assert crud.task_stats.reconcile(db) == 0
+
+
+def test_reconcile_in_batches(db, monkeypatch):
+    monkeypatch.setattr(task_stats_module, "RECONCILE_BATCH_SIZE", 1)
+    create(db, estimated_hours=2, assigned_to=2)
+    db.add(Task(title="bypass", project_id=2, created_by=1, estimated_hours=3))
+    db.commit()
+
+    assert crud.task_stats.reconcile(db) == 1
+    assert crud.task_stats.get_project_stats(db, project_id=2)["open_hours"] == 3
+    assert crud.task_stats.reconcile(db) == 0
+
+
+def test_facts_keep_required_fields_on_null_changes():
+    facts = TaskFacts(project_id=1, assigned_to=2, status=TaskStatus.TODO, priority=2, hours=1)
+    updated = facts.updated({"status": None, "priority": None, "assigned_to": None})
+    assert (updated.status, updated.priority, updated.assigned_to) == (TaskStatus.TODO, 2, None)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import Base
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            User(id=1, email="a@example.com", username="a", hashed_password="x"),
+            User(id=2, email="b@example.com", username="b", hashed_password="x"),
+        ])
+        session.add_all([
+            Project(id=1, name="a1", owner_id=1),
+            Project(id=2, name="b1", owner_id=2),
+        ])
+        session.add_all([
+            # Проект пользователя 1, создана и назначена другим
+            Task(id=1, title="t1", project_id=1, created_by=2, assigned_to=2),
+            # Чужой проект, назначена пользователю 1
+            Task(id=2, title="t2", project_id=2, created_by=2, assigned_to=1),
+            # Чужой проект, создана пользователем 1
+            Task(id=3, title="t3", project_id=2, created_by=1, status=TaskStatus.DONE),
+            # Чужой проект, не связана с пользователем 1
+            Task(id=4, title="t4", project_id=2, created_by=2),
+        ])
+        session.commit()
+        yield session
+
+
+def visible(db, user_id, **filters):
+    return [task.id for task in crud.task.get_page_for_user(db, user_id=user_id, **filters).items]
+
+
+def test_user_sees_own_project_assigned_and_created_tasks(db):
+    assert visible(db, 1) == [1, 2, 3]
+    assert visible(db, 2) == [1, 2, 3, 4]
+
+
+def test_project_filter_keeps_visibility(db):
+    assert visible(db, 1, project_id=2) == [2, 3]
+    assert visible(db, 1, project_id=1) == [1]
+
+
+def test_visibility_combines_with_filters(db):
+    assert visible(db, 1, status=TaskStatus.TODO) == [1, 2]
+
+
+def test_optimization_without_project_uses_owned_projects(db):
+    owner = db.get(User, 1)
+
+    tasks = crud.task.get_tasks_for_optimization(db, user_ids=[1, 2], current_user=owner)
+
+    assert [task.id for task in tasks] == [1]
+
+
+def test_task_is_loaded_with_project_owner(db):
+    task, owner_id = crud.task.get_with_project_owner(db, id=2)
+
+    assert (task.id, owner_id) == (2, 2)
+    assert crud.task.get_with_project_owner(db, id=99) is None
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from app.core import security
+from app.core.config import settings
+from app.main import ready
+
+
+def test_decoded_token_is_cached():
+    security.token_cache.clear()
+    token = security.create_access_token(7)
+    before = security.token_cache.stats()
+
+    assert security.decode_access_token(token).sub == 7
+    assert security.decode_access_token(token).sub == 7
+    stats = security.token_cache.stats()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+
+
+def test_expired_and_foreign_tokens_are_rejected(monkeypatch):
+    security.token_cache.clear()
+    with pytest.raises(jwt.ExpiredSignatureError):
+        security.decode_access_token(security.create_access_token(7, timedelta(seconds=-1)))
+
+    token = security.create_access_token(7)
+    security.decode_access_token(token)
+    # После смены ключа кэшированный токен проверяется заново и отклоняется
+    monkeypatch.setattr(settings, "SECRET_KEY", settings.SECRET_KEY + "rotated")
+    with pytest.raises(jwt.JWTError):
+        security.decode_access_token(token)
+
+
+def test_token_cache_stats_in_readiness():
+    security.decode_access_token(security.create_access_token(8))
+    assert ready()["caches"]["token"] == security.token_cache.stats()
@@ -0,0 +1,40 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud.users import AuthUser
+from app.database import Base
+from app.main import ready
+from app.models import User
+
+
+def test_auth_cache_hits_and_invalidation():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    crud.user.auth_cache.clear()
+    with Session(engine) as db:
+        db.add(User(id=1, email="a@example.com", username="a", hashed_password="x"))
+        db.commit()
+        before = crud.user.auth_cache.stats()
+
+        assert crud.user.get_auth(db, id=1) == AuthUser(1, True, False)
+        assert crud.user.get_auth(db, id=1) == AuthUser(1, True, False)
+        assert crud.user.get_auth(db, id=2) is None
+        stats = crud.user.auth_cache.stats()
+        assert stats["hits"] - before["hits"] == 1
+        assert stats["misses"] - before["misses"] == 2
+
+        crud.user.update(db, db_obj=crud.user.get(db, id=1), obj_in={"is_active": False})
+        assert crud.user.get_auth(db, id=1) == AuthUser(1, False, False)
+
+        crud.user.remove(db, id=1)
+        assert crud.user.get_auth(db, id=1) is None
+    crud.user.auth_cache.clear()
+
+
+def test_auth_cache_stats_in_readiness():
+    crud.user.auth_cache.set(1, AuthUser(1, True, False))
+    assert crud.user.auth_cache.get(1) is not None
+    body = ready()
+    assert body["caches"]["auth"] == crud.user.auth_cache.stats()
+    assert body["caches"]["auth"]["hits"] >= 1
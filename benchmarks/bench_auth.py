@@ -0,0 +1,63 @@
+"""
+Бенчмарк проверки прав в запросе: разбор JWT и загрузка пользователя
+без кэшей (прежний get_current_user) против кэша токенов и кэша пользователей
+
+Запуск: python -m benchmarks.bench_auth [requests] [database_url]
+"""
+import sys
+from typing import List
+
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.core import security
+from app.core.config import settings
+from benchmarks.common import make_session, seed, timed
+
+
+def uncached(db: Session, tokens: List[str]) -> None:
+    """
+    Прежний путь: проверка подписи и полная строка пользователя на каждый запрос
+    """
+    for token in tokens:
+        payload = schemas.TokenPayload(**jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]))
+        db.expire_all()
+        crud.user.get(db, id=payload.sub)
+
+
+def decode_cached(db: Session, tokens: List[str]) -> None:
+    for token in tokens:
+        payload = security.decode_access_token(token)
+        db.expire_all()
+        crud.user.get(db, id=payload.sub)
+
+
+def fully_cached(db: Session, tokens: List[str]) -> None:
+    for token in tokens:
+        crud.user.get_auth(db, id=security.decode_access_token(token).sub)
+
+
+def main(requests: int = 20000, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    user_ids = seed(db, users=100, projects=10, tasks=100)
+    # Клиенты повторяют свои токены: 100 пользователей, по одному токену на каждого
+    user_tokens = [security.create_access_token(user_id) for user_id in user_ids]
+    tokens = [user_tokens[i % len(user_tokens)] for i in range(requests)]
+
+    print(f"{requests} запросов, {len(user_tokens)} токенов")
+    for name, func in (
+        ("без кэшей (прежний)", uncached),
+        ("кэш токенов", decode_cached),
+        ("кэш токенов и пользователей", fully_cached),
+    ):
+        _, best = timed(func, db, tokens, repeat=3)
+        print(f"  {name:<28} {best * 1000:9.2f} ms  {best / requests * 1e6:7.1f} мкс/запрос")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 20000,
+        args[1] if len(args) > 1 else "sqlite://",
+    )
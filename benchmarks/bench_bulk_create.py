@@ -0,0 +1,66 @@
+"""
+Бенчмарк импорта задач: по одной (проверки и commit POST /tasks/ на каждую задачу)
+против создания списком (POST /tasks/bulk: две проверки на список и пачки INSERT)
+
+Запуск: python -m benchmarks.bench_bulk_create [tasks] [database_url]
+"""
+import random
+import sys
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from benchmarks.common import count_queries, make_session, seed, timed
+
+
+def one_by_one(db: Session, tasks_in: List[schemas.TaskCreate], creator_id: int) -> None:
+    """
+    Прежний путь: проект, исполнитель и создание с commit на каждую задачу
+    """
+    for task_in in tasks_in:
+        crud.project.get(db, id=task_in.project_id)
+        if task_in.assigned_to:
+            crud.user.get(db, id=task_in.assigned_to)
+        crud.task.create_with_creator(db, obj_in=task_in, creator_id=creator_id)
+
+
+def bulk(db: Session, tasks_in: List[schemas.TaskCreate], creator_id: int) -> None:
+    crud.project.get_owner_ids(db, ids=list({task_in.project_id for task_in in tasks_in}))
+    crud.user.get_existing_ids(
+        db, ids=list({task_in.assigned_to for task_in in tasks_in if task_in.assigned_to})
+    )
+    crud.task.create_many_with_creator(db, objs_in=tasks_in, creator_id=creator_id)
+
+
+def main(tasks: int = 5000, url: str = "sqlite://") -> None:
+    rng = random.Random(42)
+    print(f"импорт {tasks} задач")
+    for name, func in (("по одной (прежний)", one_by_one), ("списком", bulk)):
+        db = make_session(url)
+        user_ids = seed(db, users=100, projects=50, tasks=100)
+        project_ids = list(crud.project.get_owner_ids(db, ids=list(range(1, 51))))
+        tasks_in = [
+            schemas.TaskCreate(
+                title=f"imported{i}",
+                project_id=rng.choice(project_ids),
+                assigned_to=rng.choice(user_ids),
+                estimated_hours=rng.randint(0, 24),
+            )
+            for i in range(tasks)
+        ]
+        statements = count_queries(db)
+        _, best = timed(func, db, tasks_in, user_ids[0], repeat=1)
+        print(
+            f"  {name:<20} {best * 1000:9.1f} ms  {best / tasks * 1e6:7.1f} мкс/задача"
+            f"  запросов {len(statements)}"
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 5000,
+        args[1] if len(args) > 1 else "sqlite://",
+    )
@@ -0,0 +1,53 @@
+"""
+Бенчмарк перевода задач в DONE: по одной (PUT /tasks/{task_id}: чтение задачи и
+commit на каждую) против изменения списком (PATCH /tasks/bulk: одно чтение и один UPDATE)
+
+Запуск: python -m benchmarks.bench_bulk_update [tasks] [database_url]
+"""
+import sys
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import Task
+from app.schemas.task import TaskStatus, TaskUpdate
+from benchmarks.common import count_queries, make_session, seed, timed
+
+
+def one_by_one(db: Session, task_ids: List[int]) -> None:
+    """
+    Прежний путь: задача с владельцем проекта и update с commit и refresh на каждую задачу
+    """
+    for task_id in task_ids:
+        task, _ = crud.task.get_with_project_owner(db, id=task_id)
+        crud.task.update(db, db_obj=task, obj_in=TaskUpdate(status=TaskStatus.DONE))
+
+
+def bulk(db: Session, task_ids: List[int]) -> None:
+    rows = crud.task.get_many_with_project_owner(db, ids=task_ids)
+    crud.task.bulk_update(db, tasks=rows, changes=[{"status": TaskStatus.DONE}] * len(rows))
+
+
+def main(tasks: int = 500, url: str = "sqlite://") -> None:
+    print(f"перевод {tasks} задач в DONE")
+    for name, func in (("по одной (прежний)", one_by_one), ("списком", bulk)):
+        db = make_session(url)
+        seed(db, users=100, projects=50, tasks=20000)
+        task_ids = [task_id for (task_id,) in db.query(Task.id).order_by(Task.id).limit(tasks)]
+        db.expire_all()
+        statements = count_queries(db)
+        _, best = timed(func, db, task_ids, repeat=1)
+        print(
+            f"  {name:<20} {best * 1000:9.1f} ms  {best / tasks * 1e6:7.1f} мкс/задача"
+            f"  запросов {len(statements)}"
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 500,
+        args[1] if len(args) > 1 else "sqlite://",
+    )
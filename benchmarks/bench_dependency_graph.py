@@ -0,0 +1,55 @@
+"""
+Бенчмарк графа зависимостей: полное построение против инкрементальных изменений
+
+Запуск: python -m benchmarks.bench_dependency_graph [tasks] [edges] [changes]
+"""
+import random
+import sys
+import time
+
+from app.optimizer import CycleError, DependencyGraph
+
+
+def main(task_count: int = 20000, edge_count: int = 50000, change_count: int = 1000) -> None:
+    rng = random.Random(42)
+    hours = {task_id: rng.randint(0, 24) for task_id in range(task_count)}
+    # Ребра только от меньшего ID к большему - граф без циклов
+    edges = set()
+    while len(edges) < edge_count:
+        a, b = sorted(rng.sample(range(task_count), 2))
+        edges.add((b, a))
+
+    start = time.perf_counter()
+    graph = DependencyGraph.build(hours, edges)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(change_count):
+        graph.set_hours(rng.randrange(task_count), rng.randint(0, 24))
+    set_hours = (time.perf_counter() - start) / change_count
+
+    added = cycles = 0
+    start = time.perf_counter()
+    for _ in range(change_count):
+        task_id, blocked_by_id = rng.sample(range(task_count), 2)
+        try:
+            graph.add_edge(task_id, blocked_by_id, hours=hours)
+            added += 1
+        except CycleError:
+            cycles += 1
+    add_edge = (time.perf_counter() - start) / change_count
+
+    start = time.perf_counter()
+    length = graph.critical_path_length()
+    path = graph.critical_path()
+    read = time.perf_counter() - start
+
+    print(f"{task_count} задач, {edge_count} зависимостей")
+    print(f"  полное построение        {build * 1000:8.1f} ms")
+    print(f"  изменение оценки         {set_hours * 1000:8.3f} ms")
+    print(f"  добавление зависимости   {add_edge * 1000:8.3f} ms ({added} добавлено, {cycles} циклов)")
+    print(f"  критический путь         {read * 1000:8.1f} ms ({length} ч, {len(path)} задач)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
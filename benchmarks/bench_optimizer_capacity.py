@@ -0,0 +1,40 @@
+"""
+Бенчмарк стратегии capacity_aware без HTTP и БД
+
+Запуск: python -m benchmarks.bench_optimizer_capacity [tasks] [users] [days]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.optimizer import TaskSnapshot, get_strategy
+
+
+def main(task_count: int = 10000, user_count: int = 500, horizon_days: int = 90) -> None:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    tasks = [
+        TaskSnapshot(
+            id=i,
+            priority=rng.randint(1, 3),
+            estimated_hours=rng.randint(0, 24),
+            deadline=now + timedelta(days=rng.randint(0, horizon_days + 10)) if rng.random() < 0.8 else None,
+        )
+        for i in range(task_count)
+    ]
+    user_loads = {user_id: rng.randint(0, 40) for user_id in range(user_count)}
+    capacities = {user_id: rng.choice([4, 6, 8]) for user_id in range(user_count)}
+
+    strategy = get_strategy("capacity_aware", capacities=capacities, horizon_days=horizon_days)
+    start = time.perf_counter()
+    result = strategy.assign(tasks, user_loads)
+    elapsed = time.perf_counter() - start
+
+    print(f"{task_count} задач x {user_count} пользователей x {horizon_days} дней")
+    print(f"  capacity_aware  {elapsed * 1000:8.1f} ms")
+    print(f"  переработка     {sum(result.overflow.values()):8.0f} ч")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
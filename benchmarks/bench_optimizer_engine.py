@@ -0,0 +1,66 @@
+"""
+Бенчмарк алгоритма оптимизации без HTTP и БД
+
+Сравнивает исходный линейный поиск наименее загруженного пользователя
+(min по словарю нагрузок на каждую задачу) с кучей из app.optimizer
+
+Запуск: python -m benchmarks.bench_optimizer_engine [tasks] [users]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.optimizer import STRATEGIES, TaskSnapshot, get_strategy
+
+
+def make_tasks(count: int):
+    rng = random.Random(42)
+    now = datetime(2024, 1, 1)
+    return [
+        TaskSnapshot(
+            id=i,
+            priority=rng.randint(1, 3),
+            estimated_hours=rng.randint(0, 24),
+            deadline=now + timedelta(days=rng.randint(0, 90)) if rng.random() < 0.7 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def linear_scan(tasks, user_loads):
+    """
+    Исходный алгоритм из optimize_tasks: O(tasks * users)
+    """
+    user_loads = dict(user_loads)
+    distribution = {user_id: [] for user_id in user_loads}
+    for task in get_strategy("priority_weighted").order(tasks):
+        min_load_user_id = min(user_loads, key=user_loads.get)
+        user_loads[min_load_user_id] += task.hours
+        distribution[min_load_user_id].append(task.id)
+    return distribution
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(task_count: int = 20000, user_count: int = 300) -> None:
+    tasks = make_tasks(task_count)
+    user_loads = {user_id: 0 for user_id in range(user_count)}
+
+    legacy, legacy_time = timed(linear_scan, tasks, user_loads)
+    print(f"{task_count} задач x {user_count} пользователей")
+    print(f"  linear scan            {legacy_time * 1000:8.1f} ms")
+
+    for name in sorted(STRATEGIES):
+        result, elapsed = timed(get_strategy(name).assign, tasks, user_loads)
+        print(f"  heap {name:<18}{elapsed * 1000:8.1f} ms")
+        if name == "priority_weighted":
+            assert result.distribution == legacy, "распределение отличается от исходного"
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+"""
+Бенчмарк подготовки данных оптимизатора: проверка пользователей и расчет нагрузки
+
+Сравнивает запрос на каждого пользователя (crud.user.get, get_active_tasks_for_user)
+с одним IN запросом и одним GROUP BY запросом
+
+Запуск: python -m benchmarks.bench_optimizer_loads [tasks] [users] [database_url]
+"""
+import sys
+
+from app import crud
+from benchmarks.common import count_queries, make_session, seed, timed
+
+
+def per_user_path(db, user_ids):
+    users = {}
+    for user_id in user_ids:
+        users[user_id] = crud.user.get(db, id=user_id)
+    loads = {}
+    for user_id in users:
+        assigned_tasks = crud.task.get_active_tasks_for_user(db, user_id=user_id)
+        loads[user_id] = sum(task.estimated_hours or 1 for task in assigned_tasks)
+    db.expunge_all()
+    return loads
+
+
+def aggregate_path(db, user_ids):
+    crud.user.get_existing_ids(db, ids=user_ids)
+    return crud.task.get_loads_for_users(db, user_ids=user_ids)
+
+
+def main(task_count: int = 20000, user_count: int = 300, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    user_ids = seed(db, users=user_count, projects=100, tasks=task_count)
+    statements = count_queries(db)
+    print(f"{task_count} задач, {user_count} пользователей")
+
+    results = []
+    for name, path in (("per-user", per_user_path), ("aggregate", aggregate_path)):
+        statements.clear()
+        loads, elapsed = timed(path, db, user_ids, repeat=3)
+        results.append(loads)
+        print(f"  {name:<10} {elapsed * 1000:8.1f} ms  {len(statements) // 3} запросов")
+
+    assert results[0] == results[1], "нагрузки не совпадают"
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 20000,
+        int(args[1]) if len(args) > 1 else 300,
+        args[2] if len(args) > 2 else "sqlite://",
+    )
@@ -0,0 +1,67 @@
+"""
+Бенчмарк сценариев "что если": последовательный расчет против пула процессов
+
+Запуск: python -m benchmarks.bench_optimizer_scenarios [tasks] [users] [scenarios] [workers]
+"""
+import random
+import sys
+import time
+
+from app.optimizer import TaskSnapshot, get_strategy
+from app.optimizer.scenarios import Scenario, ScenarioPool, ScenarioSnapshot
+
+
+def main(
+    task_count: int = 20000, user_count: int = 300, scenario_count: int = 8, workers: int = 0
+) -> None:
+    rng = random.Random(42)
+    tasks = [
+        TaskSnapshot(
+            id=i,
+            priority=rng.randint(1, 3),
+            estimated_hours=rng.randint(0, 24),
+            deadline=None,
+            assigned_to=rng.randrange(user_count) if rng.random() < 0.5 else None,
+        )
+        for i in range(task_count)
+    ]
+    user_ids = list(range(user_count))
+    extra_user_ids = list(range(user_count, user_count + 10))
+    snapshot = ScenarioSnapshot(
+        tasks=tasks,
+        user_ids=user_ids,
+        user_loads={user_id: rng.randint(0, 40) for user_id in user_ids + extra_user_ids},
+        dependencies={},
+        strategy=get_strategy("greedy_lpt"),
+    )
+    scenarios = [
+        Scenario(
+            name=f"s{i}",
+            add_user_ids=rng.sample(extra_user_ids, rng.randint(0, 3)),
+            remove_user_ids=rng.sample(user_ids, rng.randint(0, 3)),
+        )
+        for i in range(scenario_count)
+    ]
+
+    inline = ScenarioPool(max_workers=0)
+    start = time.perf_counter()
+    inline.evaluate(snapshot, scenarios)
+    sequential = time.perf_counter() - start
+
+    pool = ScenarioPool(max_workers=workers or None)
+    try:
+        # Первый вызов запускает процессы
+        pool.evaluate(snapshot, scenarios[:2])
+        start = time.perf_counter()
+        pool.evaluate(snapshot, scenarios)
+        parallel = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+
+    print(f"{scenario_count} сценариев, {task_count} задач x {user_count} пользователей")
+    print(f"  последовательно  {sequential * 1000:8.1f} ms")
+    print(f"  пул процессов    {parallel * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:5]))
@@ -0,0 +1,46 @@
+"""
+Бенчмарк постраничного чтения задач: OFFSET против курсора
+
+Сравнивает стоимость первой и глубокой страницы при skip и при cursor
+
+Запуск: python -m benchmarks.bench_pagination [tasks] [page_size] [database_url]
+"""
+import sys
+
+from app import crud
+from app.crud.pagination import encode_cursor
+from app.crud.tasks import TASK_ORDERS
+from benchmarks.common import make_session, seed, timed
+
+
+def main(task_count: int = 300000, page_size: int = 100, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    seed(db, users=100, projects=50, tasks=task_count)
+    deep = task_count - page_size * 2
+
+    print(f"{task_count} задач, страница {page_size}")
+    for order_by in TASK_ORDERS:
+        # Курсор, указывающий на ту же глубокую позицию, что и skip
+        anchor = crud.task.get_page_filtered(db, skip=deep - 1, limit=1, order_by=order_by).items[0]
+        cursor = encode_cursor(TASK_ORDERS[order_by], anchor)
+
+        _, first = timed(crud.task.get_page_filtered, db, limit=page_size, order_by=order_by)
+        _, offset = timed(
+            crud.task.get_page_filtered, db, skip=deep, limit=page_size, order_by=order_by
+        )
+        _, keyset = timed(
+            crud.task.get_page_filtered, db, cursor=cursor, limit=page_size, order_by=order_by
+        )
+        print(f"  order_by={order_by}")
+        print(f"    первая страница     {first * 1000:8.2f} ms")
+        print(f"    skip={deep:<10} {offset * 1000:8.2f} ms")
+        print(f"    cursor (та же)      {keyset * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 300000,
+        int(args[1]) if len(args) > 1 else 100,
+        args[2] if len(args) > 2 else "sqlite://",
+    )
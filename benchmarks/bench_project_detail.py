@@ -0,0 +1,65 @@
+"""
+Бенчмарк счетчиков задач в карточке проекта: загрузка Project.tasks против агрегата в SQL
+
+Запуск: python -m benchmarks.bench_project_detail [project_tasks] [database_url]
+"""
+import sys
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import Project, Task
+from app.models.task import TaskStatus
+from benchmarks.common import make_session, seed, timed
+
+
+def lazy_counts(db: Session, project_id: int) -> Tuple[int, int]:
+    """
+    Прежний расчет в read_project
+    """
+    db.expire_all()
+    project = crud.project.get(db, id=project_id)
+    return (
+        len(project.tasks),
+        len([task for task in project.tasks if task.status == TaskStatus.DONE]),
+    )
+
+
+def sql_counts(db: Session, project_id: int) -> Tuple[int, int]:
+    _, tasks_count, completed_tasks_count = crud.project.get_with_task_counts(db, id=project_id)
+    return tasks_count, completed_tasks_count
+
+
+def peak_memory(func: Callable[..., Any], *args: Any) -> int:
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(project_tasks: int = 40000, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    seed(db, users=100, projects=100, tasks=project_tasks * 3)
+    project_id = db.query(Project.id).order_by(Project.id).first()[0]
+    db.execute(update(Task).where(Task.id <= project_tasks).values(project_id=project_id))
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+    print(f"проект с {project_tasks} задачами")
+    for name, func in (("Project.tasks (прежний)", lazy_counts), ("COUNT FILTER", sql_counts)):
+        counts, best = timed(func, db, project_id, repeat=3)
+        memory = peak_memory(func, db, project_id)
+        print(f"  {name:<24} {counts}  {best * 1000:9.2f} ms  {memory / 2 ** 20:7.1f} MB")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 40000,
+        args[1] if len(args) > 1 else "sqlite://",
+    )
@@ -0,0 +1,52 @@
+"""
+Бенчмарк сериализации списка задач: стандартный путь FastAPI (валидация response_model,
+jsonable_encoder, json.dumps) против list_response (pydantic-core сразу в bytes)
+
+Запуск: python -m benchmarks.bench_serialization [items] [database_url]
+"""
+import asyncio
+import sys
+from typing import Any, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app import schemas
+from app.core.responses import list_response
+from app.models import Task
+from benchmarks.common import make_session, seed, timed
+
+response_field = create_response_field(name="response", type_=List[schemas.Task])
+
+
+def fastapi_default(items: List[Any]) -> bytes:
+    """
+    Прежний путь: то, что FastAPI делает с результатом маршрута с response_model
+    """
+    content = asyncio.run(serialize_response(field=response_field, response_content=items))
+    return JSONResponse(content).body
+
+
+def fast_path(items: List[Any]) -> bytes:
+    return list_response(schemas.Task, items).body
+
+
+def main(items: int = 1000, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    seed(db, users=50, projects=20, tasks=items)
+    tasks = db.query(Task).limit(items).all()
+
+    assert fastapi_default(tasks) == fast_path(tasks)
+    print(f"{len(tasks)} задач")
+    for name, func in (("FastAPI response_model (прежний)", fastapi_default), ("list_response", fast_path)):
+        _, best = timed(func, tasks, repeat=5)
+        print(f"  {name:<34} {best * 1000:8.2f} ms  {best / len(tasks) * 1e6:6.2f} мкс/задача")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 1000,
+        args[1] if len(args) > 1 else "sqlite://",
+    )
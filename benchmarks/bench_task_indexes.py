@@ -0,0 +1,124 @@
+"""
+Бенчмарк индексов для частых фильтров задач и проектов
+
+Для каждого запроса печатает план выполнения и время с индексами миграций
+и без них (индексы удаляются из той же БД)
+
+Запуск: python -m benchmarks.bench_task_indexes [tasks] [database_url]
+"""
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import Project
+from app.models.task import TaskStatus
+from benchmarks.common import make_session, seed, timed
+
+# Индексы, добавленные миграциями 0002 и 0003: (имя, таблица)
+INDEXES = [
+    ("ix_tasks_project_id_status_priority", "tasks"),
+    ("ix_tasks_assigned_to_status", "tasks"),
+    ("ix_tasks_created_by", "tasks"),
+    ("ix_tasks_open_assigned_to", "tasks"),
+    ("ix_tasks_open_project_id_deadline", "tasks"),
+    ("ix_projects_owner_id", "projects"),
+]
+
+
+class _Superuser:
+    is_superuser = True
+
+
+def queries(db: Session, user_ids: List[int]) -> Dict[str, Callable[[], Any]]:
+    """
+    Частые запросы API и оптимизатора
+    """
+    user_id = user_ids[0]
+    project_id = db.query(Project.id).order_by(Project.id).first()[0]
+
+    def project_tasks() -> Any:
+        db.expire_all()
+        return db.get(Project, project_id).tasks
+
+    return {
+        "нагрузка пользователей": lambda: crud.task.get_loads_for_users(
+            db, user_ids=user_ids[:10]
+        ),
+        "задачи для оптимизации": lambda: crud.task.get_tasks_for_optimization(
+            db, user_ids=user_ids[:10], project_id=project_id, current_user=_Superuser()
+        ),
+        "фильтр проект+статус+приоритет": lambda: crud.task.get_page_filtered(
+            db, project_id=project_id, status=TaskStatus.TODO, priority=3
+        ),
+        "фильтр исполнитель+статус": lambda: crud.task.get_page_filtered(
+            db, assigned_to=user_id, status=TaskStatus.IN_PROGRESS
+        ),
+        "задачи пользователя": lambda: crud.task.get_page_for_user(db, user_id=user_id),
+        "проекты владельца": lambda: crud.project.get_page_by_owner(db, owner_id=user_id),
+        "Project.tasks": project_tasks,
+    }
+
+
+def explain(db: Session, func: Callable[[], Any]) -> List[str]:
+    """
+    Выполнить func и вернуть планы выполненных ею запросов
+    """
+    statements: List[Tuple[str, Any]] = []
+    bind = db.get_bind()
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", collect)
+    try:
+        func()
+    finally:
+        event.remove(bind, "before_cursor_execute", collect)
+
+    prefix = "EXPLAIN QUERY PLAN " if bind.dialect.name == "sqlite" else "EXPLAIN "
+    connection = db.connection()
+    plans = []
+    for statement, parameters in statements:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).fetchall()
+        plans.extend(str(row[-1]) for row in rows)
+    return plans
+
+
+def report(db: Session, user_ids: List[int]) -> Dict[str, float]:
+    db.execute(text("ANALYZE"))
+    times = {}
+    for name, func in queries(db, user_ids).items():
+        _, times[name] = timed(func)
+        print(f"  {name}: {times[name] * 1000:.2f} ms")
+        for line in explain(db, func):
+            print(f"      {line}")
+    return times
+
+
+def main(task_count: int = 200000, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    user_ids = seed(db, users=200, projects=500, tasks=task_count)
+
+    print(f"{task_count} задач, с индексами")
+    indexed = report(db, user_ids)
+
+    for name, table in INDEXES:
+        db.execute(text(f"DROP INDEX {name}"))
+    db.commit()
+    print("без индексов")
+    plain = report(db, user_ids)
+
+    print("ускорение")
+    for name in indexed:
+        print(f"  {name}: x{plain[name] / indexed[name]:.1f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 200000,
+        args[1] if len(args) > 1 else "sqlite://",
+    )
@@ -0,0 +1,83 @@
+"""
+Бенчмарк сводки по задачам проекта: агрегат task_stats против расчета по задачам
+
+Сравнивает чтение сводки из агрегата, GROUP BY по задачам проекта и прежний
+способ дашбордов (постраничное чтение всех задач проекта), а также
+стоимость записи задачи с поддержкой агрегата и полную сверку
+
+Запуск: python -m benchmarks.bench_task_stats [tasks] [project_tasks] [database_url]
+"""
+import sys
+from collections import Counter
+
+from sqlalchemy import func, text, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import Project, Task
+from app.models.task import TaskStatus
+from benchmarks.common import make_session, seed, timed
+
+
+def group_by_stats(db: Session, project_id: int) -> dict:
+    rows = (
+        db.query(Task.status, Task.priority, func.count(), func.sum(Task.estimated_hours))
+        .filter(Task.project_id == project_id)
+        .group_by(Task.status, Task.priority)
+        .all()
+    )
+    return {"tasks_count": sum(row[2] for row in rows)}
+
+
+def paged_stats(db: Session, project_id: int) -> dict:
+    """
+    Сводка на клиенте: все страницы списка задач проекта
+    """
+    by_status: Counter = Counter()
+    cursor = None
+    while True:
+        page = crud.task.get_page_filtered(db, project_id=project_id, cursor=cursor, limit=100)
+        by_status.update(task.status for task in page.items)
+        if page.next_cursor is None:
+            return {"tasks_count": sum(by_status.values())}
+        cursor = page.next_cursor
+
+
+def main(task_count: int = 200000, project_tasks: int = 40000, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    seed(db, users=100, projects=100, tasks=task_count)
+    project_id = db.query(Project.id).order_by(Project.id).first()[0]
+    db.execute(update(Task).where(Task.id <= project_tasks).values(project_id=project_id))
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+    drift, rebuild = timed(crud.task_stats.reconcile, db, repeat=1)
+    _, check = timed(crud.task_stats.reconcile, db, repeat=1)
+    print(f"{task_count} задач, в проекте {project_tasks}")
+    print(f"  первичное заполнение ({drift} строк) {rebuild * 1000:9.2f} ms")
+    print(f"  сверка без расхождений           {check * 1000:9.2f} ms")
+
+    for name, func_ in (
+        ("task_stats", lambda: crud.task_stats.get_project_stats(db, project_id=project_id)),
+        ("GROUP BY по задачам", lambda: group_by_stats(db, project_id)),
+        ("страницы GET /tasks", lambda: paged_stats(db, project_id)),
+    ):
+        stats, best = timed(func_, repeat=3)
+        print(f"  {name:<24} {stats['tasks_count']:>7} задач {best * 1000:9.2f} ms")
+
+    task = db.get(Task, 1)
+    statuses = [TaskStatus.IN_PROGRESS, TaskStatus.TODO]
+    _, write = timed(
+        lambda: crud.task.update(db, db_obj=task, obj_in={"status": statuses.reverse() or statuses[0]}),
+        repeat=20,
+    )
+    print(f"  изменение статуса задачи         {write * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 200000,
+        int(args[1]) if len(args) > 1 else 40000,
+        args[2] if len(args) > 2 else "sqlite://",
+    )
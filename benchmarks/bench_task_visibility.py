@@ -0,0 +1,69 @@
+"""
+Бенчмарк видимости задач пользователя: список ID проектов в Python против UNION в SQL
+
+Владелец проектов получает owned_projects проектов; сравнивается прежний запрос
+(ID проектов читаются в Python с ограничением 1000 и подставляются в IN внутри OR)
+с подзапросом UNION из get_page_for_user
+
+Запуск: python -m benchmarks.bench_task_visibility [tasks] [owned_projects] [database_url]
+"""
+import sys
+
+from sqlalchemy import func, or_, text, update
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models import Project, Task
+from benchmarks.common import make_session, seed, timed
+
+
+def legacy_query(db: Session, user_id: int):
+    """
+    Прежний запрос get_multi_for_user
+    """
+    user_projects = db.query(Project.id).filter(Project.owner_id == user_id).limit(1000).all()
+    user_project_ids = [p.id for p in user_projects]
+    return db.query(Task).filter(
+        or_(
+            Task.project_id.in_(user_project_ids),
+            Task.assigned_to == user_id,
+            Task.created_by == user_id,
+        )
+    )
+
+
+def union_query(db: Session, user_id: int):
+    return db.query(Task).filter(Task.id.in_(crud.task._visible_task_ids(user_id)))
+
+
+def main(task_count: int = 300000, owned_projects: int = 10000, url: str = "sqlite://") -> None:
+    db = make_session(url)
+    user_ids = seed(db, users=200, projects=owned_projects + 10000, tasks=task_count)
+    owner_id = user_ids[0]
+    db.execute(
+        update(Project).where(Project.id <= owned_projects).values(owner_id=owner_id)
+    )
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+    print(f"{task_count} задач, у владельца {owned_projects} проектов")
+    for name, build in (("IN + OR (прежний)", legacy_query), ("UNION", union_query)):
+        visible = build(db, owner_id).with_entities(func.count()).scalar()
+        _, first = timed(lambda: build(db, owner_id).order_by(Task.id).limit(100).all())
+        _, total = timed(lambda: build(db, owner_id).with_entities(func.count()).scalar())
+        print(f"  {name}")
+        print(f"    видимых задач      {visible}")
+        print(f"    первая страница    {first * 1000:8.2f} ms")
+        print(f"    подсчет всех       {total * 1000:8.2f} ms")
+
+    _, page = timed(crud.task.get_page_for_user, db, user_id=owner_id)
+    print(f"  get_page_for_user    {page * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 300000,
+        int(args[1]) if len(args) > 1 else 10000,
+        args[2] if len(args) > 2 else "sqlite://",
+    )
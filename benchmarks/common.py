@@ -0,0 +1,98 @@
+"""
+Общие утилиты бенчмарков: тестовая БД, наполнение данными и замер времени
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Project, Task, User
+from app.models.task import TaskStatus
+
+
+def make_session(url: str = "sqlite://") -> Session:
+    """
+    Создать сессию к чистой БД со всеми таблицами (по умолчанию SQLite в памяти)
+    """
+    if url.startswith("sqlite"):
+        engine = create_engine(
+            url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def seed(
+    db: Session, *, users: int, projects: int, tasks: int, seed: int = 42
+) -> List[int]:
+    """
+    Наполнить БД пользователями, проектами и задачами, вернуть ID пользователей
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(User),
+        [
+            {"email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(users)
+        ],
+    )
+    user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id)]
+    db.execute(
+        insert(Project),
+        [{"name": f"project{i}", "owner_id": rng.choice(user_ids)} for i in range(projects)],
+    )
+    project_ids = [project_id for (project_id,) in db.query(Project.id)]
+    statuses = list(TaskStatus)
+    db.execute(
+        insert(Task),
+        [
+            {
+                "title": f"task{i}",
+                "status": rng.choice(statuses),
+                "priority": rng.randint(1, 3),
+                "estimated_hours": rng.randint(0, 24),
+                "project_id": rng.choice(project_ids),
+                "assigned_to": rng.choice(user_ids) if rng.random() < 0.8 else None,
+                "created_by": rng.choice(user_ids),
+                "deadline": now + timedelta(days=rng.randint(-10, 90)) if rng.random() < 0.7 else None,
+            }
+            for i in range(tasks)
+        ],
+    )
+    db.commit()
+    return user_ids
+
+
+def count_queries(db: Session) -> List[str]:
+    """
+    Подписаться на выполняемые SQL запросы, вернуть список, который будет пополняться
+    """
+    statements: List[str] = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+def timed(func: Callable[..., Any], *args: Any, repeat: int = 5, **kwargs: Any) -> Tuple[Any, float]:
+    """
+    Выполнить функцию repeat раз, вернуть результат и лучшее время в секундах
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
@@ -0,0 +1,124 @@
+"""
+Нагрузочный тест списка задач: синхронные маршруты (Session, пул потоков)
+против асинхронных (AsyncSession) при большом числе одновременных клиентов
+
+Приложение запускается в процессе через ASGI транспорт httpx, у обоих вариантов
+одинаковый размер пула соединений. Для PostgreSQL передайте URL синхронного движка,
+асинхронный (asyncpg) получается из него
+
+Запуск: python -m benchmarks.load_async_db [clients] [requests_per_client] [database_url]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import async_routes, projects, tasks, users
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.database import Base, async_database_url, get_async_db, get_db
+from benchmarks.common import seed
+
+POOL_SIZE = 20
+
+
+def make_app(url: str, use_async: bool) -> FastAPI:
+    app = FastAPI()
+    if use_async:
+        engine = create_async_engine(async_database_url(url), pool_size=POOL_SIZE, max_overflow=0)
+        session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        routers = [async_routes.users_router, async_routes.projects_router, async_routes.tasks_router]
+    else:
+        engine = create_engine(url, pool_size=POOL_SIZE, max_overflow=0)
+        session_factory = sessionmaker(autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        routers = [users.router, projects.router, tasks.router]
+    for router in routers:
+        app.include_router(router, prefix=settings.API_V1_STR)
+    return app
+
+
+async def run_load(app: FastAPI, tokens: List[str], clients: int, requests: int) -> None:
+    latencies: List[float] = []
+    errors = 0
+    # Ошибки приложения (например, таймаут ожидания соединения) считаются, а не прерывают тест
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    path = f"{settings.API_V1_STR}/tasks/?limit=20"
+
+    async def client(index: int) -> None:
+        nonlocal errors
+        headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as http:
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await http.get(path, headers=headers)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+    # Прогрев: кэши пользователей и токенов заполнены, как в установившемся режиме
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        for token in tokens:
+            await http.get(path, headers={"Authorization": f"Bearer {token}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan")
+    print(
+        f"  {len(latencies) / elapsed:8.0f} запросов/с"
+        f"  p50 {statistics.median(latencies) * 1000 if latencies else float('nan'):8.1f} ms"
+        f"  p99 {p99 * 1000:8.1f} ms  ошибок {errors}"
+    )
+
+
+def main(clients: int = 1000, requests: int = 5, url: str = "") -> None:
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user_ids = seed(db, users=200, projects=100, tasks=50000)
+    db.close()
+    engine.dispose()
+    tokens = [create_access_token(user_id) for user_id in user_ids]
+
+    print(f"{clients} клиентов по {requests} запросов GET /tasks/, пул соединений {POOL_SIZE}")
+    for name, use_async in (("синхронные маршруты", False), ("асинхронные маршруты", True)):
+        print(name)
+        asyncio.run(run_load(make_app(url, use_async), tokens, clients, requests))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 1000,
+        int(args[1]) if len(args) > 1 else 5,
+        args[2] if len(args) > 2 else "",
+    )